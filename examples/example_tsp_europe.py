@@ -19,7 +19,7 @@ import time
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.tsp_aco import TSP_AntColony
-from src.tsp_utils import load_cities, nearest_neighbor_tsp, get_city_info_summary, random_tour, calculate_tour_distance, calculate_distance_matrix
+from src.tsp_utils import load_cities, nearest_neighbor_tsp, get_city_info_summary, random_tour, distance_matrix_array, tour_lengths
 from src.tsp_visualization import plot_tsp_tour, plot_interactive_tour, plot_tsp_comparison, plot_tour_statistics
 from src.visualization import plot_convergence
 
@@ -203,14 +203,13 @@ def main():
     print("COMPARISON WITH RANDOM TOURS")
     print("=" * 80)
 
-    distances_matrix = calculate_distance_matrix(cities)
-    random_distances = []
-    for i in range(10):
-        rand_tour = random_tour(cities, start_city)
-        rand_dist = calculate_tour_distance(rand_tour, distances_matrix)
-        random_distances.append(rand_dist)
+    # Tất cả random tours được đánh giá cùng lúc (batched gather trên ma trận)
+    distances_matrix = distance_matrix_array(cities)
+    city_index = {city: i for i, city in enumerate(cities)}
+    random_tours = [[city_index[c] for c in random_tour(cities, start_city)] for _ in range(10)]
+    random_distances = tour_lengths(random_tours, distances_matrix)
 
-    avg_random = sum(random_distances) / len(random_distances)
+    avg_random = float(random_distances.mean())
     print(f"\nAverage random tour distance: {avg_random:.2f} km")
     print(f"ACO tour distance: {aco_distance:.2f} km")
     print(f"ACO improvement over random: {((avg_random - aco_distance) / avg_random * 100):.2f}%")
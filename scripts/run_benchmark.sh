@@ -0,0 +1,33 @@
+#!/bin/bash
+# Script để benchmark AntColony (shortest path) trên grid/geometric/scale-free graphs
+
+echo "=================================="
+echo "Shortest Path Benchmark"
+echo "=================================="
+echo ""
+
+# Chuyển đến thư mục root của project
+cd "$(dirname "$0")/.."
+
+# Kiểm tra xem Poetry đã cài đặt dependencies chưa
+if [ ! -d ".venv" ]; then
+    echo "Virtual environment not found. Running setup..."
+    ./scripts/setup.sh
+fi
+
+# Tham số: [output.json] [baseline.json] [sizes...]
+OUTPUT=${1:-benchmark_results.json}
+BASELINE=${2:-}
+if [ $# -gt 2 ]; then
+    shift 2
+    SIZES="$*"
+else
+    SIZES="100 1000 10000 100000"
+fi
+
+ARGS=(--sizes $SIZES --output "$OUTPUT")
+if [ -n "$BASELINE" ] && [ -f "$BASELINE" ]; then
+    ARGS+=(--compare "$BASELINE")
+fi
+
+poetry run python -m src.aco_benchmark "${ARGS[@]}"
@@ -0,0 +1,25 @@
+#!/bin/bash
+# Script để chạy ACO solver service (HTTP/JSON trên localhost)
+
+echo "=================================="
+echo "Running ACO Solver Service"
+echo "=================================="
+echo ""
+
+# Chuyển đến thư mục root của project
+cd "$(dirname "$0")/.."
+
+# Kiểm tra xem Poetry đã cài đặt dependencies chưa
+if [ ! -d ".venv" ]; then
+    echo "Virtual environment not found. Running setup..."
+    ./scripts/setup.sh
+fi
+
+# Tham số: [port] [workers]
+PORT=${1:-8765}
+WORKERS=${2:-2}
+
+echo "POST http://127.0.0.1:$PORT/solve  (JSON request)"
+echo "GET  http://127.0.0.1:$PORT/health"
+echo ""
+poetry run python -m src.service --port "$PORT" --workers "$WORKERS"
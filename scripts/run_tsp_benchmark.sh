@@ -0,0 +1,23 @@
+#!/bin/bash
+# Script để benchmark TSP_AntColony trên các TSPLIB instances (data/tsplib)
+
+echo "=================================="
+echo "TSPLIB Benchmark"
+echo "=================================="
+echo ""
+
+# Chuyển đến thư mục root của project
+cd "$(dirname "$0")/.."
+
+# Kiểm tra xem Poetry đã cài đặt dependencies chưa
+if [ ! -d ".venv" ]; then
+    echo "Virtual environment not found. Running setup..."
+    ./scripts/setup.sh
+fi
+
+# Tham số: [runs] [iterations] [output.json]
+RUNS=${1:-3}
+ITERATIONS=${2:-100}
+OUTPUT=${3:-tsp_benchmark.json}
+
+poetry run python -m src.tsp_benchmark --runs "$RUNS" --iterations "$ITERATIONS" --output "$OUTPUT"
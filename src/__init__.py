@@ -3,6 +3,7 @@ Ant Colony Optimization for Shortest Path Finding
 """
 
 from .aco import AntColony
+from .iteration import IterationState
 
 __version__ = "0.1.0"
-__all__ = ["AntColony"]
+__all__ = ["AntColony", "IterationState"]
@@ -2,9 +2,28 @@
 Ant Colony Optimization Algorithm for Shortest Path Problem
 """
 
+import hashlib
+import heapq
+import itertools
+import time
 import numpy as np
 import networkx as nx
-from typing import List, Tuple, Dict, Set
+from typing import AsyncIterator, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .compact_graph import CompactGraph
+from .iteration import IterationState, async_iterate
+from .rng import SeedLike, UniformStream, alias_draw, alias_table, make_generator, roulette
+
+
+def _builtin_label(label: Hashable) -> Hashable:
+    """
+    Node label với numpy scalars đổi thành Python types (kể cả trong tuple).
+    """
+    if isinstance(label, tuple):
+        return tuple(_builtin_label(part) for part in label)
+    if isinstance(label, np.generic):
+        return label.item()
+    return label
 
 
 class AntColony:
@@ -13,8 +32,12 @@ class AntColony:
 
     Parameters:
     -----------
-    graph : networkx.Graph
-        The graph with weighted edges (use 'weight' attribute)
+    graph : networkx.Graph, networkx.DiGraph or CompactGraph
+        The graph with weighted edges (use 'weight' attribute). With a DiGraph
+        every edge is a one-way arc (e.g. one-way streets). A `CompactGraph`
+        (e.g. `CompactGraph.load(path)`) is used directly without networkx;
+        `self.graph` is then None. The graph passed in is never modified:
+        `update_edge_weight`/`remove_edge`/`add_edge` edit a private copy
     n_ants : int
         Number of ants per iteration (default: 20)
     n_iterations : int
@@ -27,118 +50,550 @@ class AntColony:
         Pheromone evaporation rate, range [0,1] (default: 0.5)
     Q : float
         Constant for pheromone update (default: 100)
+    seed_paths : str, optional
+        Seed pheromone at the start of every `iterate()`/`run()` call along
+        deterministic paths: 'dijkstra', 'astar' or 'k_shortest' (default: None)
+    n_seed_paths : int
+        Number of paths to seed with 'k_shortest' (default: 1)
+    seed : int, SeedSequence or Generator, optional
+        Seed for the solver's own random generator; the same seed gives the
+        same results (default: None, fresh entropy)
+    alias_sampling : bool
+        Sample the next node from per-node Walker alias tables (O(1) expected
+        per step, visited nodes rejected) instead of a roulette wheel over all
+        unvisited neighbours (O(degree)). Worth it on high-degree graphs
+        (default: False)
     """
 
+    SEED_METHODS = ('dijkstra', 'astar', 'k_shortest')
+
+    # Số lần rút bị từ chối (nút đã thăm) trước khi quay về roulette wheel
+    ALIAS_MAX_REJECTIONS = 8
+
     def __init__(
         self,
-        graph: nx.Graph,
+        graph: Union[nx.Graph, CompactGraph],
         n_ants: int = 20,
         n_iterations: int = 100,
         alpha: float = 1.0,
         beta: float = 2.0,
         evaporation_rate: float = 0.5,
-        Q: float = 100
+        Q: float = 100,
+        seed_paths: Optional[str] = None,
+        n_seed_paths: int = 1,
+        seed: SeedLike = None,
+        alias_sampling: bool = False
     ):
-        self.graph = graph
+        if seed_paths is not None and seed_paths not in self.SEED_METHODS:
+            raise ValueError(f"seed_paths must be one of {self.SEED_METHODS}, got {seed_paths!r}")
+
         self.n_ants = n_ants
         self.n_iterations = n_iterations
         self.alpha = alpha
         self.beta = beta
         self.evaporation_rate = evaporation_rate
         self.Q = Q
+        self.seed_paths = seed_paths
+        self.n_seed_paths = n_seed_paths
+
+        # Random generator riêng của solver (không dùng global np.random)
+        self.rng = make_generator(seed)
+        self._uniforms = UniformStream(self.rng)
+
+        # Alias tables theo nút, xây lazily khi nút được thăm lần đầu trong
+        # iteration (node index -> (prob, alias))
+        self.alias_sampling = alias_sampling
+        self._alias_tables: Dict[int, Tuple[List[float], List[int]]] = {}
+
+        # Compile đồ thị thành CSR arrays (một lần, dùng lại cho mọi query)
+        # - nodes[i]: node label của index i, node_index: label -> index
+        # - Các arcs của node i: indices[indptr[i]:indptr[i+1]] (sắp xếp tăng dần)
+        # - arc_edge[arc]: edge id của arc
+        # - weights, heuristic, pheromone: một giá trị cho mỗi edge id
+        #   (DiGraph: mỗi arc một edge; Graph: hai arcs u->v, v->u dùng chung
+        #   một edge, nên pheromone được lưu một lần cho mỗi cạnh)
+        if isinstance(graph, CompactGraph):
+            self.graph = None
+            compact = graph
+        else:
+            self.graph = graph
+            compact = CompactGraph.from_networkx(graph)
+        # self.graph là graph của caller cho tới lần sửa đầu tiên (copy-on-write)
+        self._owns_graph = False
+        self._compile_graph(compact)
+
+        # Khởi tạo ma trận pheromone (mỗi edge = initial_pheromone)
+        self.initial_pheromone = 1.0
+        self.pheromone = np.full(len(self.weights), self.initial_pheromone)
+
+        # Fingerprint của đồ thị (tính lazy, xem fingerprint())
+        self._fingerprint = None
+
+    def _compile_graph(self, compact: CompactGraph):
+        """
+        Nạp CSR arrays từ `CompactGraph` và tính heuristic array (1/distance).
+
+        indptr/indices/arc_edge được dùng trực tiếp (có thể là memory-mapped,
+        read-only); weights được copy vì `update_edge_weight()` sửa tại chỗ.
+        """
+        self.directed = compact.directed
+        self.nodes = compact.node_labels()
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        self.indptr = compact.indptr
+        self.indices = compact.indices
+        self.arc_edge = compact.arc_edge
+        self.weights = np.array(compact.weights, dtype=float)
+
+        # Heuristic (1/distance), η^β được tính sẵn vì không đổi giữa các iterations
+        self.heuristic = np.ones(len(self.weights))
+        positive = self.weights > 0
+        self.heuristic[positive] = 1.0 / self.weights[positive]
+        self._heuristic_beta = self.heuristic ** self.beta
+
+    def _writable_csr(self):
+        """
+        Copy CSR arrays read-only (memory-mapped) trước khi sửa tại chỗ.
+        """
+        for name in ('indptr', 'indices', 'arc_edge'):
+            array = getattr(self, name)
+            if not array.flags.writeable:
+                setattr(self, name, np.array(array))
+
+    def _writable_graph(self) -> nx.Graph:
+        """
+        Copy self.graph trước lần sửa đầu tiên để không thay đổi graph của caller.
+        """
+        if not self._owns_graph:
+            self.graph = self.graph.copy()
+            self._owns_graph = True
+        return self.graph
+
+    def _arc(self, i: int, j: int) -> int:
+        """
+        Index của arc i -> j trong CSR arrays (-1 nếu không có cạnh).
+        """
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        pos = lo + np.searchsorted(self.indices[lo:hi], j)
+        if pos < hi and self.indices[pos] == j:
+            return int(pos)
+        return -1
 
-        # Khởi tạo ma trận pheromone
-        # Dict {(u, v): pheromone_value}
-        self.pheromone = {}
-        for u, v in self.graph.edges():
-            self.pheromone[(u, v)] = 1.0
-            self.pheromone[(v, u)] = 1.0  # Undirected graph
-
-        # Khởi tạo ma trận heuristic (1/distance)
-        # Dict {(u, v): heuristic_value}
-        self.heuristic = {}
-        for u, v, data in self.graph.edges(data=True):
-            weight = data.get('weight', 1.0)
-            if weight > 0:
-                heuristic_value = 1.0 / weight
+    def _edge(self, i: int, j: int) -> int:
+        """
+        Edge id của arc i -> j (-1 nếu không có cạnh).
+        """
+        arc = self._arc(i, j)
+        return int(self.arc_edge[arc]) if arc >= 0 else -1
+
+    def fingerprint(self) -> str:
+        """
+        Fingerprint ổn định của đồ thị (cạnh + trọng số), dùng làm cache key.
+
+        Returns:
+        --------
+        str
+            SHA-1 hex digest
+        """
+        if self._fingerprint is None:
+            directed = self.directed
+            if self.graph is not None:
+                triples = self.graph.edges(data='weight', default=1.0)
             else:
-                heuristic_value = 1.0
-            self.heuristic[(u, v)] = heuristic_value
-            self.heuristic[(v, u)] = heuristic_value  # Undirected graph
+                sources, targets = self._edge_endpoints()
+                triples = ((self.nodes[u], self.nodes[v], float(w))
+                           for u, v, w in zip(sources.tolist(), targets.tolist(), self.weights))
+            edges = []
+            for u, v, weight in triples:
+                # Chuẩn hóa (numpy scalars -> Python, weight -> float) để networkx
+                # graph và CompactGraph của cùng một đồ thị có cùng fingerprint
+                a, b = repr(_builtin_label(u)), repr(_builtin_label(v))
+                if not directed and b < a:
+                    a, b = b, a
+                edges.append(f"{a}|{b}|{float(weight)!r}")
+            edges.sort()
+
+            digest = hashlib.sha1(f"directed={directed}".encode('utf-8'))
+            for edge in edges:
+                digest.update(b"\n" + edge.encode('utf-8'))
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def _edge_endpoints(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (source, target) indices theo edge id, đọc từ CSR arrays.
+        """
+        compact = CompactGraph(self.indptr, self.indices, self.arc_edge, self.weights, self.directed)
+        return compact.edge_endpoints()
 
-    def _calculate_probabilities(
+    def to_compact(self) -> CompactGraph:
+        """
+        `CompactGraph` của đồ thị hiện tại (để `save()` và nạp lại nhanh ở workers).
+        """
+        sources, targets = self._edge_endpoints()
+        return CompactGraph.from_arrays(sources, targets, self.weights, self.directed, nodes=self.nodes)
+
+    def get_pheromone_state(self) -> np.ndarray:
+        """
+        Bản sao trạng thái pheromone hiện tại (để lưu lại và warm start sau).
+        """
+        return self.pheromone.copy()
+
+    def set_pheromone_state(self, state: np.ndarray):
+        """
+        Warm start: nạp trạng thái pheromone đã lưu từ `get_pheromone_state()`.
+        """
+        state = np.asarray(state, dtype=float)
+        if state.shape != self.pheromone.shape:
+            raise ValueError(
+                f"Pheromone state has shape {state.shape}, expected {self.pheromone.shape}"
+            )
+        self.pheromone[:] = state
+
+    def reset_pheromone(self):
+        """
+        Đặt lại pheromone về giá trị ban đầu (initial_pheromone) cho mọi arc.
+        """
+        self.pheromone.fill(self.initial_pheromone)
+
+    def _edge_id(self, u: Hashable, v: Hashable) -> int:
+        """
+        Edge id của cạnh (u, v); ValueError nếu cạnh không tồn tại.
+        """
+        edge = -1
+        if u in self.node_index and v in self.node_index:
+            edge = self._edge(self.node_index[u], self.node_index[v])
+        if edge < 0:
+            raise ValueError(f"Edge ({u}, {v}) is not in the graph")
+        return edge
+
+    def _reset_pheromone_around(self, nodes: List[int], radius: int):
+        """
+        Reset pheromone của mọi arc xuất phát từ các nút cách `nodes` tối đa
+        `radius` bước (BFS trên CSR).
+        """
+        frontier = set(nodes)
+        region = set(nodes)
+        for _ in range(radius):
+            next_frontier = set()
+            for i in frontier:
+                next_frontier.update(self.indices[self.indptr[i]:self.indptr[i + 1]].tolist())
+            frontier = next_frontier - region
+            region |= frontier
+
+        for i in region:
+            edges = self.arc_edge[self.indptr[i]:self.indptr[i + 1]]
+            self.pheromone[edges] = self.initial_pheromone
+
+    def _graph_changed(self, nodes: List[int], reset_radius: Optional[int]):
+        self._fingerprint = None
+        self._alias_tables.clear()
+        if reset_radius is not None:
+            self._reset_pheromone_around(nodes, reset_radius)
+
+    def update_edge_weight(
         self,
-        current_node: int,
-        unvisited: Set[int]
-    ) -> Dict[int, float]:
+        u: Hashable,
+        v: Hashable,
+        weight: float,
+        reset_radius: Optional[int] = None
+    ):
         """
-        Tính xác suất chọn nút tiếp theo dựa trên pheromone và heuristic.
+        Cập nhật trọng số một cạnh (vd. thay đổi giao thông) mà không build lại colony.
 
-        Công thức: P(i,j) = [τ(i,j)^α * η(i,j)^β] / Σ[τ(i,k)^α * η(i,k)^β]
-        trong đó:
-        - τ(i,j): pheromone trên cạnh (i,j)
-        - η(i,j): heuristic = 1/distance(i,j)
-        - α, β: trọng số
+        Weight và heuristic được sửa tại chỗ; pheromone đã học được giữ nguyên nên
+        lần `run()` tiếp theo tiếp tục từ trạng thái hiện tại. `self.graph` (bản
+        copy riêng của colony, không phải graph của caller) cũng được cập nhật.
 
         Parameters:
         -----------
-        current_node : int
-            Nút hiện tại
-        unvisited : Set[int]
-            Tập các nút chưa thăm
+        u, v : Hashable
+            Hai đầu của cạnh
+        weight : float
+            Trọng số mới
+        reset_radius : int, optional
+            Nếu có, reset pheromone quanh cạnh thay đổi (các arcs xuất phát từ
+            nút cách u hoặc v tối đa `reset_radius` bước) về initial_pheromone
+        """
+        edge = self._edge_id(u, v)
+        if self.graph is not None:
+            self._writable_graph()[u][v]['weight'] = weight
 
-        Returns:
-        --------
-        Dict[int, float]
-            Dictionary {node: probability}
+        self.weights[edge] = weight
+        self.heuristic[edge] = 1.0 / weight if weight > 0 else 1.0
+        self._heuristic_beta[edge] = self.heuristic[edge] ** self.beta
+        self._graph_changed([self.node_index[u], self.node_index[v]], reset_radius)
+
+    def remove_edge(self, u: Hashable, v: Hashable, reset_radius: Optional[int] = None):
         """
-        probabilities = {}
-        attractiveness = {}
+        Đóng một cạnh: xóa edge và các arcs tương ứng khỏi CSR arrays (và khỏi self.graph).
 
-        # Tính attractiveness cho mỗi nút có thể đến được
-        for next_node in unvisited:
-            if self.graph.has_edge(current_node, next_node):
-                edge = (current_node, next_node)
-                tau = self.pheromone.get(edge, 1.0)
-                eta = self.heuristic.get(edge, 1.0)
+        Parameters:
+        -----------
+        u, v : Hashable
+            Hai đầu của cạnh
+        reset_radius : int, optional
+            Xem `update_edge_weight()`
+        """
+        edge = self._edge_id(u, v)
+        if self.graph is not None:
+            self._writable_graph().remove_edge(u, v)
+
+        self._writable_csr()
+        arcs = np.flatnonzero(self.arc_edge == edge)
+        for arc in arcs[::-1]:
+            source = int(np.searchsorted(self.indptr, arc, side='right') - 1)
+            self.indptr[source + 1:] -= 1
+        self.indices = np.delete(self.indices, arcs)
+        self.arc_edge = np.delete(self.arc_edge, arcs)
+        self.arc_edge[self.arc_edge > edge] -= 1
+
+        self.weights = np.delete(self.weights, edge)
+        self.heuristic = np.delete(self.heuristic, edge)
+        self._heuristic_beta = np.delete(self._heuristic_beta, edge)
+        self.pheromone = np.delete(self.pheromone, edge)
+        self._graph_changed([self.node_index[u], self.node_index[v]], reset_radius)
+
+    def add_edge(
+        self,
+        u: Hashable,
+        v: Hashable,
+        weight: float = 1.0,
+        reset_radius: Optional[int] = None
+    ):
+        """
+        Thêm (hoặc mở lại) một cạnh. Nút mới được thêm vào cuối node map.
 
-                # attractiveness = τ^α * η^β
-                attractiveness[next_node] = (tau ** self.alpha) * (eta ** self.beta)
+        Pheromone của cạnh mới = initial_pheromone; các cạnh khác giữ nguyên
+        pheromone đã học. Nếu cạnh đã tồn tại thì chỉ cập nhật trọng số.
 
-        # Nếu không có nút nào có thể đến, return empty dict
-        if not attractiveness:
-            return {}
+        Parameters:
+        -----------
+        u, v : Hashable
+            Hai đầu của cạnh
+        weight : float
+            Trọng số cạnh
+        reset_radius : int, optional
+            Xem `update_edge_weight()`
+        """
+        if (u in self.node_index and v in self.node_index
+                and self._edge(self.node_index[u], self.node_index[v]) >= 0):
+            self.update_edge_weight(u, v, weight, reset_radius)
+            return
+
+        self._writable_csr()
+        for node in (u, v):
+            if node not in self.node_index:
+                self.node_index[node] = len(self.nodes)
+                self.nodes.append(node)
+                self.indptr = np.append(self.indptr, self.indptr[-1])
+        if self.graph is not None:
+            self._writable_graph().add_edge(u, v, weight=weight)
+
+        i, j = self.node_index[u], self.node_index[v]
+        heuristic = 1.0 / weight if weight > 0 else 1.0
+        edge = len(self.weights)
+        self.weights = np.append(self.weights, weight)
+        self.heuristic = np.append(self.heuristic, heuristic)
+        self._heuristic_beta = np.append(self._heuristic_beta, heuristic ** self.beta)
+        self.pheromone = np.append(self.pheromone, self.initial_pheromone)
+
+        arcs = [(i, j)] if self.directed or i == j else [(i, j), (j, i)]
+        for source, target in arcs:
+            lo, hi = self.indptr[source], self.indptr[source + 1]
+            pos = int(lo + np.searchsorted(self.indices[lo:hi], target))
+            self.indices = np.insert(self.indices, pos, target)
+            self.arc_edge = np.insert(self.arc_edge, pos, edge)
+            self.indptr[source + 1:] += 1
+        self._graph_changed([i, j], reset_radius)
+
+    def seed_pheromone(
+        self,
+        start: Hashable,
+        end: Hashable,
+        method: str = 'dijkstra',
+        k: int = 1,
+        heuristic: Optional[Callable[[Hashable, Hashable], float]] = None,
+        amount: Optional[float] = None
+    ) -> List[Tuple[List, float]]:
+        """
+        Deposit pheromone dọc theo các đường đi tất định từ start tới end.
 
-        # Chuẩn hóa thành xác suất
-        total = sum(attractiveness.values())
-        for node, attr in attractiveness.items():
-            probabilities[node] = attr / total
+        Colony sau đó tập trung tinh chỉnh quanh các hành lang tốt này thay vì
+        khám phá ngẫu nhiên từ pheromone đồng nhất, nên cần ít iterations hơn.
 
-        return probabilities
+        Parameters:
+        -----------
+        start, end : Hashable
+            Nút bắt đầu và nút đích
+        method : str
+            'dijkstra', 'astar' (dùng `heuristic`) hoặc 'k_shortest' (k đường
+            đơn ngắn nhất, Yen; cần networkx graph)
+        k : int
+            Số đường đi cho 'k_shortest'
+        heuristic : callable, optional
+            Heuristic h(u, v) cho A* (None = Dijkstra)
+        amount : float, optional
+            Pheromone cho mỗi đường đi. Mặc định n_ants * Q / L, tương đương
+            toàn bộ colony vừa đi qua đường đó một lần
 
-    def _select_next_node(self, probabilities: Dict[int, float]) -> int:
+        Returns:
+        --------
+        List[Tuple[List, float]]
+            Các (path, distance) đã được seed
+        """
+        if method not in self.SEED_METHODS:
+            raise ValueError(f"method must be one of {self.SEED_METHODS}, got {method!r}")
+
+        if self.graph is None and method != 'k_shortest':
+            # Không có networkx graph: Dijkstra/A* trực tiếp trên CSR arrays
+            path = self._shortest_path(self.node_index[start], self.node_index[end],
+                                       heuristic if method == 'astar' else None)
+            if path is None:
+                raise nx.NetworkXNoPath(f"No path between {start} and {end}")
+            paths = [[self.nodes[i] for i in path]]
+        elif self.graph is None:
+            raise ValueError("'k_shortest' seeding needs a networkx graph")
+        elif method == 'dijkstra':
+            paths = [nx.dijkstra_path(self.graph, start, end, weight='weight')]
+        elif method == 'astar':
+            paths = [nx.astar_path(self.graph, start, end, heuristic=heuristic, weight='weight')]
+        else:
+            paths = list(itertools.islice(
+                nx.shortest_simple_paths(self.graph, start, end, weight='weight'), k))
+
+        seeded = []
+        for path in paths:
+            index_path = [self.node_index[node] for node in path]
+            edges = np.array([self._edge(index_path[i], index_path[i + 1])
+                              for i in range(len(index_path) - 1)], dtype=np.int64)
+            distance = float(self.weights[edges].sum())
+            if distance > 0:
+                deposit = amount if amount is not None else self.n_ants * self.Q / distance
+                np.add.at(self.pheromone, edges, deposit)
+            seeded.append((path, distance))
+        return seeded
+
+    def _shortest_path(
+        self,
+        source: int,
+        target: int,
+        heuristic: Optional[Callable[[Hashable, Hashable], float]] = None
+    ) -> Optional[List[int]]:
         """
-        Chọn nút tiếp theo dựa trên xác suất.
+        Dijkstra (hoặc A* nếu có `heuristic` h(u, v) trên node labels) trên CSR arrays.
+
+        Returns:
+        --------
+        Optional[List[int]]
+            Node indices từ source tới target, hoặc None nếu không có đường đi
+        """
+        goal = self.nodes[target]
+        distance = {source: 0.0}
+        parent = {source: -1}
+        done = set()
+        heap = [(0.0, source)]
+        while heap:
+            _, u = heapq.heappop(heap)
+            if u in done:
+                continue
+            if u == target:
+                path = []
+                while u >= 0:
+                    path.append(u)
+                    u = parent[u]
+                return path[::-1]
+            done.add(u)
+
+            lo, hi = self.indptr[u], self.indptr[u + 1]
+            for v, edge in zip(self.indices[lo:hi].tolist(), self.arc_edge[lo:hi].tolist()):
+                d = distance[u] + self.weights[edge]
+                if d < distance.get(v, float('inf')):
+                    distance[v] = d
+                    parent[v] = u
+                    h = heuristic(self.nodes[v], goal) if heuristic is not None else 0.0
+                    heapq.heappush(heap, (d + h, v))
+        return None
+
+    def _prepare_iteration(self):
+        """
+        Tính attractiveness τ^α * η^β cho mọi edge.
+
+        Pheromone không đổi trong một iteration (chỉ cập nhật sau khi mọi kiến
+        đã đi xong), nên giá trị này được tính một lần cho cả iteration. Alias
+        tables được xây lại theo attractiveness mới, trừ khi alpha = 0 (phân
+        phối chỉ phụ thuộc heuristic nên giữ nguyên giữa các iterations).
+        """
+        if self.alpha != 0:
+            self._alias_tables.clear()
+        if self.alpha == 1.0:
+            self._attractiveness = self.pheromone * self._heuristic_beta
+        else:
+            self._attractiveness = (self.pheromone ** self.alpha) * self._heuristic_beta
+
+    def _select_next_node(self, current: int, visited: np.ndarray) -> int:
+        """
+        Chọn nút tiếp theo dựa trên pheromone và heuristic.
+
+        Công thức: P(i,j) = [τ(i,j)^α * η(i,j)^β] / Σ[τ(i,k)^α * η(i,k)^β]
+        trong đó:
+        - τ(i,j): pheromone trên cạnh (i,j)
+        - η(i,j): heuristic = 1/distance(i,j)
+        - α, β: trọng số
+        và k chạy trên các nút kề chưa thăm của i.
 
         Parameters:
         -----------
-        probabilities : Dict[int, float]
-            Dictionary {node: probability}
+        current : int
+            Index của nút hiện tại
+        visited : np.ndarray
+            Boolean mask các nút đã thăm
 
         Returns:
         --------
         int
-            Nút được chọn
+            Index của arc được chọn, hoặc -1 nếu không còn nút kề chưa thăm
+        """
+        lo, hi = self.indptr[current], self.indptr[current + 1]
+        if self.alias_sampling and hi > lo:
+            arc = self._sample_alias(current, lo, hi, visited)
+            if arc >= 0:
+                return arc
+
+        candidates = np.flatnonzero(~visited[self.indices[lo:hi]])
+        if len(candidates) == 0:
+            return -1
+
+        # Chọn ngẫu nhiên theo xác suất (roulette wheel)
+        cumulative = np.cumsum(self._attractiveness[self.arc_edge[lo + candidates]])
+        pick = roulette(cumulative, self._uniforms.random())
+        if pick < 0:
+            pick = self._uniforms.integers(len(candidates))
+        return int(lo + candidates[pick])
+
+    def _sample_alias(self, current: int, lo: int, hi: int, visited: np.ndarray) -> int:
         """
-        if not probabilities:
-            return None
+        Rút một arc của `current` từ alias table của nút, từ chối nút đã thăm.
 
-        nodes = list(probabilities.keys())
-        probs = list(probabilities.values())
+        Phân phối trên các nút chưa thăm giống hệt roulette wheel (rejection
+        sampling giữ nguyên tỉ lệ giữa các arcs còn lại).
 
-        # Chọn ngẫu nhiên theo xác suất
-        selected = np.random.choice(nodes, p=probs)
-        return selected
+        Returns:
+        --------
+        int
+            Index của arc được chọn, hoặc -1 sau ALIAS_MAX_REJECTIONS lần bị từ
+            chối (caller dùng roulette wheel trên các nút chưa thăm)
+        """
+        table = self._alias_tables.get(current)
+        if table is None:
+            table = alias_table(self._attractiveness[self.arc_edge[lo:hi]])
+            self._alias_tables[current] = table
+        prob, alias = table
+
+        for _ in range(self.ALIAS_MAX_REJECTIONS):
+            arc = lo + alias_draw(prob, alias, self._uniforms.random())
+            if not visited[self.indices[arc]]:
+                return int(arc)
+        return -1
 
     def _construct_solution(self, start: int, end: int) -> Tuple[List[int], float]:
         """
@@ -158,48 +613,42 @@ class AntColony:
             - path: Danh sách các nút trong đường đi
             - total_distance: Tổng khoảng cách của đường đi
         """
-        path = [start]
-        current = start
-        unvisited = set(self.graph.nodes()) - {start}
+        source = self.node_index[start]
+        target = self.node_index[end]
+        path = [source]
+        current = source
+        visited = np.zeros(len(self.nodes), dtype=bool)
+        visited[source] = True
         total_distance = 0.0
 
         # Di chuyển cho đến khi đến đích
-        while current != end and unvisited:
-            # Tính xác suất cho các nút tiếp theo
-            probabilities = self._calculate_probabilities(current, unvisited)
+        while current != target:
+            arc = self._select_next_node(current, visited)
 
             # Nếu không có đường đi nào, break
-            if not probabilities:
+            if arc < 0:
                 # Thử tìm đường đi ngắn nhất còn lại (fallback)
-                if end in unvisited and nx.has_path(self.graph, current, end):
-                    try:
-                        shortest = nx.shortest_path(self.graph, current, end, weight='weight')
-                        for node in shortest[1:]:
-                            path.append(node)
-                            edge_data = self.graph[current][node]
-                            total_distance += edge_data.get('weight', 1.0)
-                            current = node
-                    except nx.NetworkXNoPath:
-                        break
+                shortest = None if visited[target] else self._shortest_path(current, target)
+                if shortest is not None:
+                    for next_index in shortest[1:]:
+                        total_distance += self.weights[self._edge(current, next_index)]
+                        path.append(next_index)
+                        current = next_index
                 break
 
-            # Chọn nút tiếp theo
-            next_node = self._select_next_node(probabilities)
-
-            # Cập nhật đường đi
-            path.append(next_node)
-            edge_data = self.graph[current][next_node]
-            total_distance += edge_data.get('weight', 1.0)
-
             # Di chuyển đến nút tiếp theo
-            unvisited.remove(next_node)
-            current = next_node
+            current = int(self.indices[arc])
+            path.append(current)
+            total_distance += self.weights[self.arc_edge[arc]]
+            visited[current] = True
+
+        path = [self.nodes[i] for i in path]
 
         # Nếu không đến được đích, trả về đường đi vô cực
-        if current != end:
+        if current != target:
             return (path, float('inf'))
 
-        return (path, total_distance)
+        return (path, float(total_distance))
 
     def _update_pheromone(self, all_paths: List[Tuple[List[int], float]]):
         """
@@ -216,8 +665,7 @@ class AntColony:
             Danh sách các (path, distance) của tất cả kiến
         """
         # Bước 1: Bay hơi pheromone
-        for edge in self.pheromone:
-            self.pheromone[edge] *= (1 - self.evaporation_rate)
+        self.pheromone *= (1 - self.evaporation_rate)
 
         # Bước 2: Cập nhật pheromone từ các đường đi
         for path, distance in all_paths:
@@ -228,17 +676,111 @@ class AntColony:
             # Lượng pheromone thêm vào
             delta_pheromone = self.Q / distance
 
-            # Cập nhật cho mỗi cạnh trong đường đi
-            for i in range(len(path) - 1):
-                u, v = path[i], path[i + 1]
+            # Cập nhật cho mỗi cạnh trong đường đi (với undirected graph, hai
+            # chiều dùng chung một edge id nên chỉ cần cộng một lần)
+            edges = [
+                self._edge(self.node_index[path[k]], self.node_index[path[k + 1]])
+                for k in range(len(path) - 1)
+            ]
+            np.add.at(self.pheromone, np.asarray(edges, dtype=np.int64), delta_pheromone)
+
+    def iterate(
+        self,
+        start: int,
+        end: int,
+        n_iterations: Optional[int] = None
+    ) -> Iterator[IterationState]:
+        """
+        Chạy thuật toán ACO theo từng iteration (generator).
+
+        Mỗi iteration yield một `IterationState`, cho phép caller stream kết quả,
+        tự dừng theo tiêu chí riêng (chỉ cần `break`) hoặc xen kẽ nhiều solvers.
+
+        Parameters:
+        -----------
+        start : int
+            Nút bắt đầu
+        end : int
+            Nút đích
+        n_iterations : int, optional
+            Số vòng lặp (mặc định: self.n_iterations)
+
+        Yields:
+        -------
+        IterationState
+            Trạng thái sau mỗi iteration
+        """
+        if n_iterations is None:
+            n_iterations = self.n_iterations
+
+        if self.seed_paths is not None:
+            self.seed_pheromone(start, end, self.seed_paths, k=self.n_seed_paths)
+
+        best_path = None
+        best_distance = float('inf')
+        start_time = time.perf_counter()
+
+        for iteration in range(n_iterations):
+            iteration_start = time.perf_counter()
+            all_paths = []
+            iteration_best_path = None
+            iteration_best_distance = float('inf')
+
+            self._prepare_iteration()
+            prepared = time.perf_counter()
+
+            # Mỗi kiến xây dựng một giải pháp
+            for ant in range(self.n_ants):
+                path, distance = self._construct_solution(start, end)
+                all_paths.append((path, distance))
+
+                if distance < iteration_best_distance:
+                    iteration_best_path = path
+                    iteration_best_distance = distance
 
-                # Cập nhật cả hai chiều (undirected graph)
-                if (u, v) in self.pheromone:
-                    self.pheromone[(u, v)] += delta_pheromone
-                if (v, u) in self.pheromone:
-                    self.pheromone[(v, u)] += delta_pheromone
+            # Cập nhật best solution
+            if iteration_best_distance < best_distance:
+                best_path = iteration_best_path
+                best_distance = iteration_best_distance
 
-    def run(self, start: int, end: int) -> Tuple[List[int], float, List[float]]:
+            # Cập nhật pheromone
+            constructed = time.perf_counter()
+            self._update_pheromone(all_paths)
+
+            valid = [d for _, d in all_paths if d < float('inf')]
+            now = time.perf_counter()
+            yield IterationState(
+                iteration=iteration,
+                best_solution=best_path,
+                best_distance=best_distance,
+                iteration_best_solution=iteration_best_path,
+                iteration_best_distance=iteration_best_distance,
+                mean_distance=float(np.mean(valid)) if valid else float('inf'),
+                iteration_time=now - iteration_start,
+                elapsed_time=now - start_time,
+                n_failed=len(all_paths) - len(valid),
+                phase_times={'prepare': prepared - iteration_start,
+                             'construct': constructed - prepared,
+                             'update': now - constructed}
+            )
+
+    def aiterate(
+        self,
+        start: int,
+        end: int,
+        n_iterations: Optional[int] = None
+    ) -> AsyncIterator[IterationState]:
+        """
+        Async counterpart của `iterate()`: `async for state in aco.aiterate(...)`.
+        """
+        return async_iterate(self.iterate(start, end, n_iterations))
+
+    def run(
+        self,
+        start: int,
+        end: int,
+        verbose: bool = True
+    ) -> Tuple[List[int], float, List[float]]:
         """
         Chạy thuật toán ACO để tìm đường đi ngắn nhất.
 
@@ -248,6 +790,8 @@ class AntColony:
             Nút bắt đầu
         end : int
             Nút đích
+        verbose : bool
+            Print progress (default: True)
 
         Returns:
         --------
@@ -261,39 +805,80 @@ class AntColony:
         best_distance = float('inf')
         history = []
 
-        print(f"Starting ACO algorithm...")
-        print(f"Parameters: n_ants={self.n_ants}, n_iterations={self.n_iterations}")
-        print(f"            alpha={self.alpha}, beta={self.beta}")
-        print(f"            evaporation_rate={self.evaporation_rate}, Q={self.Q}")
-        print(f"Finding shortest path from {start} to {end}...\n")
+        if verbose:
+            print(f"Starting ACO algorithm...")
+            print(f"Parameters: n_ants={self.n_ants}, n_iterations={self.n_iterations}")
+            print(f"            alpha={self.alpha}, beta={self.beta}")
+            print(f"            evaporation_rate={self.evaporation_rate}, Q={self.Q}")
+            print(f"Finding shortest path from {start} to {end}...\n")
 
-        # Chạy thuật toán
-        for iteration in range(self.n_iterations):
-            all_paths = []
-
-            # Mỗi kiến xây dựng một giải pháp
-            for ant in range(self.n_ants):
-                path, distance = self._construct_solution(start, end)
-                all_paths.append((path, distance))
-
-                # Cập nhật best solution
-                if distance < best_distance:
-                    best_path = path
-                    best_distance = distance
-
-            # Cập nhật pheromone
-            self._update_pheromone(all_paths)
+        for state in self.iterate(start, end):
+            best_path = state.best_solution
+            best_distance = state.best_distance
 
             # Lưu lịch sử
             history.append(best_distance)
 
             # In tiến trình
-            if (iteration + 1) % 10 == 0 or iteration == 0:
-                print(f"Iteration {iteration + 1}/{self.n_iterations}: "
+            if verbose and ((state.iteration + 1) % 10 == 0 or state.iteration == 0):
+                print(f"Iteration {state.iteration + 1}/{self.n_iterations}: "
                       f"Best distance = {best_distance:.2f}")
 
-        print(f"\nAlgorithm completed!")
-        print(f"Best path found: {best_path}")
-        print(f"Best distance: {best_distance:.2f}")
+        if verbose:
+            print(f"\nAlgorithm completed!")
+            print(f"Best path found: {best_path}")
+            print(f"Best distance: {best_distance:.2f}")
 
         return best_path, best_distance, history
+
+    def run_many(
+        self,
+        pairs: Iterable[Tuple[Hashable, Hashable]],
+        n_iterations: Optional[int] = None,
+        verbose: bool = False
+    ) -> Dict[Tuple[Hashable, Hashable], Tuple[List, float]]:
+        """
+        Giải một batch các cặp origin-destination trên cùng đồ thị.
+
+        Các queries được nhóm theo đích: mỗi đích có một pheromone field riêng
+        (reset một lần), được dùng chung và tích lũy qua mọi nguồn tới đích đó.
+        Graph compilation và heuristic arrays được tính một lần trong __init__
+        nên chi phí setup được chia đều cho cả batch.
+
+        Parameters:
+        -----------
+        pairs : Iterable[Tuple]
+            Các cặp (start, end); cặp trùng lặp chỉ được giải một lần
+        n_iterations : int, optional
+            Số vòng lặp cho mỗi query (mặc định: self.n_iterations). Nhờ pheromone
+            dùng chung, các queries sau thường cần ít iterations hơn.
+        verbose : bool
+            Print progress theo từng đích
+
+        Returns:
+        --------
+        Dict[Tuple, Tuple[List, float]]
+            {(start, end): (best_path, best_distance)}
+        """
+        # Nhóm theo đích, giữ thứ tự xuất hiện (dict làm ordered set cho nguồn)
+        groups: Dict[Hashable, Dict[Hashable, None]] = {}
+        for start, end in pairs:
+            groups.setdefault(end, {})[start] = None
+
+        results = {}
+        for group_index, (end, sources) in enumerate(groups.items()):
+            self.reset_pheromone()
+            for start in sources:
+                state = None
+                for state in self.iterate(start, end, n_iterations):
+                    pass
+                if state is None:
+                    results[(start, end)] = (None, float('inf'))
+                else:
+                    results[(start, end)] = (state.best_solution, state.best_distance)
+
+            if verbose:
+                print(f"Destination {group_index + 1}/{len(groups)} ({end}): "
+                      f"{len(sources)} sources solved")
+
+        return results
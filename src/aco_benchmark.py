@@ -0,0 +1,370 @@
+"""
+Benchmark headless cho `AntColony` (shortest path) trên đồ thị sinh ngẫu nhiên
+
+Các loại đồ thị (sinh thẳng thành `CompactGraph`, không qua networkx, nên tới
+1M nodes vẫn nhanh):
+- grid: lưới vuông 4-láng giềng, trọng số ngẫu nhiên trong [1, 2)
+- geometric: random geometric graph trên hình vuông đơn vị, bậc trung bình ~8,
+  trọng số = khoảng cách Euclid
+- scale_free: cây preferential attachment + cạnh Chung-Lu theo phân phối
+  power-law (liên thông, bậc theo luật lũy thừa), trọng số trong [1, 10)
+
+Với mỗi (loại, kích thước) đo thời gian từng phase (sinh đồ thị, compile
+colony, Dijkstra, toàn bộ `colony.iterate()` và prepare/construct/update của
+mỗi iteration theo `IterationState.phase_times`), ants/second (theo iterate()),
+peak memory và gap của best path so với Dijkstra; kết quả ghi ra JSON để so
+sánh giữa các commits. Mỗi case chạy trong một process riêng (spawn) để peak
+RSS là của riêng case đó:
+
+    python -m src.aco_benchmark --sizes 100 1000 10000 --output bench.json
+    python -m src.aco_benchmark --output new.json --compare bench.json
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .aco import AntColony
+from .compact_graph import CompactGraph
+from .rng import SeedLike, make_generator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+
+
+def grid_graph(n: int, rng: np.random.Generator) -> CompactGraph:
+    """
+    Lưới side × side (side = ceil(sqrt(n))) với trọng số ngẫu nhiên trong [1, 2).
+    """
+    side = max(2, int(math.ceil(math.sqrt(n))))
+    index = np.arange(side * side, dtype=np.int64).reshape(side, side)
+    sources = np.concatenate((index[:, :-1].ravel(), index[:-1, :].ravel()))
+    targets = np.concatenate((index[:, 1:].ravel(), index[1:, :].ravel()))
+    weights = 1.0 + rng.random(len(sources))
+    return CompactGraph.from_arrays(sources, targets, weights, n_nodes=side * side)
+
+
+def random_geometric_graph(n: int, rng: np.random.Generator, degree: float = 8.0) -> CompactGraph:
+    """
+    n điểm ngẫu nhiên trên hình vuông đơn vị, nối các cặp cách nhau < r với
+    r = sqrt(degree / (π n)). Các cặp được tìm qua lưới ô cạnh r (mỗi điểm chỉ
+    so với ô của nó và 4 ô kề "phía sau"), vectorized theo từng offset.
+    """
+    radius = math.sqrt(degree / (math.pi * n))
+    points = rng.random((n, 2))
+    cells_per_side = max(1, int(1.0 / radius))
+    cell_xy = np.minimum((points * cells_per_side).astype(np.int64), cells_per_side - 1)
+    cell = cell_xy[:, 0] * cells_per_side + cell_xy[:, 1]
+
+    order = np.argsort(cell, kind='stable')
+    sorted_cell = cell[order]
+    n_cells = cells_per_side * cells_per_side
+    cell_start = np.searchsorted(sorted_cell, np.arange(n_cells), side='left')
+    cell_end = np.searchsorted(sorted_cell, np.arange(n_cells), side='right')
+
+    sources, targets = [], []
+    for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+        cx, cy = cell_xy[:, 0] + dx, cell_xy[:, 1] + dy
+        valid = (cx >= 0) & (cx < cells_per_side) & (cy >= 0) & (cy < cells_per_side)
+        points_i = np.flatnonzero(valid)
+        neighbour_cell = cx[valid] * cells_per_side + cy[valid]
+        start, end = cell_start[neighbour_cell], cell_end[neighbour_cell]
+        counts = end - start
+        # Mở rộng mỗi điểm thành các điểm trong ô láng giềng
+        i = np.repeat(points_i, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        j = order[np.repeat(start, counts) + offsets]
+        keep = (i < j) if (dx, dy) == (0, 0) else np.ones(len(i), dtype=bool)
+        i, j = i[keep], j[keep]
+        close = ((points[i] - points[j]) ** 2).sum(axis=1) < radius ** 2
+        sources.append(i[close])
+        targets.append(j[close])
+
+    sources = np.concatenate(sources)
+    targets = np.concatenate(targets)
+    weights = np.sqrt(((points[sources] - points[targets]) ** 2).sum(axis=1))
+    return CompactGraph.from_arrays(sources, targets, weights, n_nodes=n,
+                                    lats=points[:, 1], lons=points[:, 0])
+
+
+def scale_free_graph(n: int, rng: np.random.Generator, m: int = 3, exponent: float = 2.5) -> CompactGraph:
+    """
+    Đồ thị scale-free liên thông với ~m·n cạnh.
+
+    Node i có trọng số w_i ∝ (i + 1)^(-1/(exponent - 1)). Mỗi node i > 0 nối
+    với một node j < i chọn theo w (cây preferential attachment, đảm bảo liên
+    thông), cộng (m - 1)·n cạnh Chung-Lu với hai đầu chọn theo w.
+    """
+    w = (np.arange(n) + 1.0) ** (-1.0 / (exponent - 1.0))
+    cumulative = np.cumsum(w)
+
+    children = np.arange(1, n, dtype=np.int64)
+    parents = np.searchsorted(cumulative, rng.random(n - 1) * cumulative[children - 1], side='right')
+    parents = np.minimum(parents, children - 1)
+
+    extra = (m - 1) * n
+    a = np.searchsorted(cumulative, rng.random(extra) * cumulative[-1], side='right')
+    b = np.searchsorted(cumulative, rng.random(extra) * cumulative[-1], side='right')
+    a, b = np.minimum(a, n - 1), np.minimum(b, n - 1)
+    distinct = a != b
+
+    sources = np.concatenate((children, a[distinct]))
+    targets = np.concatenate((parents, b[distinct]))
+    weights = 1.0 + 9.0 * rng.random(len(sources))
+    return CompactGraph.from_arrays(sources, targets, weights, n_nodes=n)
+
+
+GRAPH_TYPES: Dict[str, Callable[[int, np.random.Generator], CompactGraph]] = {
+    'grid': grid_graph,
+    'geometric': random_geometric_graph,
+    'scale_free': scale_free_graph,
+}
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size của process (MB); None nếu không có module `resource`.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux báo KB, macOS báo bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _query(colony: AntColony, rng: np.random.Generator, attempts: int = 20) -> Tuple[int, int, List[int], float]:
+    """
+    Một cặp (start, end) ngẫu nhiên có đường đi, cùng đường đi Dijkstra.
+    """
+    n = len(colony.nodes)
+    for _ in range(attempts):
+        source, target = (int(v) for v in rng.integers(n, size=2))
+        if source == target:
+            continue
+        path = colony._shortest_path(source, target)
+        if path is not None:
+            edges = [colony._edge(path[k], path[k + 1]) for k in range(len(path) - 1)]
+            return source, target, path, float(colony.weights[edges].sum())
+    raise RuntimeError(f"No connected (start, end) pair found after {attempts} attempts")
+
+
+def benchmark_case(
+    graph_type: str,
+    n: int,
+    n_ants: int = 10,
+    n_iterations: int = 5,
+    seed: SeedLike = 0,
+    params: Optional[Dict] = None
+) -> Dict:
+    """
+    Benchmark một (loại đồ thị, kích thước).
+
+    Parameters:
+    -----------
+    graph_type : str
+        Một trong GRAPH_TYPES
+    n : int
+        Số nodes (grid làm tròn lên số chính phương)
+    n_ants, n_iterations : int
+        Tham số colony
+    seed : int, optional
+        Seed cho đồ thị, query và colony
+    params : Dict, optional
+        Tham số `AntColony` khác (vd. {'alias_sampling': True})
+
+    Returns:
+    --------
+    Dict
+        Kích thước đồ thị, thời gian từng phase (seconds; 'iterate' là toàn
+        bộ `colony.iterate()`), ants_per_second (theo 'iterate'),
+        graph_mb (arrays của đồ thị), baseline_rss_mb / peak_rss_mb (peak RSS
+        của process lúc bắt đầu / kết thúc case; chỉ là của riêng case khi
+        chạy trong process riêng, xem `run_benchmark(isolate=True)`),
+        best/dijkstra distance, gap và failed_ants (số ants không tới được
+        đích); best_distance và gap là None nếu không ant nào tới đích
+    """
+    rng = make_generator(seed)
+    phases = {}
+    baseline_rss = _peak_rss_mb()
+
+    t = time.perf_counter()
+    graph = GRAPH_TYPES[graph_type](n, rng)
+    phases['generate'] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    colony = AntColony(graph, n_ants=n_ants, n_iterations=n_iterations, seed=rng, **(params or {}))
+    phases['compile'] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    source, target, _, optimum = _query(colony, rng)
+    phases['dijkstra'] = time.perf_counter() - t
+
+    # Chạy đúng colony.iterate(); phase times lấy từ IterationState.phase_times
+    phases.update(prepare=0.0, construct=0.0, update=0.0)
+    start, end = colony.nodes[source], colony.nodes[target]
+    best = float('inf')
+    failed = 0
+    t = time.perf_counter()
+    for state in colony.iterate(start, end, n_iterations):
+        for phase, seconds in state.phase_times.items():
+            phases[phase] += seconds
+        best = state.best_distance
+        failed += state.n_failed
+    phases['iterate'] = time.perf_counter() - t
+
+    found = math.isfinite(best)
+    return {
+        'graph': graph_type,
+        'n_nodes': graph.n_nodes,
+        'n_edges': graph.n_edges,
+        'n_ants': n_ants,
+        'n_iterations': n_iterations,
+        'phases': phases,
+        'ants_per_second': n_ants * n_iterations / phases['iterate'] if phases['iterate'] > 0 else None,
+        'graph_mb': graph.nbytes / 1e6,
+        'baseline_rss_mb': baseline_rss,
+        'peak_rss_mb': _peak_rss_mb(),
+        'best_distance': best if found else None,
+        'dijkstra_distance': optimum,
+        'gap': None if not found else (best - optimum) / optimum if optimum > 0 else 0.0,
+        'failed_ants': failed,
+    }
+
+
+def run_benchmark(
+    graph_types: Optional[List[str]] = None,
+    sizes: Optional[List[int]] = None,
+    n_ants: int = 10,
+    n_iterations: int = 5,
+    seed: int = 0,
+    params: Optional[Dict] = None,
+    verbose: bool = True,
+    isolate: bool = True
+) -> List[Dict]:
+    """
+    Benchmark mọi (loại đồ thị, kích thước), kích thước tăng dần.
+
+    Với isolate=True mỗi case chạy trong một process mới (spawn): ru_maxrss
+    là high-water mark của cả process và không bao giờ giảm, nên chạy chung
+    một process thì mọi case sau case lớn nhất đều báo peak của case đó.
+    """
+    graph_types = list(GRAPH_TYPES) if graph_types is None else graph_types
+    sizes = DEFAULT_SIZES if sizes is None else sorted(sizes)
+    results = []
+    for n in sizes:
+        for graph_type in graph_types:
+            args = (graph_type, n, n_ants, n_iterations, seed, params)
+            if isolate:
+                context = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    result = pool.submit(benchmark_case, *args).result()
+            else:
+                result = benchmark_case(*args)
+            results.append(result)
+            if verbose:
+                print(format_row(result), flush=True)
+    return results
+
+
+def _format_mb(mb: Optional[float]) -> str:
+    return '-' if mb is None else f"{mb:.0f}"
+
+
+def _format_gap(gap: Optional[float]) -> str:
+    return '-' if gap is None else f"{100 * gap:.2f}%"
+
+
+def format_row(result: Dict) -> str:
+    phases = result['phases']
+    return (f"{result['graph']:<11} {result['n_nodes']:>8} {result['n_edges']:>9} "
+            f"{phases['generate']:>7.2f} {phases['compile']:>7.2f} {phases['dijkstra']:>7.2f} "
+            f"{phases['iterate']:>8.2f} {result['ants_per_second'] or 0:>8.1f} "
+            f"{_format_mb(result['peak_rss_mb']):>8} {_format_gap(result['gap']):>8} {result['failed_ants']:>7}")
+
+
+HEADER = (f"{'graph':<11} {'nodes':>8} {'edges':>9} {'gen s':>7} {'init s':>7} {'dijk s':>7} "
+          f"{'iter s':>8} {'ants/s':>8} {'rss MB':>8} {'gap':>8} {'failed':>7}")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict], baseline: List[Dict]) -> List[str]:
+    """
+    So sánh với một lần chạy trước (cùng loại đồ thị và số nodes): tỉ lệ
+    ants/second (mới / cũ) và gap.
+    """
+    previous = {(r['graph'], r['n_nodes']): r for r in baseline}
+    lines = []
+    for result in results:
+        old = previous.get((result['graph'], result['n_nodes']))
+        if old is None or not old.get('ants_per_second') or not result.get('ants_per_second'):
+            continue
+        speedup = result['ants_per_second'] / old['ants_per_second']
+        lines.append(f"{result['graph']:<11} {result['n_nodes']:>8}  ants/s x{speedup:.2f}  "
+                     f"gap {_format_gap(old.get('gap'))} -> {_format_gap(result['gap'])}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AntColony trên grid/geometric/scale-free graphs")
+    parser.add_argument('--graphs', nargs='*', choices=list(GRAPH_TYPES), default=list(GRAPH_TYPES))
+    parser.add_argument('--sizes', nargs='*', type=int, default=DEFAULT_SIZES,
+                        help="Số nodes (vd. 100 1000 10000 100000 1000000)")
+    parser.add_argument('--ants', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--params', default='{}', help="Tham số AntColony thêm (JSON)")
+    parser.add_argument('--output', help="Ghi kết quả ra file JSON")
+    parser.add_argument('--compare', help="File JSON của lần chạy trước để so sánh")
+    parser.add_argument('--no-isolate', action='store_true',
+                        help="Chạy mọi case trong process hiện tại (peak RSS không còn theo từng case)")
+    args = parser.parse_args()
+
+    params = json.loads(args.params)
+    print(HEADER)
+    results = run_benchmark(args.graphs, args.sizes, args.ants, args.iterations, args.seed, params,
+                            isolate=not args.no_isolate)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare} (commit {baseline.get('commit')}):")
+        for line in compare(results, baseline['results']):
+            print(line)
+
+    if args.output:
+        report = {
+            'commit': _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'config': {'ants': args.ants, 'iterations': args.iterations, 'seed': args.seed, 'params': params},
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, allow_nan=False)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Result và pheromone cache cho các truy vấn shortest path lặp lại
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from .aco import AntColony
+
+
+def _estimate_bytes(obj: Any) -> int:
+    """
+    Ước lượng bộ nhớ (bytes) của một giá trị được cache.
+
+    Hỗ trợ numpy arrays, dict, list/tuple và scalars. Đây là ước lượng nông
+    (không đệ quy sâu) nhưng đủ để áp dụng memory cap.
+    """
+    if hasattr(obj, 'nbytes'):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(
+            _estimate_bytes(k) + _estimate_bytes(v) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(_estimate_bytes(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+class SolverCache:
+    """
+    LRU cache cho `AntColony` với memory cap.
+
+    Hai loại entries:
+    - result: (fingerprint, start, end, params) -> (best_path, best_distance, history)
+      Trả về ngay khi query lặp lại và entry còn hợp lệ (chưa quá `max_age`).
+    - pheromone: (fingerprint, end, params) -> pheromone state sau lần chạy gần nhất
+      tới cùng đích. Khi result miss, colony được warm start từ state này thay vì
+      pheromone đồng nhất 1.0.
+
+    Parameters:
+    -----------
+    max_entries : int
+        Số entries tối đa (cả result lẫn pheromone)
+    max_bytes : int
+        Memory cap (bytes) ước lượng cho toàn bộ cache
+    max_age : float, optional
+        Thời gian sống của result (seconds). None = không hết hạn
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_age: Optional[float] = None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+        # key -> (value, size_bytes, created_at)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.warm_starts = 0
+
+    @staticmethod
+    def _params_key(colony: AntColony) -> Tuple:
+        return (colony.n_ants, colony.n_iterations, colony.alpha, colony.beta,
+                colony.evaporation_rate, colony.Q, colony.seed_paths, colony.n_seed_paths)
+
+    def _get(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        value, _, created_at = entry
+        return value, created_at
+
+    def _discard(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def _put(self, key: Hashable, value: Any):
+        size = _estimate_bytes(value)
+        if size > self.max_bytes:
+            # Không bao giờ vừa cache; bỏ qua thay vì xóa sạch cache
+            return
+
+        if key in self._entries:
+            self._discard(key)
+        self._entries[key] = (value, size, time.monotonic())
+        self.current_bytes += size
+
+        # LRU eviction
+        while self._entries and (
+            len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes
+        ):
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+
+    def lookup(self, colony: AntColony, start: Hashable, end: Hashable) -> Optional[Tuple[List, float, List[float]]]:
+        """
+        Tra cứu result đã cache cho query (start, end) trên colony.
+
+        Returns:
+        --------
+        Tuple hoặc None
+            (best_path, best_distance, history) nếu hit và còn hợp lệ
+        """
+        key = ('result', colony.fingerprint(), start, end, self._params_key(colony))
+        found = self._get(key)
+        if found is None:
+            return None
+
+        (path, distance, history), created_at = found
+        if self.max_age is not None and time.monotonic() - created_at > self.max_age:
+            # Hết hạn: xóa luôn để không giữ bytes và vị trí LRU
+            self._discard(key)
+            return None
+        return list(path), distance, list(history)
+
+    def run(
+        self,
+        colony: AntColony,
+        start: Hashable,
+        end: Hashable,
+        verbose: bool = False
+    ) -> Tuple[List, float, List[float]]:
+        """
+        Tương đương `colony.run(start, end)` nhưng dùng cache.
+
+        1. Result hit -> trả về ngay.
+        2. Miss -> warm start pheromone từ lần chạy trước tới cùng đích (nếu có;
+           nếu không thì reset pheromone để kết quả không phụ thuộc các query
+           trước), chạy colony, lưu result và pheromone state.
+
+        Returns:
+        --------
+        Tuple[List, float, List[float]]
+            (best_path, best_distance, history)
+        """
+        cached = self.lookup(colony, start, end)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+
+        fingerprint = colony.fingerprint()
+        params = self._params_key(colony)
+        pheromone_key = ('pheromone', fingerprint, end, params)
+
+        warm = self._get(pheromone_key)
+        if warm is not None:
+            colony.set_pheromone_state(warm[0])
+            self.warm_starts += 1
+        else:
+            colony.reset_pheromone()
+
+        best_path, best_distance, history = colony.run(start, end, verbose=verbose)
+
+        if best_path is not None:
+            self._put(('result', fingerprint, start, end, params),
+                      (list(best_path), best_distance, list(history)))
+        self._put(pheromone_key, colony.get_pheromone_state())
+
+        return best_path, best_distance, history
+
+    def clear(self):
+        """
+        Xóa toàn bộ cache và reset thống kê.
+        """
+        self._entries.clear()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.warm_starts = 0
+
+    def stats(self) -> Dict:
+        """
+        Thống kê cache: entries, bytes, hits, misses, warm_starts.
+        """
+        return {
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'warm_starts': self.warm_starts
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
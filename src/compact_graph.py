@@ -0,0 +1,396 @@
+"""
+Compact binary graph format cho AntColony (CSR arrays + memory-mapped loading)
+
+`CompactGraph` giữ đồ thị đã compile ở dạng mà `AntColony` dùng trực tiếp:
+
+- nodes[i]: node label của index i (None = labels chính là 0..n-1)
+- Các arcs của node i: indices[indptr[i]:indptr[i+1]] (sắp xếp tăng dần)
+- arc_edge[arc]: edge id của arc; weights[edge]: trọng số
+- lats, lons (optional): coordinates của các nodes
+
+Lưu dưới dạng một thư mục các file `.npy` thô (`save(path)`), nạp lại bằng
+`np.load(..., mmap_mode='r')`: không cần parse hay build networkx graph, và các
+worker processes nạp cùng một bundle dùng chung page cache của OS. Một file
+`.npz` duy nhất cũng được hỗ trợ (nhỏ gọn hơn nhưng được đọc hết vào RAM).
+"""
+
+import json
+import os
+from typing import Hashable, Iterable, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+FORMAT_NAME = 'aco-compact-graph'
+FORMAT_VERSION = 1
+
+_ARRAYS = ('indptr', 'indices', 'arc_edge', 'weights')
+_OPTIONAL_ARRAYS = ('nodes', 'lats', 'lons')
+
+
+class CompactGraph:
+    """
+    Đồ thị đã compile thành CSR arrays.
+
+    Thường được tạo bằng `from_networkx()`, `from_edge_list()`, `from_arrays()`
+    hoặc `load()` thay vì gọi constructor trực tiếp.
+
+    Parameters:
+    -----------
+    indptr, indices, arc_edge, weights : np.ndarray
+        CSR arrays (xem module docstring)
+    directed : bool
+        Đồ thị có hướng (Graph: mỗi cạnh có hai arcs dùng chung một edge id)
+    nodes : np.ndarray, optional
+        Node labels (None = 0..n-1)
+    lats, lons : np.ndarray, optional
+        Coordinates của các nodes
+    """
+
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        arc_edge: np.ndarray,
+        weights: np.ndarray,
+        directed: bool = False,
+        nodes: Optional[np.ndarray] = None,
+        lats: Optional[np.ndarray] = None,
+        lons: Optional[np.ndarray] = None
+    ):
+        self.indptr = indptr
+        self.indices = indices
+        self.arc_edge = arc_edge
+        self.weights = weights
+        self.directed = bool(directed)
+        self.nodes = nodes
+        self.lats = lats
+        self.lons = lons
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.weights)
+
+    def node_labels(self) -> list:
+        """
+        Danh sách node labels (Python objects) theo thứ tự index.
+        """
+        if self.nodes is None:
+            return list(range(self.n_nodes))
+        return self.nodes.tolist()
+
+    def edge_endpoints(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (sources, targets) theo edge id: arc đầu tiên (theo thứ tự CSR) của mỗi edge.
+        """
+        arc_sources = np.repeat(np.arange(self.n_nodes, dtype=np.int64), np.diff(self.indptr))
+        _, first_arc = np.unique(self.arc_edge, return_index=True)
+        return arc_sources[first_arc], np.asarray(self.indices)[first_arc]
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [getattr(self, name) for name in _ARRAYS + _OPTIONAL_ARRAYS]
+        return int(sum(a.nbytes for a in arrays if a is not None))
+
+    @classmethod
+    def from_arrays(
+        cls,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        directed: bool = False,
+        nodes: Optional[Iterable[Hashable]] = None,
+        lats: Optional[np.ndarray] = None,
+        lons: Optional[np.ndarray] = None,
+        n_nodes: Optional[int] = None
+    ) -> 'CompactGraph':
+        """
+        Build CSR từ danh sách cạnh dạng index (sources[e] -> targets[e]).
+
+        Edge id theo thứ tự input. Cạnh lặp lại (cùng cặp nodes; với Graph
+        không phân biệt chiều) được gộp như networkx: giữ vị trí lần xuất hiện
+        đầu tiên và trọng số của lần cuối cùng.
+
+        Parameters:
+        -----------
+        sources, targets : np.ndarray
+            Node indices hai đầu mỗi cạnh
+        weights : np.ndarray, optional
+            Trọng số mỗi cạnh (mặc định 1.0)
+        directed : bool
+            Đồ thị có hướng
+        nodes : Iterable, optional
+            Node labels theo index (None = 0..n-1)
+        lats, lons : np.ndarray, optional
+            Coordinates theo index
+        n_nodes : int, optional
+            Số nodes (mặc định len(nodes) hoặc max index + 1)
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if weights is None:
+            weights = np.ones(len(sources))
+        weights = np.asarray(weights, dtype=float)
+        if not (len(sources) == len(targets) == len(weights)):
+            raise ValueError("sources, targets and weights must have the same length")
+
+        if nodes is not None:
+            nodes = _label_array(nodes)
+            n_nodes = len(nodes)
+        elif n_nodes is None:
+            n_nodes = int(max(sources.max(initial=-1), targets.max(initial=-1))) + 1
+        if len(sources) and (min(sources.min(), targets.min()) < 0
+                             or max(sources.max(), targets.max()) >= n_nodes):
+            raise ValueError(f"Node indices must be in [0, {n_nodes})")
+
+        # Gộp cạnh lặp lại: key (u, v) (Graph: (min, max))
+        if directed:
+            low, high = sources, targets
+        else:
+            low, high = np.minimum(sources, targets), np.maximum(sources, targets)
+        keys = low * n_nodes + high
+        _, first = np.unique(keys, return_index=True)
+        if len(first) < len(keys):
+            _, last_reversed = np.unique(keys[::-1], return_index=True)
+            last = len(keys) - 1 - last_reversed
+            first_order = np.argsort(first, kind='stable')
+            keep = first[first_order]
+            sources, targets = sources[keep], targets[keep]
+            weights = weights[last[first_order]]
+
+        n_edges = len(sources)
+        edge_ids = np.arange(n_edges, dtype=np.int64)
+        if directed:
+            arc_sources, arc_targets, arc_edges = sources, targets, edge_ids
+        else:
+            # Graph: thêm arc ngược dùng chung edge id (trừ self-loops)
+            reverse = sources != targets
+            arc_sources = np.concatenate((sources, targets[reverse]))
+            arc_targets = np.concatenate((targets, sources[reverse]))
+            arc_edges = np.concatenate((edge_ids, edge_ids[reverse]))
+
+        # Sắp xếp theo (source, target) để tra cứu arc bằng binary search
+        order = np.lexsort((arc_targets, arc_sources))
+        indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(arc_sources, minlength=n_nodes), out=indptr[1:])
+
+        return cls(
+            indptr=indptr,
+            indices=arc_targets[order],
+            arc_edge=arc_edges[order],
+            weights=weights,
+            directed=directed,
+            nodes=nodes,
+            lats=None if lats is None else np.asarray(lats, dtype=float),
+            lons=None if lons is None else np.asarray(lons, dtype=float)
+        )
+
+    @classmethod
+    def from_networkx(
+        cls,
+        graph: nx.Graph,
+        weight: str = 'weight',
+        coordinates: Tuple[str, str] = ('lat', 'lon')
+    ) -> 'CompactGraph':
+        """
+        Compile một networkx Graph/DiGraph (một lần duyệt qua các cạnh).
+
+        Parameters:
+        -----------
+        graph : nx.Graph
+            Đồ thị nguồn
+        weight : str
+            Edge attribute chứa trọng số (mặc định 1.0 nếu thiếu)
+        coordinates : Tuple[str, str]
+            Node attributes (lat, lon); chỉ được lưu nếu mọi node đều có
+        """
+        nodes = list(graph.nodes())
+        node_index = {node: i for i, node in enumerate(nodes)}
+        n_edges = graph.number_of_edges()
+
+        sources = np.empty(n_edges, dtype=np.int64)
+        targets = np.empty(n_edges, dtype=np.int64)
+        weights = np.empty(n_edges, dtype=float)
+        for edge, (u, v, w) in enumerate(graph.edges(data=weight, default=1.0)):
+            sources[edge] = node_index[u]
+            targets[edge] = node_index[v]
+            weights[edge] = w
+
+        lats = lons = None
+        lat_key, lon_key = coordinates
+        if nodes and all(lat_key in data and lon_key in data for _, data in graph.nodes(data=True)):
+            lats = np.array([graph.nodes[node][lat_key] for node in nodes], dtype=float)
+            lons = np.array([graph.nodes[node][lon_key] for node in nodes], dtype=float)
+
+        return cls.from_arrays(sources, targets, weights, graph.is_directed(),
+                               nodes=nodes, lats=lats, lons=lons)
+
+    @classmethod
+    def from_edge_list(
+        cls,
+        path: str,
+        directed: bool = False,
+        delimiter: Optional[str] = None,
+        comments: str = '#',
+        nodetype: type = str
+    ) -> 'CompactGraph':
+        """
+        Đọc file edge list dạng text: mỗi dòng `u v [weight]` (format của
+        `nx.write_weighted_edgelist`), không qua networkx. Xem
+        `loaders.read_edge_list()` cho CSV/TSV, header và file rất lớn.
+
+        Parameters:
+        -----------
+        path : str
+            Đường dẫn file
+        directed : bool
+            Đồ thị có hướng
+        delimiter : str, optional
+            Ký tự phân cách (mặc định: whitespace)
+        comments : str
+            Phần sau ký tự này trên mỗi dòng bị bỏ qua
+        nodetype : type
+            Kiểu của node labels (vd. int)
+        """
+        # Import tại chỗ: loaders phụ thuộc vào module này
+        from .loaders import read_edge_list
+        return read_edge_list(path, directed=directed, delimiter=delimiter, header=False,
+                              comments=comments, nodetype=nodetype)
+
+    def to_networkx(self) -> nx.Graph:
+        """
+        Chuyển ngược về networkx Graph/DiGraph (weights và coordinates nếu có).
+        """
+        graph = nx.DiGraph() if self.directed else nx.Graph()
+        labels = self.node_labels()
+        if self.lats is not None and self.lons is not None:
+            graph.add_nodes_from((label, {'lat': float(lat), 'lon': float(lon)})
+                                 for label, lat, lon in zip(labels, self.lats, self.lons))
+        else:
+            graph.add_nodes_from(labels)
+        sources, targets = self.edge_endpoints()
+        graph.add_weighted_edges_from(
+            (labels[u], labels[v], float(w))
+            for u, v, w in zip(sources.tolist(), targets.tolist(), self.weights))
+        return graph
+
+    def save(self, path: str):
+        """
+        Lưu bundle: thư mục các file `.npy` (nạp được bằng mmap) hoặc, nếu
+        `path` kết thúc bằng `.npz`, một file nén duy nhất.
+        """
+        arrays = {name: getattr(self, name) for name in _ARRAYS + _OPTIONAL_ARRAYS
+                  if getattr(self, name) is not None}
+        meta = {'format': FORMAT_NAME, 'version': FORMAT_VERSION, 'directed': self.directed,
+                'n_nodes': self.n_nodes, 'n_edges': self.n_edges}
+
+        if path.endswith('.npz'):
+            np.savez_compressed(path, meta=np.array(json.dumps(meta)), **arrays)
+            return
+
+        os.makedirs(path, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(path, f'{name}.npy'), np.asarray(array),
+                    allow_pickle=array.dtype == object)
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = 'r', allow_pickle: bool = False) -> 'CompactGraph':
+        """
+        Nạp bundle đã lưu bằng `save()`.
+
+        Parameters:
+        -----------
+        path : str
+            Thư mục bundle hoặc file `.npz`
+        mmap_mode : str, optional
+            Mode của `np.load` cho thư mục `.npy` ('r' = read-only, dùng chung
+            page cache giữa các processes; None = đọc vào RAM). Bị bỏ qua với
+            `.npz` và với node labels kiểu object (không mmap được)
+        allow_pickle : bool
+            Cho phép nạp node labels kiểu object (vd. tuple), được lưu bằng
+            pickle. Unpickle có thể chạy code tùy ý, chỉ bật với bundle tin
+            cậy; các arrays khác luôn được nạp với allow_pickle=False
+        """
+        if path.endswith('.npz'):
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data['meta']))
+                arrays = {name: data[name] for name in data.files if name not in ('meta', 'nodes')}
+                if 'nodes' in data.files:
+                    with data.zip.open('nodes.npy') as f:
+                        pickled = _npy_dtype(f).hasobject
+                    _check_pickle(path, 'nodes', pickled, allow_pickle)
+                    if pickled:
+                        with np.load(path, allow_pickle=True) as labels:
+                            arrays['nodes'] = labels['nodes']
+                    else:
+                        arrays['nodes'] = data['nodes']
+        else:
+            with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            arrays = {}
+            for name in _ARRAYS + _OPTIONAL_ARRAYS:
+                file = os.path.join(path, f'{name}.npy')
+                if os.path.exists(file):
+                    arrays[name] = _load_array(file, name, mmap_mode, allow_pickle)
+
+        if meta.get('format') != FORMAT_NAME:
+            raise ValueError(f"{path} is not a compact graph bundle")
+        if meta.get('version', 0) > FORMAT_VERSION:
+            raise ValueError(f"{path} has format version {meta['version']}, "
+                             f"this reader supports up to {FORMAT_VERSION}")
+        missing = [name for name in _ARRAYS if name not in arrays]
+        if missing:
+            raise ValueError(f"{path} is missing arrays: {missing}")
+        return cls(directed=meta['directed'], **arrays)
+
+
+def _label_array(nodes: Iterable[Hashable]) -> np.ndarray:
+    """
+    Node labels thành numpy array: int/str giữ kiểu native (mmap được), các
+    kiểu khác (vd. tuple) thành object array.
+    """
+    if isinstance(nodes, np.ndarray) and nodes.dtype.kind in 'iu':
+        return nodes.astype(np.int64)
+    nodes = list(nodes)
+    if all(isinstance(node, (int, np.integer)) and not isinstance(node, bool) for node in nodes):
+        return np.array(nodes, dtype=np.int64)
+    if all(isinstance(node, str) for node in nodes):
+        return np.array(nodes, dtype=str)
+    labels = np.empty(len(nodes), dtype=object)
+    for i, node in enumerate(nodes):
+        labels[i] = node
+    return labels
+
+
+def _npy_dtype(f) -> np.dtype:
+    """
+    Dtype ghi trong header của file `.npy` (không đọc dữ liệu).
+    """
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        return np.lib.format.read_array_header_1_0(f)[2]
+    return np.lib.format.read_array_header_2_0(f)[2]
+
+
+def _check_pickle(file: str, name: str, pickled: bool, allow_pickle: bool):
+    if not pickled:
+        return
+    if name != 'nodes':
+        raise ValueError(f"{file} contains a pickled (object) array; only node labels may be pickled")
+    if not allow_pickle:
+        raise ValueError(f"{file} contains pickled (object) node labels; "
+                         "pass allow_pickle=True only if the bundle is trusted")
+
+
+def _load_array(file: str, name: str, mmap_mode: Optional[str], allow_pickle: bool) -> np.ndarray:
+    with open(file, 'rb') as f:
+        pickled = _npy_dtype(f).hasobject
+    _check_pickle(file, name, pickled, allow_pickle)
+    # Object arrays (pickled) không mmap được
+    return np.load(file, mmap_mode=None if pickled else mmap_mode, allow_pickle=pickled)
@@ -0,0 +1,76 @@
+"""
+Per-iteration state shared by the iterative solver APIs
+"""
+
+import asyncio
+from typing import AsyncIterator, Dict, Iterator, List, NamedTuple, Optional
+
+
+class IterationState(NamedTuple):
+    """
+    Trạng thái gọn nhẹ sau mỗi iteration, được yield bởi `iterate()`.
+
+    Attributes:
+    -----------
+    iteration : int
+        Chỉ số iteration (bắt đầu từ 0)
+    best_solution : List
+        Lời giải tốt nhất từ trước đến nay (path hoặc tour)
+    best_distance : float
+        Độ dài của best_solution
+    iteration_best_solution : List
+        Lời giải tốt nhất trong iteration này
+    iteration_best_distance : float
+        Độ dài của iteration_best_solution
+    mean_distance : float
+        Độ dài trung bình của các lời giải hợp lệ trong iteration
+    iteration_time : float
+        Thời gian chạy iteration này (seconds)
+    elapsed_time : float
+        Tổng thời gian từ lúc bắt đầu (seconds)
+    gap : float, optional
+        Optimality gap tương đối của best_distance so với lower bound (None
+        nếu solver không tính lower bound)
+    n_failed : int, optional
+        Số lời giải không hợp lệ trong iteration (vd. ants không tới được đích)
+    phase_times : Dict[str, float], optional
+        Thời gian từng phase của iteration (seconds), vd. {'prepare',
+        'construct', 'update'} (None nếu solver không đo)
+    """
+    iteration: int
+    best_solution: List
+    best_distance: float
+    iteration_best_solution: List
+    iteration_best_distance: float
+    mean_distance: float
+    iteration_time: float
+    elapsed_time: float
+    gap: Optional[float] = None
+    n_failed: Optional[int] = None
+    phase_times: Optional[Dict[str, float]] = None
+
+
+async def async_iterate(states: Iterator[IterationState]) -> AsyncIterator[IterationState]:
+    """
+    Bọc generator `iterate()` thành async generator.
+
+    Sau mỗi iteration nhường quyền điều khiển cho event loop, nhờ đó có thể
+    chạy xen kẽ nhiều solvers (hoặc stream kết quả) mà không cần threads.
+
+    Parameters:
+    -----------
+    states : Iterator[IterationState]
+        Generator trả về bởi `iterate()`
+
+    Yields:
+    -------
+    IterationState
+    """
+    try:
+        for state in states:
+            yield state
+            await asyncio.sleep(0)
+    finally:
+        close = getattr(states, 'close', None)
+        if close is not None:
+            close()
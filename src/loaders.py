@@ -0,0 +1,325 @@
+"""
+Streaming loaders cho edge lists và coordinates (CSV/TSV/whitespace, có thể .gz)
+
+File được đọc theo từng khối `chunk_rows` dòng và parse thẳng thành NumPy
+arrays bằng `np.loadtxt`, không tạo Python object cho mỗi cạnh và không build
+networkx graph. Bộ nhớ chỉ tỉ lệ với kết quả (các arrays của `CompactGraph`)
+cộng một khối dòng, nên đọc được các file nhiều GB.
+"""
+
+import gzip
+import io
+import itertools
+import warnings
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .compact_graph import CompactGraph
+
+Column = Union[int, str]
+
+
+def _open_text(path: str) -> io.TextIOBase:
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def _default_delimiter(path: str) -> Optional[str]:
+    """
+    ',' cho .csv, tab cho .tsv/.tab, whitespace (None) cho các file khác.
+    """
+    name = path[:-3] if path.endswith('.gz') else path
+    if name.endswith('.csv'):
+        return ','
+    if name.endswith(('.tsv', '.tab')):
+        return '\t'
+    return None
+
+
+def _split(line: str, delimiter: Optional[str]) -> List[str]:
+    return [field.strip().strip('"') for field in line.rstrip('\r\n').split(delimiter)]
+
+
+def _is_number(field: str) -> bool:
+    try:
+        float(field)
+    except ValueError:
+        return False
+    return True
+
+
+def _detect_header(fields: List[str], second: Optional[List[str]],
+                   columns: Sequence[Column], numeric_columns: Sequence[int]) -> bool:
+    """
+    Dòng đầu có phải header không (header='auto').
+
+    Có header nếu một cột được chỉ định bằng tên, hoặc một cột số của dòng đầu
+    không parse được thành số. Không có cột số để kiểm tra thì: dòng đầu toàn
+    số là dữ liệu; một field không phải số mà cùng cột ở dòng thứ hai là số là
+    header. Các trường hợp còn lại (vd. node labels dạng chuỗi, không có cột
+    trọng số) không phân biệt được và phải chỉ định header=True/False.
+    """
+    if any(isinstance(c, str) for c in columns):
+        return True
+    checked = [c for c in numeric_columns if c < len(fields)]
+    if checked:
+        return not all(_is_number(fields[c]) for c in checked)
+    if all(_is_number(field) for field in fields):
+        return False
+    if second is not None and any(not _is_number(a) and _is_number(b) for a, b in zip(fields, second)):
+        return True
+    raise ValueError(f"Cannot detect whether the first line {fields} is a header; "
+                     "pass header=True or header=False")
+
+
+class _TableReader:
+    """
+    Đọc một bảng text theo khối: xác định header, resolve tên cột và parse mỗi
+    khối dòng thành arrays của các cột được chọn.
+    """
+
+    def __init__(self, f, delimiter: Optional[str], header: Union[bool, str],
+                 comments: str, columns: Sequence[Column], numeric_columns: Sequence[int]):
+        self.f = f
+        self.delimiter = delimiter
+        self.comments = comments
+
+        # Hai dòng dữ liệu đầu tiên (bỏ dòng trống/comment) quyết định header
+        self._pending: List[str] = []
+        for line in f:
+            if line.strip() and not line.lstrip().startswith(comments):
+                self._pending.append(line)
+                if len(self._pending) == 2:
+                    break
+        self.names: Optional[List[str]] = None
+        self.n_fields = 0
+        if not self._pending:
+            return
+        fields = _split(self._pending[0], delimiter)
+        if header == 'auto':
+            second = _split(self._pending[1], delimiter) if len(self._pending) > 1 else None
+            header = _detect_header(fields, second, columns, numeric_columns)
+        if header:
+            self.names = fields
+            self._pending.pop(0)
+        self.n_fields = len(fields)
+
+    def column(self, column: Column) -> int:
+        """
+        Index của cột (theo số thứ tự hoặc theo tên trong header).
+        """
+        if isinstance(column, str):
+            if self.names is None or column not in self.names:
+                raise ValueError(f"Column {column!r} not found in header {self.names}")
+            return self.names.index(column)
+        if not 0 <= column < self.n_fields:
+            raise ValueError(f"Column {column} out of range (rows have {self.n_fields} fields)")
+        return column
+
+    def chunks(self, columns: Sequence[int], dtypes: Sequence[type],
+               chunk_rows: int) -> Iterator[List[np.ndarray]]:
+        """
+        Yield list arrays (một array cho mỗi cột) cho mỗi khối tối đa chunk_rows dòng.
+        """
+        lines = itertools.chain(self._pending, self.f)
+        while True:
+            block = list(itertools.islice(lines, chunk_rows))
+            if not block:
+                return
+            with warnings.catch_warnings():
+                # Khối chỉ gồm dòng trống/comment
+                warnings.simplefilter('ignore', UserWarning)
+                table = np.loadtxt(block, dtype=str, delimiter=self.delimiter, comments=self.comments,
+                                   usecols=columns, ndmin=2, quotechar='"')
+            if len(table) == 0:
+                continue
+            yield [table[:, k].astype(dtype) if dtype is not str else table[:, k]
+                   for k, dtype in enumerate(dtypes)]
+
+
+class _LabelIndex:
+    """
+    Gán index liên tiếp cho node labels theo thứ tự xuất hiện (một dict entry
+    cho mỗi node, không phải mỗi cạnh).
+    """
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+
+    def map(self, labels: np.ndarray) -> np.ndarray:
+        unique, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+        # Gán index mới theo thứ tự xuất hiện trong khối
+        ids = np.empty(len(unique), dtype=np.int64)
+        unique_labels = unique.tolist()
+        for k in np.argsort(first, kind='stable').tolist():
+            ids[k] = self.index.setdefault(unique_labels[k], len(self.index))
+        return ids[inverse]
+
+    def labels(self) -> List[str]:
+        return list(self.index)
+
+
+def read_edge_list(
+    path: str,
+    source: Column = 0,
+    target: Column = 1,
+    weight: Optional[Column] = 'auto',
+    directed: bool = False,
+    delimiter: Optional[str] = 'auto',
+    header: Union[bool, str] = 'auto',
+    comments: str = '#',
+    nodetype: type = str,
+    index_nodes: bool = False,
+    chunk_rows: int = 1 << 20
+) -> CompactGraph:
+    """
+    Đọc edge list (CSV/TSV/whitespace, có thể nén .gz) thành `CompactGraph`.
+
+    Parameters:
+    -----------
+    path : str
+        Đường dẫn file
+    source, target : int or str
+        Cột của hai đầu cạnh (số thứ tự hoặc tên trong header)
+    weight : int, str or None
+        Cột trọng số; 'auto' = cột thứ ba nếu có, None = mọi cạnh 1.0
+    directed : bool
+        Đồ thị có hướng
+    delimiter : str, optional
+        'auto' theo đuôi file (',' cho .csv, tab cho .tsv), None = whitespace
+    header : bool or 'auto'
+        Dòng đầu là header ('auto': có nếu có cột được chỉ định bằng tên hoặc
+        cột số của dòng đầu không parse được thành số; raise ValueError nếu
+        không xác định được, vd. node labels dạng chuỗi và không có cột trọng số)
+    comments : str
+        Dòng bắt đầu bằng ký tự này bị bỏ qua
+    nodetype : type
+        Kiểu của node labels (vd. int), áp dụng lên các labels duy nhất
+    index_nodes : bool
+        Node ids là số nguyên 0..n-1 và được dùng trực tiếp làm index (không
+        cần bảng labels; nhanh và nhẹ nhất cho file rất lớn)
+    chunk_rows : int
+        Số dòng parse mỗi lần
+
+    Returns:
+    --------
+    CompactGraph
+    """
+    if delimiter == 'auto':
+        delimiter = _default_delimiter(path)
+
+    with _open_text(path) as f:
+        numeric = [c for c in (source, target) if index_nodes and isinstance(c, int)]
+        if weight == 'auto':
+            numeric.append(2)
+        elif isinstance(weight, int):
+            numeric.append(weight)
+        named = [source, target] + ([] if weight == 'auto' else [weight])
+        reader = _TableReader(f, delimiter, header, comments, named, numeric)
+        if reader.n_fields == 0:
+            return CompactGraph.from_arrays(np.empty(0, np.int64), np.empty(0, np.int64),
+                                            directed=directed, n_nodes=0)
+        if weight == 'auto':
+            weight = 2 if reader.n_fields > 2 else None
+
+        columns = [reader.column(source), reader.column(target)]
+        id_type = np.int64 if index_nodes else str
+        dtypes = [id_type, id_type]
+        if weight is not None:
+            columns.append(reader.column(weight))
+            dtypes.append(float)
+
+        labels = None if index_nodes else _LabelIndex()
+        sources, targets, weights = [], [], []
+        for chunk in reader.chunks(columns, dtypes, chunk_rows):
+            if labels is None:
+                sources.append(chunk[0])
+                targets.append(chunk[1])
+            else:
+                # Map cả hai cột cùng lúc để labels được đánh số theo thứ tự dòng
+                ids = labels.map(np.column_stack((chunk[0], chunk[1])).ravel()).reshape(-1, 2)
+                sources.append(ids[:, 0])
+                targets.append(ids[:, 1])
+            if weight is not None:
+                weights.append(chunk[2])
+
+    sources = np.concatenate(sources) if sources else np.empty(0, np.int64)
+    targets = np.concatenate(targets) if targets else np.empty(0, np.int64)
+    weights = np.concatenate(weights) if weights else None
+    if labels is None:
+        return CompactGraph.from_arrays(sources, targets, weights, directed)
+    nodes = labels.labels()
+    if nodetype is not str:
+        nodes = [nodetype(node) for node in nodes]
+    return CompactGraph.from_arrays(sources, targets, weights, directed, nodes=nodes)
+
+
+def read_coordinates(
+    path: str,
+    node: Column = 0,
+    lat: Column = 1,
+    lon: Column = 2,
+    delimiter: Optional[str] = 'auto',
+    header: Union[bool, str] = 'auto',
+    comments: str = '#',
+    nodetype: type = str,
+    chunk_rows: int = 1 << 20
+) -> Tuple[List[Hashable], np.ndarray, np.ndarray]:
+    """
+    Đọc file coordinates `node, lat, lon` theo khối.
+
+    Parameters:
+    -----------
+    path : str
+        Đường dẫn file (CSV/TSV/whitespace, có thể .gz)
+    node, lat, lon : int or str
+        Cột của node label, latitude, longitude (số thứ tự hoặc tên trong header)
+    delimiter, header, comments, nodetype, chunk_rows
+        Xem `read_edge_list()`
+
+    Returns:
+    --------
+    Tuple[List, np.ndarray, np.ndarray]
+        (labels, lats, lons) theo thứ tự trong file
+    """
+    if delimiter == 'auto':
+        delimiter = _default_delimiter(path)
+
+    labels: List[Hashable] = []
+    lats, lons = [], []
+    with _open_text(path) as f:
+        reader = _TableReader(f, delimiter, header, comments, [node, lat, lon],
+                              [c for c in (lat, lon) if isinstance(c, int)])
+        if reader.n_fields:
+            columns = [reader.column(node), reader.column(lat), reader.column(lon)]
+            for chunk in reader.chunks(columns, [str, float, float], chunk_rows):
+                labels.extend(chunk[0].tolist() if nodetype is str else map(nodetype, chunk[0]))
+                lats.append(chunk[1])
+                lons.append(chunk[2])
+
+    return (labels,
+            np.concatenate(lats) if lats else np.empty(0),
+            np.concatenate(lons) if lons else np.empty(0))
+
+
+def attach_coordinates(graph: CompactGraph, path: str, **kwargs) -> CompactGraph:
+    """
+    Đọc coordinates (xem `read_coordinates()`) và gán vào `graph.lats/lons`
+    theo thứ tự nodes của graph (NaN cho node không có trong file).
+
+    Returns:
+    --------
+    CompactGraph
+        Chính `graph` (đã được gán coordinates)
+    """
+    labels, lats, lons = read_coordinates(path, **kwargs)
+    position = {label: k for k, label in enumerate(labels)}
+    order = np.array([position.get(node, -1) for node in graph.node_labels()], dtype=np.int64)
+    found = order >= 0
+    graph.lats = np.full(graph.n_nodes, np.nan)
+    graph.lons = np.full(graph.n_nodes, np.nan)
+    graph.lats[found] = lats[order[found]]
+    graph.lons[found] = lons[order[found]]
+    return graph
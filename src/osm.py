@@ -0,0 +1,166 @@
+"""
+Streaming importer cho OpenStreetMap XML (.osm, .osm.gz, .osm.bz2) thành CompactGraph
+
+File được đọc bằng `xml.etree.ElementTree.iterparse`; mỗi element được xử lý
+xong là bị xóa khỏi cây, nên bộ nhớ không phụ thuộc kích thước file mà chỉ vào
+kết quả: coordinates của các nodes (3 số mỗi node, trong `array.array`) và các
+segments của đường ô tô đi được. Độ dài segments tính bằng Haversine (km).
+"""
+
+import array
+import bz2
+import gzip
+import xml.etree.ElementTree as ET
+from typing import Dict, FrozenSet, Iterable, Optional
+
+import numpy as np
+
+from .compact_graph import CompactGraph
+from .tsp_utils import haversine_distances
+
+# Giá trị tag `highway` của đường ô tô đi được
+DRIVABLE_HIGHWAYS: FrozenSet[str] = frozenset({
+    'motorway', 'motorway_link', 'trunk', 'trunk_link', 'primary', 'primary_link',
+    'secondary', 'secondary_link', 'tertiary', 'tertiary_link', 'unclassified',
+    'residential', 'living_street', 'service', 'road',
+})
+
+# Đường service không dành cho lưu thông (bãi đỗ xe, lối vào nhà riêng, ...)
+_EXCLUDED_SERVICE = frozenset({'parking', 'parking_aisle', 'driveway', 'private', 'emergency_access'})
+_NO_ACCESS = frozenset({'no', 'private'})
+
+
+def _open_binary(path: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if path.endswith('.bz2'):
+        return bz2.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def is_drivable(tags: Dict[str, str], highways: Iterable[str] = DRIVABLE_HIGHWAYS) -> bool:
+    """
+    Way có phải đường ô tô đi được không (theo tags highway/access/service/area).
+    """
+    if tags.get('highway') not in highways:
+        return False
+    if tags.get('area') == 'yes':
+        return False
+    if tags.get('access') in _NO_ACCESS or tags.get('motor_vehicle') in _NO_ACCESS:
+        return False
+    if tags.get('highway') == 'service' and tags.get('service') in _EXCLUDED_SERVICE:
+        return False
+    return True
+
+
+def oneway_direction(tags: Dict[str, str]) -> int:
+    """
+    Chiều lưu thông của way: 1 = theo thứ tự nodes, -1 = ngược lại, 0 = hai chiều.
+    """
+    oneway = tags.get('oneway')
+    if oneway in ('yes', 'true', '1'):
+        return 1
+    if oneway == '-1':
+        return -1
+    if oneway in ('no', 'false', '0'):
+        return 0
+    # Motorways và vòng xuyến mặc định là một chiều
+    if tags.get('highway') in ('motorway', 'motorway_link') or tags.get('junction') in ('roundabout', 'circular'):
+        return 1
+    return 0
+
+
+def read_osm(
+    path: str,
+    directed: bool = True,
+    highways: Optional[Iterable[str]] = None
+) -> CompactGraph:
+    """
+    Đọc file OSM XML và trả về road network dạng `CompactGraph`.
+
+    Mỗi cặp nodes liên tiếp của một way đi được là một cạnh với trọng số là
+    độ dài Haversine (km). Chỉ các nodes nằm trên những ways này được giữ lại
+    (node labels = OSM node ids, kèm lats/lons).
+
+    Parameters:
+    -----------
+    path : str
+        File .osm (có thể nén .gz/.bz2)
+    directed : bool
+        True: tôn trọng đường một chiều (`oneway`), đường hai chiều thành hai
+        arcs; False: đồ thị vô hướng, bỏ qua `oneway`
+    highways : Iterable[str], optional
+        Các giá trị tag `highway` được giữ (mặc định DRIVABLE_HIGHWAYS)
+
+    Returns:
+    --------
+    CompactGraph
+    """
+    highways = DRIVABLE_HIGHWAYS if highways is None else frozenset(highways)
+
+    node_ids = array.array('q')
+    node_lats = array.array('d')
+    node_lons = array.array('d')
+    sources = array.array('q')
+    targets = array.array('q')
+
+    with _open_binary(path) as f:
+        context = ET.iterparse(f, events=('start', 'end'))
+        _, root = next(context)
+        for event, elem in context:
+            if event != 'end':
+                continue
+            tag = elem.tag
+            if tag == 'node':
+                node_ids.append(int(elem.get('id')))
+                node_lats.append(float(elem.get('lat')))
+                node_lons.append(float(elem.get('lon')))
+            elif tag == 'way':
+                tags = {child.get('k'): child.get('v') for child in elem if child.tag == 'tag'}
+                if is_drivable(tags, highways):
+                    refs = [int(child.get('ref')) for child in elem if child.tag == 'nd']
+                    direction = oneway_direction(tags) if directed else 1
+                    if direction == -1:
+                        refs.reverse()
+                    pairs = [(u, v) for u, v in zip(refs, refs[1:]) if u != v]
+                    for u, v in pairs:
+                        sources.append(u)
+                        targets.append(v)
+                    if directed and direction == 0:
+                        for u, v in pairs:
+                            sources.append(v)
+                            targets.append(u)
+            elif tag != 'relation':
+                # nd/tag của node/way: giữ lại tới khi element cha kết thúc
+                continue
+            # Xóa element đã xử lý (và tham chiếu từ root) để bộ nhớ không tăng
+            elem.clear()
+            root.clear()
+
+    # Coordinates theo OSM id (sắp xếp để tra cứu bằng binary search)
+    ids = np.frombuffer(node_ids, dtype=np.int64)
+    order = np.argsort(ids, kind='stable')
+    ids = ids[order]
+    lats = np.frombuffer(node_lats, dtype=np.float64)[order]
+    lons = np.frombuffer(node_lons, dtype=np.float64)[order]
+
+    sources = np.frombuffer(sources, dtype=np.int64)
+    targets = np.frombuffer(targets, dtype=np.int64)
+    source_pos = np.minimum(np.searchsorted(ids, sources), max(len(ids) - 1, 0))
+    target_pos = np.minimum(np.searchsorted(ids, targets), max(len(ids) - 1, 0))
+    if len(ids):
+        # Bỏ segments có node nằm ngoài extract (không có coordinates)
+        known = (ids[source_pos] == sources) & (ids[target_pos] == targets)
+    else:
+        known = np.zeros(len(sources), dtype=bool)
+    source_pos, target_pos = source_pos[known], target_pos[known]
+
+    # Chỉ giữ nodes nằm trên các segments, đánh index lại
+    used, inverse = np.unique(np.concatenate((source_pos, target_pos)), return_inverse=True)
+    m = len(source_pos)
+    lengths = haversine_distances(lats[source_pos], lons[source_pos], lats[target_pos], lons[target_pos])
+
+    return CompactGraph.from_arrays(
+        inverse[:m], inverse[m:], lengths, directed,
+        nodes=ids[used], lats=lats[used], lons=lons[used]
+    )
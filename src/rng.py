@@ -0,0 +1,131 @@
+"""
+Random number generation cho các solvers
+
+Mỗi solver sở hữu một `numpy.random.Generator` riêng (tạo từ tham số `seed`)
+thay vì dùng global `np.random`, nên kết quả tái lập được và các solvers chạy
+song song không chia sẻ state. Các số uniform được sinh sẵn theo khối
+(`UniformStream`) để mỗi bước roulette wheel chỉ tốn một lần đọc mảng thay vì
+một lần gọi vào numpy.
+"""
+
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+SeedLike = Optional[Union[int, np.random.SeedSequence, np.random.Generator]]
+
+
+class UniformStream:
+    """
+    Dòng số uniform [0, 1) được sinh sẵn theo khối từ một Generator.
+
+    Parameters:
+    -----------
+    generator : np.random.Generator
+        Nguồn ngẫu nhiên
+    block_size : int
+        Số giá trị sinh mỗi lần nạp lại
+    """
+
+    def __init__(self, generator: np.random.Generator, block_size: int = 4096):
+        self.generator = generator
+        self.block_size = block_size
+        self._block = generator.random(block_size)
+        self._position = 0
+
+    def random(self) -> float:
+        """
+        Một số uniform trong [0, 1).
+        """
+        if self._position == self.block_size:
+            self._block = self.generator.random(self.block_size)
+            self._position = 0
+        value = self._block[self._position]
+        self._position += 1
+        return float(value)
+
+    def integers(self, high: int) -> int:
+        """
+        Một số nguyên đều trong [0, high).
+        """
+        return min(int(self.random() * high), high - 1)
+
+
+def make_generator(seed: SeedLike = None) -> np.random.Generator:
+    """
+    Generator từ seed (int, SeedSequence, Generator có sẵn hoặc None = entropy).
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def spawn_seeds(seed: SeedLike, n: int) -> List[np.random.SeedSequence]:
+    """
+    n seed sequences độc lập cho các worker song song.
+
+    Mỗi worker tạo Generator riêng từ seed của nó (`make_generator`), nên kết
+    quả tái lập được với cùng seed gốc bất kể thứ tự chạy của workers.
+    """
+    if isinstance(seed, np.random.Generator):
+        seed = np.random.SeedSequence(int(seed.integers(2 ** 63)))
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(n)
+
+
+def roulette(cumulative: np.ndarray, u: float) -> int:
+    """
+    Index được chọn bởi roulette wheel từ cumulative weights và một uniform u.
+
+    Trả về -1 nếu tổng weights <= 0 (caller tự xử lý fallback).
+    """
+    total = cumulative[-1]
+    if total <= 0:
+        return -1
+    pick = int(np.searchsorted(cumulative, u * total, side='right'))
+    return min(pick, len(cumulative) - 1)
+
+
+def alias_table(weights: np.ndarray) -> Tuple[List[float], List[int]]:
+    """
+    Walker alias table (thuật toán Vose) cho phân phối rời rạc tỉ lệ với weights.
+
+    Xây dựng O(k); mỗi lần lấy mẫu sau đó là O(1) (`alias_draw`). Weights có
+    tổng <= 0 cho phân phối đều. Trả về Python lists vì việc lấy mẫu đọc từng
+    phần tử vô hướng (nhanh hơn indexing numpy array).
+
+    Returns:
+    --------
+    Tuple[List[float], List[int]]
+        (prob, alias): cột c được giữ với xác suất prob[c], ngược lại chọn alias[c]
+    """
+    k = len(weights)
+    prob = [1.0] * k
+    alias = list(range(k))
+    total = float(np.sum(weights))
+    if total <= 0:
+        return prob, alias
+
+    scaled = (np.asarray(weights, dtype=float) * (k / total)).tolist()
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s = small.pop()
+        l = large[-1]
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        if scaled[l] < 1.0:
+            small.append(large.pop())
+    # Các cột còn lại (kể cả sai số làm tròn) có prob = 1
+    return prob, alias
+
+
+def alias_draw(prob: List[float], alias: List[int], u: float) -> int:
+    """
+    Một mẫu từ alias table với một uniform u trong [0, 1).
+    """
+    scaled = u * len(prob)
+    column = min(int(scaled), len(prob) - 1)
+    return column if scaled - column < prob[column] else alias[column]
@@ -0,0 +1,447 @@
+"""
+Asyncio solver service: request queue, process pool và per-request deadlines
+
+Kiến trúc:
+- `SolverService`: nhận solve requests (dict JSON-serializable), đưa vào queue,
+  dispatch sang process pool, áp dụng deadline/cancellation và gộp các requests
+  giống hệt nhau đang chạy đồng thời thành một job duy nhất.
+- `serve_http()`: front end HTTP/JSON tối giản trên localhost. Đây chỉ là một lớp
+  transport mỏng quanh `SolverService.submit()`, có thể thay bằng stub khác.
+
+Request format:
+    {"problem": "shortest_path", "edges": [[u, v, weight], ...],
+     "start": u, "end": v, "params": {...}, "timeout": 10}
+    {"problem": "tsp", "cities": {name: {"lat": ..., "lon": ...}},
+     "start_city": name, "params": {...}, "timeout": 10}
+
+Chạy service:
+    python -m src.service --port 8765
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import io
+import json
+import math
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import networkx as nx
+
+from .aco import AntColony
+from .tsp_aco import TSP_AntColony
+
+
+PROBLEMS = ('shortest_path', 'tsp')
+
+
+def _to_builtin(value: Any) -> Any:
+    """
+    Chuyển numpy scalars (vd. np.int64 trong path) thành Python types để dump JSON.
+    """
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(v) for v in value]
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def _json_safe(value: Any) -> Any:
+    """
+    Thay float không hữu hạn (inf/nan) bằng None: JSON chuẩn không có
+    Infinity/NaN và `JSON.parse` của browsers từ chối chúng.
+    """
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def request_key(payload: Dict) -> str:
+    """
+    Khóa định danh một request (bỏ qua timeout), dùng để gộp requests giống nhau.
+    """
+    body = {k: v for k, v in payload.items() if k not in ('timeout', 'deadline')}
+    encoded = json.dumps(body, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def solve_request(payload: Dict) -> Dict:
+    """
+    Giải một request trong worker process.
+
+    Solver được chạy qua `iterate()` nên có thể dừng sớm khi hết deadline và
+    trả về best-so-far thay vì bị hủy hoàn toàn.
+
+    Parameters:
+    -----------
+    payload : Dict
+        Request (xem module docstring). Key `deadline` (time.time() tuyệt đối)
+        được service điền vào trước khi dispatch.
+
+    Returns:
+    --------
+    Dict
+        {'solution', 'distance', 'history', 'iterations', 'truncated', 'time'};
+        'distance' (và các phần tử của 'history') là None khi chưa tìm được
+        lời giải (không có đường đi tới đích hoặc không chạy iteration nào)
+
+    Raises:
+    -------
+    ValueError
+        Problem không hợp lệ hoặc `edges`/`cities` rỗng
+    """
+    problem = payload.get('problem', 'shortest_path')
+    params = payload.get('params', {})
+    deadline = payload.get('deadline')
+    start_time = time.time()
+
+    if problem == 'shortest_path' and not payload.get('edges'):
+        raise ValueError("'edges' must be a non-empty list of [u, v, weight]")
+    if problem == 'tsp' and not payload.get('cities'):
+        raise ValueError("'cities' must be a non-empty mapping")
+
+    # Solvers in tiến trình ra stdout; service không cần output đó
+    with contextlib.redirect_stdout(io.StringIO()):
+        if problem == 'shortest_path':
+            graph = nx.Graph()
+            for u, v, weight in payload['edges']:
+                graph.add_edge(u, v, weight=weight)
+            colony = AntColony(graph, **params)
+            states = colony.iterate(payload['start'], payload['end'])
+        elif problem == 'tsp':
+            colony = TSP_AntColony(payload['cities'], **params)
+            states = colony.iterate(payload.get('start_city'))
+        else:
+            raise ValueError(f"Unknown problem type: {problem!r} (expected one of {PROBLEMS})")
+
+        history = []
+        state = None
+        truncated = False
+        for state in states:
+            history.append(state.best_distance)
+            if deadline is not None and time.time() >= deadline:
+                truncated = state.iteration + 1 < colony.n_iterations
+                break
+
+    return _json_safe({
+        'solution': _to_builtin(state.best_solution) if state else None,
+        'distance': state.best_distance if state else None,
+        'history': history,
+        'iterations': len(history),
+        'truncated': truncated,
+        'time': time.time() - start_time
+    })
+
+
+class SolverService:
+    """
+    Async front end cho các ACO solvers.
+
+    Parameters:
+    -----------
+    max_workers : int, optional
+        Số worker processes (và số jobs chạy đồng thời)
+    queue_size : int
+        Số requests tối đa chờ trong queue (0 = không giới hạn)
+    default_timeout : float
+        Deadline mặc định (seconds) nếu request không chỉ định `timeout`
+    grace : float
+        Thời gian chờ thêm sau deadline để worker trả về best-so-far
+    executor : Executor, optional
+        Executor thay thế (vd. ThreadPoolExecutor cho tests/stubs)
+    solve_fn : Callable, optional
+        Hàm giải thay thế cho `solve_request` (phải picklable nếu dùng processes)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        queue_size: int = 100,
+        default_timeout: float = 30.0,
+        grace: float = 1.0,
+        executor: Optional[Executor] = None,
+        solve_fn: Callable[[Dict], Dict] = solve_request
+    ):
+        self.max_workers = max_workers or 2
+        self.queue_size = queue_size
+        self.default_timeout = default_timeout
+        self.grace = grace
+        self.solve_fn = solve_fn
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers = []
+        # key -> (shared future, số waiters)
+        self._inflight: Dict[str, Tuple[asyncio.Future, int]] = {}
+
+    async def start(self):
+        """
+        Khởi tạo process pool và các dispatcher tasks.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [
+            asyncio.ensure_future(self._dispatch_loop())
+            for _ in range(self.max_workers)
+        ]
+
+    async def stop(self):
+        """
+        Dừng dispatchers, hủy các requests còn chờ và đóng pool.
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        for future, _ in self._inflight.values():
+            if not future.done():
+                future.cancel()
+        self._inflight.clear()
+
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self) -> 'SolverService':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def submit(self, payload: Dict, timeout: Optional[float] = None) -> Dict:
+        """
+        Gửi một solve request và chờ kết quả.
+
+        Requests giống hệt nhau (cùng `request_key`) đang chạy đồng thời dùng
+        chung một job. Nếu caller bị cancel và không còn waiter nào khác, job
+        bị hủy: nếu chưa dispatch thì bị bỏ qua; nếu đang chạy thì chỉ kết quả
+        bị bỏ, còn worker process không thể dừng giữa chừng và vẫn tính tiếp
+        (chiếm một worker) cho tới khi xong hoặc hết deadline của request.
+
+        Raises:
+        -------
+        asyncio.QueueFull
+            Queue đã đầy
+        asyncio.TimeoutError
+            Quá deadline của request
+        """
+        if self._queue is None:
+            raise RuntimeError("SolverService is not started")
+
+        if timeout is None:
+            timeout = payload.get('timeout', self.default_timeout)
+
+        key = request_key(payload)
+        if key in self._inflight:
+            future, waiters = self._inflight[key]
+            self._inflight[key] = (future, waiters + 1)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._queue.put_nowait((key, payload, time.time() + timeout, future))
+            self._inflight[key] = (future, 1)
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout + self.grace)
+        finally:
+            self._release(key, future)
+
+    def _release(self, key: str, future: asyncio.Future):
+        """
+        Giảm số waiters của job; hủy job khi không còn ai chờ.
+        """
+        entry = self._inflight.get(key)
+        if entry is None or entry[0] is not future:
+            return
+        waiters = entry[1] - 1
+        if waiters > 0:
+            self._inflight[key] = (future, waiters)
+            return
+        del self._inflight[key]
+        if not future.done():
+            future.cancel()
+
+    async def _dispatch_loop(self):
+        """
+        Lấy jobs từ queue và chạy chúng trong executor.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            key, payload, deadline, future = await self._queue.get()
+            try:
+                if future.done():
+                    # Đã bị hủy khi còn trong queue
+                    continue
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    future.set_exception(asyncio.TimeoutError())
+                    continue
+
+                job = dict(payload, deadline=deadline)
+                task = loop.run_in_executor(self._executor, self.solve_fn, job)
+                try:
+                    result = await asyncio.wait_for(task, remaining + self.grace)
+                except Exception as exc:
+                    if not future.done():
+                        future.set_exception(exc)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+            finally:
+                self._queue.task_done()
+
+    def stats(self) -> Dict:
+        """
+        Trạng thái hiện tại của service.
+        """
+        return {
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'inflight': len(self._inflight),
+            'workers': self.max_workers
+        }
+
+
+async def _read_http_request(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+    """
+    Đọc một HTTP/1.1 request tối giản: (method, path, body).
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        raise ConnectionError("Connection closed")
+    method, path, _ = request_line.decode('latin-1').split(' ', 2)
+
+    content_length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            content_length = int(value.strip())
+
+    body = await reader.readexactly(content_length) if content_length else b''
+    return method.upper(), path, body
+
+
+def _http_response(status: int, reason: str, body: Optional[Dict] = None) -> bytes:
+    """
+    Tạo HTTP response JSON (có CORS headers để web demo gọi được).
+    """
+    payload = json.dumps(_json_safe(body), allow_nan=False).encode('utf-8') if body is not None else b''
+    headers = [
+        f"HTTP/1.1 {status} {reason}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(payload)}",
+        "Access-Control-Allow-Origin: *",
+        "Access-Control-Allow-Methods: GET, POST, OPTIONS",
+        "Access-Control-Allow-Headers: Content-Type",
+        "Connection: close",
+    ]
+    return ("\r\n".join(headers) + "\r\n\r\n").encode('latin-1') + payload
+
+
+async def handle_http(service: SolverService, method: str, path: str, body: bytes) -> bytes:
+    """
+    Route một HTTP request tới service.
+
+    - GET /health  -> service.stats()
+    - POST /solve  -> service.submit(json body)
+    """
+    if method == 'OPTIONS':
+        return _http_response(204, 'No Content')
+    if method == 'GET' and path == '/health':
+        return _http_response(200, 'OK', service.stats())
+    if method != 'POST' or path != '/solve':
+        return _http_response(404, 'Not Found', {'error': f"{method} {path} not found"})
+
+    try:
+        payload = json.loads(body or b'{}')
+        if not isinstance(payload, dict):
+            raise ValueError("Request body must be a JSON object")
+        if payload.get('problem', 'shortest_path') not in PROBLEMS:
+            raise ValueError(f"Unknown problem type: {payload.get('problem')!r}")
+    except ValueError as exc:
+        return _http_response(400, 'Bad Request', {'error': str(exc)})
+
+    try:
+        result = await service.submit(payload)
+    except asyncio.QueueFull:
+        return _http_response(503, 'Service Unavailable', {'error': 'queue full'})
+    except asyncio.TimeoutError:
+        return _http_response(504, 'Gateway Timeout', {'error': 'deadline exceeded'})
+    except (KeyError, TypeError, ValueError) as exc:
+        return _http_response(400, 'Bad Request', {'error': str(exc)})
+    return _http_response(200, 'OK', result)
+
+
+async def serve_http(
+    service: SolverService,
+    host: str = '127.0.0.1',
+    port: int = 8765
+) -> asyncio.AbstractServer:
+    """
+    Khởi động HTTP/JSON front end trên localhost.
+
+    Returns:
+    --------
+    asyncio.AbstractServer
+        Server đang chạy (dùng `server.close()` để dừng)
+    """
+    async def on_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, path, body = await _read_http_request(reader)
+            response = await handle_http(service, method, path, body)
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            response = _http_response(400, 'Bad Request', {'error': 'malformed request'})
+        except Exception as exc:
+            # Lỗi của solver (hoặc bug): vẫn trả lời để client không bị treo
+            response = _http_response(500, 'Internal Server Error',
+                                      {'error': f"{type(exc).__name__}: {exc}"})
+        try:
+            writer.write(response)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(on_connection, host, port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ACO solver service (HTTP/JSON)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--queue-size', type=int, default=100)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    args = parser.parse_args()
+
+    async def run_forever():
+        async with SolverService(
+            max_workers=args.workers,
+            queue_size=args.queue_size,
+            default_timeout=args.timeout
+        ) as service:
+            server = await serve_http(service, args.host, args.port)
+            print(f"ACO solver service listening on http://{args.host}:{args.port}")
+            async with server:
+                await server.serve_forever()
+
+    try:
+        asyncio.run(run_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
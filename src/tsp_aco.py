@@ -2,9 +2,21 @@
 Ant Colony Optimization for Traveling Salesman Problem (TSP)
 """
 
+import time
 import numpy as np
-from typing import Dict, List, Tuple, Set
-from .tsp_utils import calculate_distance_matrix, calculate_tour_distance, two_opt_improve
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+from .iteration import IterationState, async_iterate
+from .rng import SeedLike, UniformStream, make_generator, roulette
+from .tsp_bounds import lower_bound, optimality_gap
+from .tsp_utils import (
+    distance_matrix_array, greedy_edge_tour, haversine_distances, nearest_neighbor_matrix,
+    held_karp, or_opt_matrix, space_filling_curve_tour, tour_lengths, two_opt_candidates,
+    two_opt_matrix
+)
+from .tsp_storage import (
+    LazyDistanceMatrix, PackedSymmetricMatrix, candidate_lists, expand_matrix, matrix_nbytes,
+    packed_distance_matrix, take_submatrix
+)
 
 
 class TSP_AntColony:
@@ -16,10 +28,16 @@ class TSP_AntColony:
     - Quay lại start city (cycle/tour)
     - Complete graph (mọi city nối mọi city)
 
+    Hỗ trợ cả TSP đối xứng (khoảng cách Haversine từ coordinates) và TSP bất
+    đối xứng (ATSP, ma trận chi phí tùy ý qua `distance_matrix`, vd. thời gian
+    di chuyển khác nhau theo chiều).
+
     Parameters:
     -----------
-    cities : Dict
-        Cities data {city_name: {'lat': ..., 'lon': ...}}
+    cities : Dict or List[str]
+        Cities data {city_name: {'lat': ..., 'lon': ...}}. Khi có
+        `distance_matrix`, có thể chỉ là danh sách tên (theo thứ tự hàng của
+        matrix) hoặc None (tên = 0..n-1)
     n_ants : int
         Số kiến mỗi vòng lặp
     n_iterations : int
@@ -37,14 +55,66 @@ class TSP_AntColony:
     elitist_ratio : float
         Tỷ lệ ants được coi là elite [0,1]
     local_search : bool
-        Sử dụng 2-opt local search để cải thiện tours
+        Sử dụng local search để cải thiện tours (2-opt cho TSP đối xứng,
+        Or-opt cho ATSP)
     max_min : bool
         Sử dụng Max-Min Ant System (giới hạn pheromone)
+    distance_matrix : array-like, optional
+        Ma trận chi phí n×n; matrix[i][j] là chi phí đi từ city i tới city j
+    symmetric : bool, optional
+        Ép chế độ đối xứng/bất đối xứng. Mặc định: tự phát hiện từ
+        distance_matrix (coordinates luôn đối xứng)
+    storage : str
+        'full' (ma trận n×n), 'packed' (chỉ nửa tam giác trên, cho TSP đối
+        xứng; giảm một nửa bộ nhớ của distance/pheromone/heuristic) hoặc
+        'lazy' (cho instances rất lớn từ coordinates: khoảng cách tính khi cần
+        với row cache, pheromone/heuristic chỉ lưu trên candidate lists n×k)
+    dtype : numpy dtype
+        Kiểu dữ liệu của các ma trận (np.float32 giảm thêm một nửa bộ nhớ)
+    n_candidates : int
+        Số láng giềng gần nhất mỗi city khi storage='lazy'. Ants chọn trong
+        candidate list, chỉ khi mọi candidate đã thăm mới xét city gần nhất
+        còn lại; local search là 2-opt theo candidate lists
+    cache_bytes : int
+        Memory cap của distance row cache khi storage='lazy'
+    population_size : int, optional
+        Bật Population-based ACO (P-ACO): pheromone không được lưu thành ma
+        trận mà được định nghĩa ngầm bởi FIFO archive gồm `population_size`
+        iteration-best tours gần nhất, τ(i,j) = τ0 + Δ·(số tours trong archive
+        chứa cạnh (i,j)). Mỗi update là O(k·n) (thêm tour mới, bỏ tour cũ nhất),
+        không có bước bay hơi; evaporation_rate/Q/elitist/max_min không dùng
+    beam_width : int, optional
+        Bật Beam-ACO: mỗi iteration thay n_ants ants độc lập bằng một beam
+        gồm `beam_width` partial tours được mở rộng song song; mỗi partial tour
+        sinh `beam_expansions` children theo xác suất pheromone/heuristic và
+        beam được cắt về `beam_width` theo lower bound (độ dài hiện tại +
+        tổng khoảng cách tới láng giềng gần nhất của các cities còn lại)
+    beam_expansions : int
+        Số children (không lặp) sinh từ mỗi partial tour mỗi bước
+    initial_tour : str, optional
+        Constructive heuristic dùng để khởi tạo pheromone: 'nearest_neighbor',
+        'greedy' (greedy edge, TSP đối xứng) hoặc 'space_filling_curve'
+        (Hilbert curve, cần coordinates). τ0 = Q / L với L là độ dài tour đó
+        (bằng τ_max của MMAS) thay vì 1.0 cố định. None = pheromone 1.0
+    seed_initial_tour : bool
+        Deposit thêm pheromone dọc theo initial tour và dùng nó làm best tour
+        ban đầu
+    exact_threshold : int
+        Với n_cities <= exact_threshold, `iterate()`/`run()` giải chính xác
+        bằng Held-Karp (một iteration duy nhất) thay vì chạy ACO. 0 = tắt
+    gap_tolerance : float, optional
+        Tính lower bound (xem `lower_bound()`) trước khi chạy, báo optimality
+        gap trong mỗi `IterationState` và dừng sớm khi
+        (best_distance - bound) / bound <= gap_tolerance (vd. 0.02 = 2%)
+    bound_iterations : int
+        Số lần lặp subgradient khi tính Held-Karp lower bound
+    seed : int, SeedSequence hoặc Generator, optional
+        Seed cho random generator riêng của solver; cùng seed cho cùng kết quả
     """
 
     def __init__(
         self,
-        cities: Dict,
+        cities: Optional[Union[Dict, List[str]]],
         n_ants: int = 50,
         n_iterations: int = 200,
         alpha: float = 1.0,
@@ -54,10 +124,51 @@ class TSP_AntColony:
         elitist: bool = True,
         elitist_ratio: float = 0.2,
         local_search: bool = True,
-        max_min: bool = True
+        max_min: bool = True,
+        distance_matrix=None,
+        symmetric: Optional[bool] = None,
+        storage: str = 'full',
+        dtype=np.float64,
+        n_candidates: int = 20,
+        cache_bytes: int = 256 * 1024 * 1024,
+        population_size: Optional[int] = None,
+        beam_width: Optional[int] = None,
+        beam_expansions: int = 3,
+        initial_tour: Optional[str] = None,
+        seed_initial_tour: bool = False,
+        exact_threshold: int = 15,
+        gap_tolerance: Optional[float] = None,
+        bound_iterations: int = 100,
+        seed: SeedLike = None
     ):
+        if initial_tour not in (None, 'nearest_neighbor', 'greedy', 'space_filling_curve'):
+            raise ValueError(f"Unknown initial_tour {initial_tour!r}")
+        if beam_width is not None and storage == 'lazy':
+            raise ValueError("beam_width is not supported with storage='lazy'")
+        if population_size is not None and population_size < 1:
+            raise ValueError(f"population_size must be >= 1, got {population_size}")
+        if storage not in ('full', 'packed', 'lazy'):
+            raise ValueError(f"storage must be 'full', 'packed' or 'lazy', got {storage!r}")
+        if storage == 'lazy' and distance_matrix is not None:
+            raise ValueError("storage='lazy' computes distances from coordinates; "
+                             "distance_matrix is not supported")
+
+        if distance_matrix is not None:
+            distance_matrix = np.array(distance_matrix, dtype=float)
+            n = len(distance_matrix)
+            if distance_matrix.shape != (n, n):
+                raise ValueError(f"distance_matrix must be square, got shape {distance_matrix.shape}")
+            if cities is None:
+                cities = list(range(n))
+            if len(cities) != n:
+                raise ValueError(f"Got {len(cities)} cities for a {n}x{n} distance_matrix")
+
+        if not isinstance(cities, dict):
+            cities = {city: {} for city in cities}
+
         self.cities = cities
         self.city_list = list(cities.keys())
+        self.city_index = {city: i for i, city in enumerate(self.city_list)}
         self.n_cities = len(self.city_list)
         self.n_ants = n_ants
         self.n_iterations = n_iterations
@@ -69,94 +180,319 @@ class TSP_AntColony:
         self.elitist_ratio = elitist_ratio
         self.local_search = local_search
         self.max_min = max_min
+        self.storage = storage
+        self.dtype = np.dtype(dtype)
+        self.population_size = population_size
+        self.beam_width = beam_width
+        self.beam_expansions = beam_expansions
+        self.initial_tour = initial_tour
+        self.seed_initial_tour = seed_initial_tour
+        self.exact_threshold = exact_threshold
+        self.gap_tolerance = gap_tolerance
+        self.bound_iterations = bound_iterations
+        self.gap_history: List[float] = []
+
+        # Random generator riêng của solver (không dùng global np.random)
+        self.rng = make_generator(seed)
+        self._uniforms = UniformStream(self.rng)
 
         # Compute distance matrix (complete graph)
         print("Computing distance matrix...")
-        self.distances = calculate_distance_matrix(cities)
-        print(f"  {len(self.distances)} distances computed")
+        if symmetric is None:
+            symmetric = (distance_matrix is None
+                         or bool(np.allclose(distance_matrix, distance_matrix.T)))
+        self.symmetric = symmetric
+        if storage in ('packed', 'lazy') and not symmetric:
+            raise ValueError(f"storage={storage!r} requires a symmetric instance")
+
+        if storage == 'lazy':
+            lats = np.array([cities[c]['lat'] for c in self.city_list], dtype=float)
+            lons = np.array([cities[c]['lon'] for c in self.city_list], dtype=float)
+            self.dist_matrix = LazyDistanceMatrix(lats, lons, max_bytes=cache_bytes, dtype=self.dtype)
+            self.candidates, candidate_distances = candidate_lists(lats, lons, n_candidates)
+            self._candidate_distances = candidate_distances.astype(self.dtype)
+        elif storage == 'packed':
+            if distance_matrix is None:
+                self.dist_matrix = packed_distance_matrix(cities, dtype=self.dtype)
+            else:
+                self.dist_matrix = PackedSymmetricMatrix.from_dense(distance_matrix, dtype=self.dtype)
+        elif distance_matrix is None:
+            self.dist_matrix = distance_matrix_array(cities).astype(self.dtype)
+        else:
+            self.dist_matrix = distance_matrix.astype(self.dtype)
+        if storage == 'lazy':
+            print(f"  {self.candidates.size} candidate distances computed"
+                  f" ({self.candidates.shape[1]} nearest neighbours per city, others on demand)")
+        else:
+            print(f"  {self.n_cities * (self.n_cities - 1)} distances computed"
+                  f" ({'symmetric' if self.symmetric else 'asymmetric'}, {storage} {self.dtype})")
 
         # Initialize pheromone matrix
         print("Initializing pheromone...")
-        self.pheromone = {}
         self._initialize_pheromone()
 
-        # Heuristic matrix (1/distance)
-        self.heuristic = {}
-        for edge, dist in self.distances.items():
-            if dist > 0:
-                self.heuristic[edge] = 1.0 / dist
-            else:
-                self.heuristic[edge] = 1.0
+        # Heuristic matrix (1/distance), η^β được tính sẵn
+        self._compute_heuristic()
 
         # Max-Min bounds (sẽ được cập nhật sau iteration đầu)
         if self.max_min:
             self.tau_max = 1.0
             self.tau_min = 0.01
 
+        # Best tour được giữ giữa các lần chạy (để tiếp tục tối ưu sau khi
+        # thêm/bớt cities, xem add_cities/remove_cities)
+        self.best_tour = None
+        self.best_distance = float('inf')
+
+        if initial_tour is not None:
+            self._initialize_from_tour(initial_tour, seed_initial_tour)
+
     def _initialize_pheromone(self):
         """
         Khởi tạo pheromone ban đầu cho tất cả edges.
-        """
-        for edge in self.distances.keys():
-            self.pheromone[edge] = 1.0
 
-    def _calculate_probabilities(self, current_city: str, unvisited: Set[str]) -> Dict[str, float]:
+        Với P-ACO, thay vì ma trận là archive rỗng: `_archive_next[s, i]` (và
+        `_archive_prev[s, i]` cho TSP đối xứng) là city đứng sau (trước) city i
+        trong tour thứ s của archive, -1 nếu slot chưa có tour. τ0 = 1/(n-1)
+        và τ_max = 1 như P-ACO gốc, Δ = (τ_max - τ0) / k.
         """
-        Tính xác suất chọn city tiếp theo.
+        if self.population_size is None:
+            self.pheromone = self._new_matrix(1.0)
+            return
 
-        Chỉ xét các cities chưa thăm.
+        k = self.population_size
+        self.pheromone = None
+        self._archive_next = np.full((k, self.n_cities), -1, dtype=np.int64)
+        self._archive_prev = np.full((k, self.n_cities), -1, dtype=np.int64) if self.symmetric else None
+        self._archive_head = 0
+        self._tau_init = 1.0 / max(1, self.n_cities - 1)
+        self._population_delta = (1.0 - self._tau_init) / k
+        self._pheromone_scratch = np.full(self.n_cities, self._tau_init)
+
+    def constructive_tour(self, method: str = 'nearest_neighbor', start: int = 0) -> Tuple[List[int], float]:
+        """
+        Tour nhanh (dạng index) từ một constructive heuristic.
 
         Parameters:
         -----------
-        current_city : str
-            City hiện tại
-        unvisited : Set[str]
-            Set các cities chưa thăm
+        method : str
+            'nearest_neighbor', 'greedy' hoặc 'space_filling_curve'
+        start : int
+            Index của start city
 
         Returns:
         --------
-        Dict[str, float]
-            {city: probability}
+        Tuple[List[int], float]
+            (tour bao gồm quay về start, total_distance)
+        """
+        if method == 'nearest_neighbor':
+            return nearest_neighbor_matrix(self.dist_matrix, start)
+        if method == 'greedy':
+            if not self.symmetric:
+                raise ValueError("Greedy edge tour requires a symmetric instance")
+            return greedy_edge_tour(self.dist_matrix, getattr(self, 'candidates', None), start)
+        if method == 'space_filling_curve':
+            if any('lat' not in self.cities[city] for city in self.city_list):
+                raise ValueError("Space-filling-curve tour requires city coordinates")
+            lats = np.array([self.cities[city]['lat'] for city in self.city_list], dtype=float)
+            lons = np.array([self.cities[city]['lon'] for city in self.city_list], dtype=float)
+            tour = space_filling_curve_tour(lats, lons, start)
+            return tour, float(np.sum(self.dist_matrix[tour[:-1], tour[1:]]))
+        raise ValueError(f"Unknown constructive tour method {method!r}")
+
+    def _initialize_from_tour(self, method: str, seed: bool):
+        """
+        Đặt τ0 = Q / L (L = độ dài constructive tour) cho mọi cạnh, khởi tạo
+        Max-Min bounds theo L và (nếu seed) deposit dọc theo tour đó.
+
+        Với P-ACO, pheromone được định nghĩa bởi archive nên chỉ có seed là
+        có tác dụng (tour được đưa vào archive).
         """
-        probabilities = {}
-        attractiveness = {}
+        tour, length = self.constructive_tour(method)
+        if length <= 0:
+            return
 
-        # Tính attractiveness cho mỗi unvisited city
-        for next_city in unvisited:
-            edge = (current_city, next_city)
-            tau = self.pheromone.get(edge, 1.0)
-            eta = self.heuristic.get(edge, 1.0)
+        if self.population_size is None:
+            self.pheromone.fill(self.Q / length)
+        if self.max_min:
+            self._update_max_min_bounds(length)
+        if seed:
+            self._set_best_tour(tour)
+
+    def _population_pheromone(self, current: int, targets: np.ndarray) -> np.ndarray:
+        """
+        τ(current, targets) của P-ACO, tính từ archive trong O(k + len(targets)).
+        """
+        neighbours = self._archive_next[:, current]
+        if self._archive_prev is not None:
+            neighbours = np.concatenate((neighbours, self._archive_prev[:, current]))
+        neighbours = neighbours[neighbours >= 0]
 
-            # attractiveness = τ^α * η^β
-            attractiveness[next_city] = (tau ** self.alpha) * (eta ** self.beta)
+        # Cộng Δ vào một hàng nháp rồi khôi phục, tránh tạo mảng n phần tử mỗi bước
+        scratch = self._pheromone_scratch
+        np.add.at(scratch, neighbours, self._population_delta)
+        values = scratch[targets]
+        scratch[neighbours] = self._tau_init
+        return values
 
-        # Chuẩn hóa thành xác suất
-        if attractiveness:
-            total = sum(attractiveness.values())
-            if total > 0:
-                for city, attr in attractiveness.items():
-                    probabilities[city] = attr / total
+    def _archive_add(self, tour: List[int]):
+        """
+        Thêm tour (dạng index) vào archive của P-ACO, thay thế tour cũ nhất.
+        """
+        origins = np.asarray(tour[:-1])
+        targets = np.asarray(tour[1:])
+        slot = self._archive_head
+        self._archive_next[slot, origins] = targets
+        if self._archive_prev is not None:
+            self._archive_prev[slot, targets] = origins
+        self._archive_head = (slot + 1) % self.population_size
 
-        return probabilities
+    def _new_matrix(self, fill: float):
+        """
+        Ma trận n×n mới theo storage/dtype của solver (n×k trên candidate
+        lists khi storage='lazy').
+        """
+        if self.storage == 'lazy':
+            return np.full(self.candidates.shape, fill, dtype=self.dtype)
+        if self.storage == 'packed':
+            return PackedSymmetricMatrix(self.n_cities, dtype=self.dtype, fill=fill)
+        return np.full((self.n_cities, self.n_cities), fill, dtype=self.dtype)
+
+    def _compute_heuristic(self):
+        """
+        Tính η^β với heuristic η = 1/distance (1.0 nếu distance <= 0).
+
+        Chỉ η^β được lưu (không lưu riêng η) để tiết kiệm một ma trận n×n.
+        """
+        if self.storage == 'lazy':
+            distances = self._candidate_distances
+        elif self.storage == 'packed':
+            distances = self.dist_matrix.data
+        else:
+            distances = self.dist_matrix
+        heuristic_beta = np.ones_like(distances)
+        positive = distances > 0
+        heuristic_beta[positive] = distances[positive] ** -self.beta
+
+        if self.storage == 'packed':
+            heuristic_beta = PackedSymmetricMatrix(self.n_cities, data=heuristic_beta)
+        self._heuristic_beta = heuristic_beta
+        # Lower bound của Beam-ACO phụ thuộc distances; tính lại khi cần
+        self._nearest_out = None
+        self._lower_bound = None
+
+    def lower_bound(self) -> float:
+        """
+        Lower bound cho độ dài tour tối ưu (được cache tới khi cities thay đổi).
+
+        TSP đối xứng: Held-Karp bound (1-tree với subgradient optimization,
+        O(bound_iterations · n²)), thường cách tối ưu ~1%. ATSP: bound rẻ
+        max(Σ cạnh đi ra ngắn nhất, Σ cạnh đi vào ngắn nhất).
+        """
+        if self._lower_bound is None:
+            upper = self.best_distance if self.best_distance < float('inf') else None
+            self._lower_bound = lower_bound(self.dist_matrix, self.symmetric, upper,
+                                            self.bound_iterations)
+        return self._lower_bound
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Bộ nhớ (bytes) của các ma trận n×n mà solver đang giữ.
+
+        Returns:
+        --------
+        Dict[str, int]
+            {'distances', 'pheromone', 'heuristic', 'attractiveness', 'candidates', 'total'}
+        """
+        if self.population_size is None:
+            pheromone_bytes = matrix_nbytes(self.pheromone)
+        else:
+            pheromone_bytes = (matrix_nbytes(self._archive_next) + matrix_nbytes(self._archive_prev)
+                               + matrix_nbytes(self._pheromone_scratch))
+        usage = {
+            'distances': matrix_nbytes(self.dist_matrix),
+            'candidates': matrix_nbytes(getattr(self, 'candidates', None)),
+            'pheromone': pheromone_bytes,
+            'heuristic': matrix_nbytes(self._heuristic_beta),
+            'attractiveness': matrix_nbytes(getattr(self, '_attractiveness', None))
+        }
+        usage['total'] = sum(usage.values())
+        return usage
+
+    def _prepare_iteration(self):
+        """
+        Tính attractiveness τ^α * η^β cho mọi cạnh (một lần mỗi iteration vì
+        pheromone chỉ thay đổi sau khi mọi ant đã xây dựng xong tour).
+
+        Với storage='packed' hoặc P-ACO, attractiveness được tính theo từng
+        hàng khi cần thay vì giữ thêm một ma trận n×n.
+        """
+        if self.storage == 'packed' or self.population_size is not None:
+            self._attractiveness = None
+        elif self.alpha == 1.0:
+            self._attractiveness = self.pheromone * self._heuristic_beta
+        else:
+            self._attractiveness = (self.pheromone ** self.alpha) * self._heuristic_beta
 
-    def _select_next_city(self, probabilities: Dict[str, float]) -> str:
+    def _select_next_city(self, current: int, unvisited: np.ndarray) -> int:
         """
         Chọn city tiếp theo theo xác suất.
+
+        P(i,j) = [τ(i,j)^α * η(i,j)^β] / Σ[τ(i,k)^α * η(i,k)^β], k chưa thăm.
+
+        Parameters:
+        -----------
+        current : int
+            Index của city hiện tại
+        unvisited : np.ndarray
+            Indices các cities chưa thăm
+
+        Returns:
+        --------
+        int
+            Index của city được chọn
         """
-        if not probabilities:
-            return None
+        weights = self._transition_weights(current, unvisited)
+        pick = roulette(np.cumsum(weights), self._uniforms.random())
+        if pick < 0:
+            # Fallback: chọn random
+            pick = self._uniforms.integers(len(unvisited))
+        return int(unvisited[pick])
 
-        cities = list(probabilities.keys())
-        probs = list(probabilities.values())
+    def _transition_weights(self, current: int, unvisited: np.ndarray) -> np.ndarray:
+        """
+        τ(current,j)^α * η(current,j)^β cho các cities j chưa thăm.
+        """
+        if self._attractiveness is None:
+            if self.population_size is not None:
+                weights = self._population_pheromone(current, unvisited)
+            else:
+                weights = self.pheromone[current, unvisited]
+            if self.alpha != 1.0:
+                weights = weights ** self.alpha
+            weights = weights * self._heuristic_beta[current, unvisited]
+        else:
+            weights = self._attractiveness[current, unvisited]
+        return weights
 
-        # Ensure probabilities sum to 1
-        probs = np.array(probs)
-        probs = probs / probs.sum()
+    def _construct_tours(self, start_city: str = None) -> List[Tuple[List[int], float]]:
+        """
+        Xây dựng tours của mọi ants trong một iteration (hoặc beam của
+        Beam-ACO). Độ dài của tất cả tours được tính một lần bằng `tour_lengths`.
 
-        selected = np.random.choice(cities, p=probs)
-        return selected
+        Returns:
+        --------
+        List[Tuple[List[int], float]]
+            (tour dạng city index, total_distance) cho mỗi ant
+        """
+        if self.beam_width is not None:
+            return self._construct_beam(start_city)
+
+        tours = [self._construct_tour(start_city) for _ in range(self.n_ants)]
+        lengths = tour_lengths(np.asarray(tours, dtype=np.int64), self.dist_matrix)
+        return list(zip(tours, lengths.tolist()))
 
-    def _construct_tour(self, start_city: str = None) -> Tuple[List[str], float]:
+    def _construct_tour(self, start_city: str = None) -> List[int]:
         """
         Xây dựng tour đi qua tất cả cities.
 
@@ -167,50 +503,170 @@ class TSP_AntColony:
 
         Returns:
         --------
-        Tuple[List[str], float]
-            (tour, total_distance)
+        List[int]
+            Tour dạng city index (bao gồm quay về start)
         """
         if start_city is None:
-            start_city = np.random.choice(self.city_list)
+            start = self._uniforms.integers(self.n_cities)
+        else:
+            start = self.city_index[start_city]
+
+        if self.storage == 'lazy':
+            return self._construct_tour_candidates(start)
 
-        tour = [start_city]
-        unvisited = set(self.city_list) - {start_city}
-        current = start_city
+        tour = [start]
+        unvisited = np.delete(np.arange(self.n_cities), start)
+        current = start
 
         # Đi qua tất cả cities
-        while unvisited:
-            probabilities = self._calculate_probabilities(current, unvisited)
+        while len(unvisited):
+            next_city = self._select_next_city(current, unvisited)
+            tour.append(next_city)
+            unvisited = unvisited[unvisited != next_city]
+            current = next_city
 
-            if not probabilities:
-                # Fallback: chọn random
-                next_city = np.random.choice(list(unvisited))
-            else:
-                next_city = self._select_next_city(probabilities)
+        # Quay về start city
+        tour.append(start)
 
+        return tour
+
+    def _construct_tour_candidates(self, start: int) -> List[int]:
+        """
+        Xây dựng tour chỉ chọn trong candidate list của city hiện tại
+        (storage='lazy'). Khi mọi candidate đã được thăm, đi tới city gần nhất
+        chưa thăm (một hàng khoảng cách, lấy từ row cache).
+        """
+        visited = np.zeros(self.n_cities, dtype=bool)
+        visited[start] = True
+        tour = [start]
+        current = start
+
+        for _ in range(self.n_cities - 1):
+            candidates = self.candidates[current]
+            open_mask = ~visited[candidates]
+            if open_mask.any():
+                options = candidates[open_mask]
+                if self._attractiveness is None:
+                    weights = self._population_pheromone(current, options)
+                    if self.alpha != 1.0:
+                        weights = weights ** self.alpha
+                    weights = weights * self._heuristic_beta[current][open_mask]
+                else:
+                    weights = self._attractiveness[current][open_mask]
+                pick = roulette(np.cumsum(weights), self._uniforms.random())
+                if pick < 0:
+                    pick = self._uniforms.integers(len(options))
+                next_city = int(options[pick])
+            else:
+                row = self.dist_matrix.row(current)
+                next_city = int(np.argmin(np.where(visited, np.inf, row)))
             tour.append(next_city)
-            unvisited.remove(next_city)
+            visited[next_city] = True
             current = next_city
 
-        # Quay về start city
-        tour.append(start_city)
+        tour.append(start)
+        return tour
+
+    def _construct_beam(self, start_city: str = None) -> List[Tuple[List[int], float]]:
+        """
+        Beam-ACO: xây dựng `beam_width` tours song song.
+
+        Mỗi bước, mỗi partial tour trong beam sinh tối đa `beam_expansions`
+        children khác nhau (lấy mẫu không hoàn lại theo τ^α * η^β). Children
+        được xếp hạng theo lower bound
+            LB = length + d(current, c) + Σ nearest_out(x), x chưa thăm hoặc x = c
+        với nearest_out(x) là cạnh đi ra ngắn nhất từ x, và chỉ `beam_width`
+        children tốt nhất được giữ lại.
+
+        Returns:
+        --------
+        List[Tuple[List[int], float]]
+            (tour dạng city index, total_distance) cho mỗi phần tử của beam
+        """
+        n = self.n_cities
+        if self._nearest_out is None:
+            nearest_out = np.empty(n)
+            for i in range(n):
+                row = np.asarray(self.dist_matrix[i], dtype=float)
+                nearest_out[i] = np.delete(row, i).min() if n > 1 else 0.0
+            self._nearest_out = nearest_out
+
+        if start_city is None:
+            start = self._uniforms.integers(n)
+        else:
+            start = self.city_index[start_city]
+
+        tours = np.full((1, n + 1), start, dtype=np.int64)
+        visited = np.zeros((1, n), dtype=bool)
+        visited[0, start] = True
+        lengths = np.zeros(1)
+        # Σ nearest_out của các cities đã thăm, trừ city hiện tại
+        visited_bound = np.zeros(1)
+        all_cities = np.arange(n)
+
+        for step in range(1, n):
+            parents, children, costs = [], [], []
+            for b in range(len(tours)):
+                current = tours[b, step - 1]
+                unvisited = all_cities[~visited[b]]
+                weights = self._transition_weights(current, unvisited)
+                size = min(self.beam_expansions, len(unvisited))
+                # Lấy mẫu không hoàn lại theo weights (Efraimidis-Spirakis):
+                # chọn `size` keys nhỏ nhất với key = Exp(1) / weight
+                with np.errstate(divide='ignore'):
+                    keys = self.rng.exponential(size=len(unvisited)) / weights
+                chosen = unvisited[np.argpartition(keys, size - 1)[:size]]
+                parents.append(np.full(size, b))
+                children.append(chosen)
+                costs.append(lengths[b] + self.dist_matrix[current, chosen])
 
-        # Tính total distance
-        total_distance = calculate_tour_distance(tour, self.distances)
+            parents = np.concatenate(parents)
+            children = np.concatenate(children)
+            costs = np.concatenate(costs)
+            bounds = costs - visited_bound[parents] - self._nearest_out[tours[parents, step - 1]]
+            keep = np.argsort(bounds, kind='stable')[:self.beam_width]
+            parents, children = parents[keep], children[keep]
 
-        return tour, total_distance
+            tours = tours[parents]
+            tours[:, step] = children
+            visited = visited[parents]
+            visited[np.arange(len(keep)), children] = True
+            visited_bound = visited_bound[parents] + self._nearest_out[tours[:, step - 1]]
+            lengths = costs[keep]
+
+        # Độ dài đầy đủ (kể cả cạnh quay về start) được tính lại theo lô
+        return list(zip(tours.tolist(), tour_lengths(tours, self.dist_matrix).tolist()))
+
+    def _improve_tour(self, tour: List[int]) -> Tuple[List[int], float]:
+        """
+        Local search: 2-opt cho TSP đối xứng (theo candidate lists khi
+        storage='lazy'), Or-opt (không đảo chiều cạnh) cho ATSP.
+        """
+        if self.storage == 'lazy':
+            return two_opt_candidates(tour, self.dist_matrix, self.candidates,
+                                      self._candidate_distances, max_iterations=100)
+        if self.symmetric:
+            return two_opt_matrix(tour, self.dist_matrix, max_iterations=100)
+        return or_opt_matrix(tour, self.dist_matrix, max_iterations=100)
 
-    def _update_pheromone(self, all_tours: List[Tuple[List[str], float]]):
+    def _update_pheromone(self, all_tours: List[Tuple[List[int], float]]):
         """
         Cập nhật pheromone sau mỗi iteration.
 
         Parameters:
         -----------
-        all_tours : List[Tuple[List[str], float]]
+        all_tours : List[Tuple[List[int], float]]
             Danh sách các (tour, distance) của tất cả ants
         """
+        if self.population_size is not None:
+            # P-ACO: iteration-best tour vào archive, tour cũ nhất bị loại
+            tour, distance = min(all_tours, key=lambda x: x[1])
+            if distance < float('inf'):
+                self._archive_add(tour)
+            return
+
         # Bước 1: Bay hơi pheromone
-        for edge in self.pheromone:
-            self.pheromone[edge] *= (1 - self.evaporation_rate)
+        self.pheromone *= (1 - self.evaporation_rate)
 
         # Bước 2: Chọn tours để update (elitist hoặc all)
         if self.elitist:
@@ -229,21 +685,183 @@ class TSP_AntColony:
             # Lượng pheromone deposit
             delta_pheromone = self.Q / distance
 
-            # Update tất cả edges trong tour
-            for i in range(len(tour) - 1):
-                edge = (tour[i], tour[i + 1])
-                reverse_edge = (tour[i + 1], tour[i])
-
-                # Update both directions (symmetric)
-                if edge in self.pheromone:
-                    self.pheromone[edge] += delta_pheromone
-                if reverse_edge in self.pheromone:
-                    self.pheromone[reverse_edge] += delta_pheromone
+            self._deposit_tour(tour, delta_pheromone)
 
         # Bước 4: Apply Max-Min bounds nếu enabled
         if self.max_min:
-            for edge in self.pheromone:
-                self.pheromone[edge] = max(self.tau_min, min(self.tau_max, self.pheromone[edge]))
+            self.pheromone.clip(self.tau_min, self.tau_max, out=self.pheromone)
+
+    def _deposit_tour(self, tour: List[int], amount: float):
+        """
+        Cộng `amount` pheromone lên tất cả edges trong tour (dạng index).
+
+        TSP đối xứng: cập nhật cả hai chiều. ATSP: chỉ theo chiều đi của tour.
+        Với P-ACO, tour được thêm vào archive (amount không dùng).
+        """
+        if self.population_size is not None:
+            self._archive_add(tour)
+            return
+        origins = np.asarray(tour[:-1])
+        targets = np.asarray(tour[1:])
+        if self.storage == 'lazy':
+            # Chỉ các cạnh nằm trong candidate lists mới có pheromone
+            for a, b in ((origins, targets), (targets, origins)):
+                rows, slots = np.nonzero(self.candidates[a] == b[:, None])
+                np.add.at(self.pheromone, (a[rows], slots), amount)
+            return
+        if self.storage == 'packed':
+            # Mỗi cạnh chỉ có một ô lưu trữ cho cả hai chiều
+            self.pheromone.add_at(origins, targets, amount)
+            return
+        np.add.at(self.pheromone, (origins, targets), amount)
+        if self.symmetric:
+            np.add.at(self.pheromone, (targets, origins), amount)
+
+    def _to_names(self, tour: List[int]) -> List[str]:
+        return [self.city_list[i] for i in tour]
+
+    def _to_indices(self, tour: List[str]) -> List[int]:
+        return [self.city_index[city] for city in tour]
+
+    def add_cities(self, new_cities: Dict):
+        """
+        Thêm cities vào solver hiện tại mà không build lại từ đầu.
+
+        - Distance/heuristic chỉ được tính cho các cạnh mới (O(k·n) thay vì O(n²)),
+          các matrices được mở rộng thêm k hàng/cột
+        - Pheromone của cạnh mới = pheromone trung bình hiện tại, các cạnh cũ giữ
+          nguyên pheromone đã học
+        - Cities mới được chèn vào best tour trước đó bằng cheapest insertion;
+          lần `run()`/`iterate()` tiếp theo tiếp tục tối ưu từ tour này
+
+        Parameters:
+        -----------
+        new_cities : Dict
+            Cities data {city_name: {'lat': ..., 'lon': ...}}
+        """
+        new_cities = {name: data for name, data in new_cities.items() if name not in self.cities}
+        if not new_cities:
+            return
+        if self.storage == 'lazy':
+            raise ValueError("add_cities is not supported with storage='lazy'")
+        if not self.symmetric or any('lat' not in data for data in self.cities.values()):
+            raise ValueError("add_cities requires a coordinate-based (symmetric) instance")
+
+        n_old = self.n_cities
+        n_new = n_old + len(new_cities)
+        self.cities = dict(self.cities)
+        self.cities.update(new_cities)
+        self.city_list.extend(new_cities)
+        self.city_index = {city: i for i, city in enumerate(self.city_list)}
+        self.n_cities = n_new
+
+        # Chỉ tính khoảng cách từ cities mới tới mọi city
+        lats = np.array([self.cities[c]['lat'] for c in self.city_list], dtype=float)
+        lons = np.array([self.cities[c]['lon'] for c in self.city_list], dtype=float)
+        new_rows = haversine_distances(lats[n_old:, None], lons[n_old:, None],
+                                       lats[None, :], lons[None, :])
+        new_rows[np.arange(n_new - n_old), np.arange(n_old, n_new)] = 0.0
+
+        rows = np.arange(n_old, n_new)[:, None]
+        cols = np.arange(n_new)[None, :]
+        self.dist_matrix = expand_matrix(self.dist_matrix, n_new, 0.0)
+        self.dist_matrix[rows, cols] = new_rows
+        self.dist_matrix[cols.T, rows.T] = new_rows.T
+
+        if self.population_size is not None:
+            # Tours trong archive không còn đầy đủ; best tour được đưa lại vào bên dưới
+            self._initialize_pheromone()
+        else:
+            default_pheromone = float(self.pheromone.mean()) if n_old else 1.0
+            self.pheromone = expand_matrix(self.pheromone, n_new, default_pheromone)
+        self._compute_heuristic()
+
+        if self.best_tour is not None:
+            tour = self._to_indices(self.best_tour)
+            for city in range(n_old, n_new):
+                tour = self._cheapest_insertion(tour, city)
+            self._set_best_tour(tour)
+
+    def remove_cities(self, names: List[str]):
+        """
+        Bớt cities khỏi solver hiện tại.
+
+        Các hàng/cột tương ứng bị xóa khỏi distance/heuristic/pheromone
+        matrices; best tour trước đó được nối tắt qua các cities bị xóa và
+        tiếp tục được tối ưu.
+
+        Parameters:
+        -----------
+        names : List[str]
+            Tên các cities cần xóa
+        """
+        removed = [name for name in names if name in self.cities]
+        if not removed:
+            return
+        if self.storage == 'lazy':
+            raise ValueError("remove_cities is not supported with storage='lazy'")
+
+        old_best = self.best_tour
+        removed_set = set(removed)
+        keep = np.array([city not in removed_set for city in self.city_list])
+        self.cities = {name: data for name, data in self.cities.items() if name not in removed}
+        self.city_list = [city for city, kept in zip(self.city_list, keep) if kept]
+        self.city_index = {city: i for i, city in enumerate(self.city_list)}
+        self.n_cities = len(self.city_list)
+
+        kept = np.flatnonzero(keep)
+        self.dist_matrix = take_submatrix(self.dist_matrix, kept)
+        if self.population_size is not None:
+            self._initialize_pheromone()
+        else:
+            self.pheromone = take_submatrix(self.pheromone, kept)
+        self._compute_heuristic()
+
+        if old_best is not None:
+            tour = [self.city_index[city] for city in old_best[:-1] if city in self.city_index]
+            self._set_best_tour(tour + tour[:1] if tour else None)
+
+    def _cheapest_insertion(self, tour: List[int], city: int) -> List[int]:
+        """
+        Chèn city (index) vào tour tại vị trí tăng chi phí ít nhất
+        (d(a,c) + d(c,b) - d(a,b), đúng cả cho ATSP).
+        """
+        origins = np.asarray(tour[:-1])
+        targets = np.asarray(tour[1:])
+        costs = (self.dist_matrix[origins, city] + self.dist_matrix[city, targets]
+                 - self.dist_matrix[origins, targets])
+        position = int(np.argmin(costs)) + 1
+        return tour[:position] + [city] + tour[position:]
+
+    def _set_best_tour(self, tour: Optional[List[int]]):
+        """
+        Đặt best tour (dạng index) sau khi sửa (local search nếu bật) và deposit
+        pheromone dọc theo nó để colony tập trung quanh tour này.
+        """
+        if not tour:
+            self.best_tour = None
+            self.best_distance = float('inf')
+            return
+
+        distance = float(self.dist_matrix[tour[:-1], tour[1:]].sum())
+        if self.local_search:
+            tour, distance = self._improve_tour(tour)
+        self.best_tour = self._to_names(tour)
+        self.best_distance = distance
+        if distance > 0:
+            self._deposit_tour(tour, self.Q / distance)
+
+    @staticmethod
+    def _rotate_tour(tour: List, start) -> List:
+        """
+        Xoay tour (cycle) để bắt đầu và kết thúc ở start.
+        """
+        if start is None or tour[0] == start or start not in tour:
+            return tour[:]
+        cycle = tour[:-1]
+        i = cycle.index(start)
+        cycle = cycle[i:] + cycle[:i]
+        return cycle + [start]
 
     def _update_max_min_bounds(self, best_distance: float):
         """
@@ -253,6 +871,136 @@ class TSP_AntColony:
             self.tau_max = self.Q / best_distance
             self.tau_min = self.tau_max / (2 * self.n_cities)
 
+    def iterate(
+        self,
+        start_city: str = None,
+        n_iterations: Optional[int] = None
+    ) -> Iterator[IterationState]:
+        """
+        Chạy ACO theo từng iteration (generator).
+
+        Nếu solver đã có best tour từ lần chạy trước (hoặc sau add_cities/
+        remove_cities), quá trình tối ưu tiếp tục từ tour đó.
+
+        Với n_cities <= exact_threshold, tour tối ưu được tính bằng Held-Karp
+        và chỉ một `IterationState` được yield.
+
+        Parameters:
+        -----------
+        start_city : str, optional
+            Starting city (nếu None thì mỗi ant chọn random)
+        n_iterations : int, optional
+            Số vòng lặp (mặc định: self.n_iterations)
+
+        Yields:
+        -------
+        IterationState
+            Trạng thái sau mỗi iteration
+        """
+        if n_iterations is None:
+            n_iterations = self.n_iterations
+
+        if 0 < self.n_cities <= self.exact_threshold:
+            yield self._solve_exact(start_city)
+            return
+
+        # Lower bound để báo gap (chỉ tính khi cần dừng theo gap hoặc đã có sẵn)
+        bound = self.lower_bound() if self.gap_tolerance is not None else self._lower_bound
+
+        # Tiếp tục từ best tour của lần chạy trước (nếu có)
+        best_tour = None
+        best_distance = float('inf')
+        if self.best_tour is not None:
+            best_tour = self._rotate_tour(self.best_tour, start_city)
+            best_distance = self.best_distance
+        start_time = time.perf_counter()
+
+        for iteration in range(n_iterations):
+            iteration_start = time.perf_counter()
+            all_tours = []
+            iteration_best_tour = None
+            iteration_best_distance = float('inf')
+
+            self._prepare_iteration()
+
+            # Mỗi ant xây dựng tour (Beam-ACO: một beam gồm beam_width tours)
+            for tour, distance in self._construct_tours(start_city):
+                # Local search improvement
+                if self.local_search and distance < float('inf'):
+                    tour, distance = self._improve_tour(tour)
+
+                all_tours.append((tour, distance))
+
+                if distance < iteration_best_distance:
+                    iteration_best_tour = tour
+                    iteration_best_distance = distance
+
+            iteration_best_tour = self._to_names(iteration_best_tour)
+
+            # Update best
+            if iteration_best_distance < best_distance:
+                best_tour = iteration_best_tour[:]
+                best_distance = iteration_best_distance
+                self.best_tour = best_tour
+                self.best_distance = best_distance
+
+            # Update pheromone
+            self._update_pheromone(all_tours)
+
+            # Update Max-Min bounds
+            if self.max_min:
+                self._update_max_min_bounds(best_distance)
+
+            valid = [d for _, d in all_tours if d < float('inf')]
+            gap = optimality_gap(best_distance, bound) if bound is not None else None
+            now = time.perf_counter()
+            yield IterationState(
+                iteration=iteration,
+                best_solution=best_tour,
+                best_distance=best_distance,
+                iteration_best_solution=iteration_best_tour,
+                iteration_best_distance=iteration_best_distance,
+                mean_distance=float(np.mean(valid)) if valid else float('inf'),
+                iteration_time=now - iteration_start,
+                elapsed_time=now - start_time,
+                gap=gap
+            )
+
+            if self.gap_tolerance is not None and gap <= self.gap_tolerance:
+                return
+
+    def _solve_exact(self, start_city: str = None) -> IterationState:
+        """
+        Tour tối ưu bằng Held-Karp, trả về dưới dạng một IterationState.
+        """
+        start_time = time.perf_counter()
+        start = 0 if start_city is None else self.city_index[start_city]
+        tour, distance = held_karp(self.dist_matrix, start)
+        self.best_tour = self._to_names(tour)
+        self.best_distance = distance
+        elapsed = time.perf_counter() - start_time
+        return IterationState(
+            iteration=0,
+            best_solution=self.best_tour[:],
+            best_distance=distance,
+            iteration_best_solution=self.best_tour[:],
+            iteration_best_distance=distance,
+            mean_distance=distance,
+            iteration_time=elapsed,
+            elapsed_time=elapsed,
+            gap=0.0
+        )
+
+    def aiterate(
+        self,
+        start_city: str = None,
+        n_iterations: Optional[int] = None
+    ) -> AsyncIterator[IterationState]:
+        """
+        Async counterpart của `iterate()`: `async for state in aco.aiterate(...)`.
+        """
+        return async_iterate(self.iterate(start_city, n_iterations))
+
     def run(self, start_city: str = None, verbose: bool = True) -> Tuple[List[str], float, List[float]]:
         """
         Chạy ACO algorithm để tìm tour ngắn nhất.
@@ -267,11 +1015,13 @@ class TSP_AntColony:
         Returns:
         --------
         Tuple[List[str], float, List[float]]
-            (best_tour, best_distance, history)
+            (best_tour, best_distance, history). Optimality gap của mỗi iteration
+            (nếu có lower bound) được lưu song song trong `self.gap_history`
         """
         best_tour = None
         best_distance = float('inf')
         history = []
+        self.gap_history = []
 
         if verbose:
             print(f"\n{'='*80}")
@@ -283,51 +1033,44 @@ class TSP_AntColony:
             print(f"Evaporation: {self.evaporation_rate}, Q: {self.Q}")
             print(f"Elitist: {self.elitist}, Local Search: {self.local_search}")
             print(f"Max-Min AS: {self.max_min}")
+            if self.population_size is not None:
+                print(f"P-ACO: population archive of {self.population_size} tours")
+            if 0 < self.n_cities <= self.exact_threshold:
+                print(f"Exact solver: Held-Karp (n <= {self.exact_threshold})")
+            if self.beam_width is not None:
+                print(f"Beam-ACO: width {self.beam_width}, expansions {self.beam_expansions}")
+            print(f"Storage: {self.storage} {self.dtype}, "
+                  f"Matrix memory: {self.memory_usage()['total'] / 1024 ** 2:.1f} MB")
             print(f"{'='*80}\n")
 
-        for iteration in range(self.n_iterations):
-            all_tours = []
-
-            # Mỗi ant xây dựng tour
-            for ant in range(self.n_ants):
-                tour, distance = self._construct_tour(start_city)
-
-                # Local search improvement
-                if self.local_search and distance < float('inf'):
-                    tour, distance = two_opt_improve(tour, self.distances, max_iterations=100)
-
-                all_tours.append((tour, distance))
-
-                # Update best
-                if distance < best_distance:
-                    best_tour = tour[:]
-                    best_distance = distance
-
-                    if verbose and iteration > 0:
-                        print(f"  🎯 New best found at iteration {iteration + 1}: {best_distance:.2f} km")
+        for state in self.iterate(start_city):
+            iteration = state.iteration
+            if verbose and iteration > 0 and state.best_distance < best_distance:
+                print(f"  🎯 New best found at iteration {iteration + 1}: {state.best_distance:.2f} km")
 
-            # Update pheromone
-            self._update_pheromone(all_tours)
-
-            # Update Max-Min bounds
-            if self.max_min:
-                self._update_max_min_bounds(best_distance)
+            best_tour = state.best_solution
+            best_distance = state.best_distance
 
             # Lưu history
             history.append(best_distance)
+            if state.gap is not None:
+                self.gap_history.append(state.gap)
 
             # Print progress
             if verbose and (iteration + 1) % 20 == 0:
-                avg_distance = np.mean([d for _, d in all_tours if d < float('inf')])
+                gap = f", Gap = {state.gap:.2%}" if state.gap is not None else ""
                 print(f"Iteration {iteration + 1}/{self.n_iterations}: "
-                      f"Best = {best_distance:.2f} km, Avg = {avg_distance:.2f} km")
+                      f"Best = {best_distance:.2f} km, Avg = {state.mean_distance:.2f} km{gap}")
 
         if verbose:
             print(f"\n{'='*80}")
             print("ALGORITHM COMPLETED!")
             print(f"{'='*80}")
             print(f"Best tour distance: {best_distance:.2f} km")
-            print(f"Tour: {' → '.join(best_tour[:5])} ... → {best_tour[0]}")
+            if self.gap_history:
+                print(f"Optimality gap: {self.gap_history[-1]:.2%} "
+                      f"(lower bound {self._lower_bound:.2f} km, {len(history)} iterations)")
+            print(f"Tour: {' → '.join(map(str, best_tour[:5]))} ... → {best_tour[0]}")
             print(f"{'='*80}\n")
 
         return best_tour, best_distance, history
@@ -0,0 +1,215 @@
+"""
+Benchmark `TSP_AntColony` trên các instances TSPLIB có optimum đã biết
+
+Với mỗi (instance, config) chạy nhiều lần với các seeds khác nhau và báo cáo:
+- gap so với optimum (tốt nhất và trung bình, %)
+- time-to-target: thời gian tới khi best tour đạt optimum·(1 + target_gap)
+- iterations/second
+
+    python -m src.tsp_benchmark --runs 3 --iterations 100 --output results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .rng import spawn_seeds
+from .tsp_aco import TSP_AntColony
+from .tsp_utils import load_tsplib
+
+TSPLIB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'tsplib')
+
+# Các cấu hình được so sánh mặc định (exact solver luôn tắt để đo ACO)
+DEFAULT_CONFIGS = {
+    'mmas': {},
+    'mmas_greedy': {'initial_tour': 'greedy', 'seed_initial_tour': True},
+    'p_aco': {'population_size': 5},
+}
+
+
+def load_optima(directory: str = TSPLIB_DIR) -> Dict[str, float]:
+    """
+    Optimum đã biết của các instances trong `directory` (file optima.json).
+    """
+    with open(os.path.join(directory, 'optima.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def benchmark_instance(
+    instance: Dict,
+    params: Dict,
+    optimum: float,
+    n_runs: int = 3,
+    target_gap: float = 0.0,
+    seed: Optional[int] = 0
+) -> Dict:
+    """
+    Chạy một config trên một instance `n_runs` lần.
+
+    Parameters:
+    -----------
+    instance : Dict
+        Kết quả của `load_tsplib()`
+    params : Dict
+        Tham số `TSP_AntColony`
+    optimum : float
+        Độ dài tour tối ưu đã biết
+    n_runs : int
+        Số lần chạy (mỗi lần một seed riêng)
+    target_gap : float
+        Target cho time-to-target: best <= optimum·(1 + target_gap)
+    seed : int, optional
+        Seed gốc
+
+    Returns:
+    --------
+    Dict
+        Thống kê tổng hợp và kết quả từng run
+    """
+    target = optimum * (1.0 + target_gap)
+    params = {'exact_threshold': 0, **params}
+    runs = []
+    for run_seed in spawn_seeds(seed, n_runs):
+        setup_start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            colony = TSP_AntColony(None, distance_matrix=instance['distance_matrix'],
+                                   symmetric=instance.get('type') != 'ATSP', seed=run_seed, **params)
+        setup_time = time.perf_counter() - setup_start
+
+        best = float('inf')
+        time_to_target = None
+        iterations = 0
+        elapsed = 0.0
+        for state in colony.iterate():
+            iterations += 1
+            best = state.best_distance
+            elapsed = state.elapsed_time
+            if time_to_target is None and best <= target + 1e-9:
+                time_to_target = elapsed
+
+        runs.append({
+            'best': best,
+            'gap': (best - optimum) / optimum,
+            'time_to_target': time_to_target,
+            'iterations': iterations,
+            'time': elapsed,
+            'setup_time': setup_time,
+        })
+
+    bests = np.array([r['best'] for r in runs])
+    hits = [r['time_to_target'] for r in runs if r['time_to_target'] is not None]
+    total_time = sum(r['time'] for r in runs)
+    return {
+        'best': float(bests.min()),
+        'mean': float(bests.mean()),
+        'best_gap': float((bests.min() - optimum) / optimum),
+        'mean_gap': float((bests.mean() - optimum) / optimum),
+        'success_rate': len(hits) / n_runs,
+        'mean_time_to_target': float(np.mean(hits)) if hits else None,
+        'iterations_per_second': sum(r['iterations'] for r in runs) / total_time if total_time > 0 else None,
+        'mean_setup_time': float(np.mean([r['setup_time'] for r in runs])),
+        'runs': runs,
+    }
+
+
+def run_benchmark(
+    instances: Optional[List[str]] = None,
+    configs: Optional[Dict[str, Dict]] = None,
+    n_runs: int = 3,
+    target_gap: float = 0.0,
+    seed: Optional[int] = 0,
+    directory: str = TSPLIB_DIR,
+    verbose: bool = True
+) -> List[Dict]:
+    """
+    Benchmark mọi cặp (instance, config).
+
+    Parameters:
+    -----------
+    instances : List[str], optional
+        Tên instances trong `directory` (mặc định: mọi instance trong optima.json)
+    configs : Dict[str, Dict], optional
+        {tên config: tham số TSP_AntColony} (mặc định DEFAULT_CONFIGS)
+    n_runs, target_gap, seed
+        Xem `benchmark_instance()`
+    directory : str
+        Thư mục chứa các file .tsp và optima.json
+    verbose : bool
+        In từng dòng kết quả
+
+    Returns:
+    --------
+    List[Dict]
+        Một dict cho mỗi (instance, config)
+    """
+    optima = load_optima(directory)
+    if instances is None:
+        instances = sorted(optima, key=lambda name: int(''.join(filter(str.isdigit, name)) or 0))
+    if configs is None:
+        configs = DEFAULT_CONFIGS
+
+    results = []
+    for name in instances:
+        instance = load_tsplib(os.path.join(directory, f'{name}.tsp'))
+        for config_name, params in configs.items():
+            stats = benchmark_instance(instance, params, optima[name], n_runs, target_gap, seed)
+            result = {'instance': name, 'n': instance['dimension'], 'optimum': optima[name],
+                      'config': config_name, 'params': params, **stats}
+            results.append(result)
+            if verbose:
+                print(format_row(result))
+    return results
+
+
+def format_row(result: Dict) -> str:
+    ttt = result['mean_time_to_target']
+    return (f"{result['instance']:<12} {result['config']:<14} "
+            f"{result['best']:>10.0f} {100 * result['best_gap']:>7.2f}% {100 * result['mean_gap']:>7.2f}% "
+            f"{100 * result['success_rate']:>5.0f}% {'-' if ttt is None else f'{ttt:.2f}s':>8} "
+            f"{result['iterations_per_second'] or 0:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TSP_AntColony trên TSPLIB instances")
+    parser.add_argument('--instances', nargs='*', help="Tên instances (mặc định: tất cả)")
+    parser.add_argument('--config', action='append', default=[], metavar='NAME=JSON',
+                        help="Config thêm, vd. 'beam={\"beam_width\": 10}' (lặp lại được)")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--ants', type=int, default=None)
+    parser.add_argument('--target-gap', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--directory', default=TSPLIB_DIR)
+    parser.add_argument('--output', help="Ghi kết quả ra file JSON")
+    args = parser.parse_args()
+
+    configs = dict(DEFAULT_CONFIGS)
+    if args.config:
+        configs = {}
+        for item in args.config:
+            name, _, params = item.partition('=')
+            configs[name] = json.loads(params) if params else {}
+    common = {'n_iterations': args.iterations}
+    if args.ants is not None:
+        common['n_ants'] = args.ants
+    configs = {name: {**common, **params} for name, params in configs.items()}
+
+    print(f"{'instance':<12} {'config':<14} {'best':>10} {'gap':>8} {'mean gap':>8} "
+          f"{'hit':>6} {'ttt':>8} {'iter/s':>8}")
+    results = run_benchmark(args.instances, configs, args.runs, args.target_gap,
+                            args.seed, args.directory)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'target_gap': args.target_gap, 'runs': args.runs, 'results': results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
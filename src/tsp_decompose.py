@@ -0,0 +1,270 @@
+"""
+Cluster-decompose-and-stitch solver cho TSP rất lớn (hàng nghìn cities)
+
+1. Chia cities thành clusters (k-means hoặc grid) theo coordinates
+2. Giải sub-TSP của mỗi cluster bằng `TSP_AntColony` song song trên nhiều processes
+3. Sắp xếp thứ tự clusters bằng một TSP nhỏ trên các centroids
+4. Nối các sub-tours (cắt mỗi cycle tại cạnh rẻ nhất để nối tiếp)
+5. Polish tour đầy đủ bằng 2-opt/Or-opt theo candidate lists
+
+Thời gian gần tuyến tính theo n (mỗi cluster có kích thước cố định) và song
+song theo số cores.
+"""
+
+import contextlib
+import io
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from .rng import SeedLike, make_generator, spawn_seeds
+from .tsp_aco import TSP_AntColony
+from .tsp_storage import LazyDistanceMatrix, candidate_lists
+from .tsp_utils import haversine_distances, or_opt_candidates, two_opt_candidates
+
+# Tham số mặc định cho sub-TSPs (nhỏ hơn mặc định của TSP_AntColony vì
+# clusters nhỏ và được polish lại ở bước cuối)
+DEFAULT_CLUSTER_PARAMS = {'n_ants': 10, 'n_iterations': 20,
+                          'initial_tour': 'greedy', 'seed_initial_tour': True}
+
+
+def cluster_cities(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    n_clusters: int,
+    method: str = 'kmeans',
+    max_iterations: int = 20,
+    seed: SeedLike = None
+) -> np.ndarray:
+    """
+    Gán mỗi city vào một cluster.
+
+    Parameters:
+    -----------
+    lats, lons : np.ndarray
+        Coordinates của các cities
+    n_clusters : int
+        Số clusters mong muốn
+    method : str
+        'kmeans' (Lloyd trên mặt phẳng chiếu equirectangular) hoặc 'grid'
+        (lưới đều ~sqrt(k) × sqrt(k) ô trên bounding box)
+    max_iterations : int
+        Số vòng lặp k-means tối đa
+    seed : int, SeedSequence hoặc Generator, optional
+        Seed cho khởi tạo k-means
+
+    Returns:
+    --------
+    np.ndarray
+        labels (n,) với giá trị 0..n_clusters_thực_tế-1 (không có cluster rỗng)
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    n = len(lats)
+    n_clusters = max(1, min(n_clusters, n))
+
+    # Chiếu equirectangular để khoảng cách Euclid xấp xỉ khoảng cách thật
+    points = np.column_stack((lons * math.cos(math.radians(float(lats.mean()))), lats))
+
+    if method == 'grid':
+        side = max(1, int(math.ceil(math.sqrt(n_clusters))))
+        low = points.min(axis=0)
+        span = np.maximum(points.max(axis=0) - low, 1e-12)
+        cells = np.minimum((points - low) / span * side, side - 1).astype(np.int64)
+        labels = cells[:, 0] * side + cells[:, 1]
+    elif method == 'kmeans':
+        rng = make_generator(seed)
+        centers = points[rng.choice(n, size=n_clusters, replace=False)]
+        labels = np.zeros(n, dtype=np.int64)
+        for iteration in range(max_iterations):
+            new_labels = _nearest_center(points, centers)
+            if iteration > 0 and np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+            for k in range(n_clusters):
+                members = points[labels == k]
+                # Cluster rỗng: khởi tạo lại tại một city ngẫu nhiên
+                centers[k] = members.mean(axis=0) if len(members) else points[rng.integers(n)]
+    else:
+        raise ValueError(f"method must be 'kmeans' or 'grid', got {method!r}")
+
+    # Đánh số lại, bỏ clusters rỗng
+    _, labels = np.unique(labels, return_inverse=True)
+    return labels
+
+
+def _nearest_center(points: np.ndarray, centers: np.ndarray, block_size: int = 1 << 20) -> np.ndarray:
+    """
+    Index của center gần nhất cho mỗi điểm.
+
+    argmin_c ‖p - c‖² = argmin_c (‖c‖² - 2 p·c) (‖p‖² không đổi theo hàng),
+    tính bằng matmul theo khối hàng để bộ nhớ tạm chỉ ~ block_size phần tử
+    thay vì n × k.
+    """
+    block_rows = max(1, block_size // len(centers))
+    center_norms = (centers ** 2).sum(axis=1)
+    labels = np.empty(len(points), dtype=np.int64)
+    for start in range(0, len(points), block_rows):
+        block = points[start:start + block_rows]
+        labels[start:start + block_rows] = np.argmin(center_norms - 2.0 * (block @ centers.T), axis=1)
+    return labels
+
+
+def _solve_cluster(args: Tuple[Dict, Dict]) -> List:
+    """
+    Giải sub-TSP của một cluster (top-level để chạy được trong process pool).
+
+    Returns:
+    --------
+    List
+        Cycle các tên city (không lặp lại city đầu ở cuối)
+    """
+    cities, params = args
+    if len(cities) <= 2:
+        return list(cities)
+    with contextlib.redirect_stdout(io.StringIO()):
+        tour, _, _ = TSP_AntColony(cities, **params).run(verbose=False)
+    return tour[:-1]
+
+
+def _best_entry(previous, cycle: np.ndarray, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Cắt cycle thành path để nối tiếp sau city `previous`.
+
+    Vào cycle tại c_p rồi đi hết một chiều, bỏ cạnh (c_p, c_{p-1}) hoặc
+    (c_p, c_{p+1}); chọn cách tăng chi phí ít nhất:
+    d(previous, c_p) - d(cạnh bị bỏ).
+    """
+    m = len(cycle)
+    if m == 1:
+        return cycle
+    following = np.roll(cycle, -1)
+    preceding = np.roll(cycle, 1)
+    entry = haversine_distances(lats[previous], lons[previous], lats[cycle], lons[cycle])
+    drop_prev = haversine_distances(lats[cycle], lons[cycle], lats[preceding], lons[preceding])
+    drop_next = haversine_distances(lats[cycle], lons[cycle], lats[following], lons[following])
+
+    # Chiều thuận: c_p, c_{p+1}, ..., c_{p-1} (bỏ cạnh (c_{p-1}, c_p))
+    forward = entry - drop_prev
+    # Chiều ngược: c_p, c_{p-1}, ..., c_{p+1} (bỏ cạnh (c_p, c_{p+1}))
+    backward = entry - drop_next
+    p_forward = int(np.argmin(forward))
+    p_backward = int(np.argmin(backward))
+    if forward[p_forward] <= backward[p_backward]:
+        return np.roll(cycle, -p_forward)
+    return np.roll(cycle[::-1], p_backward - m + 1)
+
+
+def decompose_solve(
+    cities: Dict,
+    start_city: Optional[Hashable] = None,
+    cluster_size: int = 100,
+    method: str = 'kmeans',
+    params: Optional[Dict] = None,
+    max_workers: Optional[int] = None,
+    polish: bool = True,
+    n_candidates: int = 10,
+    seed: SeedLike = None,
+    verbose: bool = False
+) -> Tuple[List, float]:
+    """
+    Giải TSP lớn bằng cluster-decompose-and-stitch.
+
+    Parameters:
+    -----------
+    cities : Dict
+        Cities data {city_name: {'lat': ..., 'lon': ...}}
+    start_city : Hashable, optional
+        Tour bắt đầu và kết thúc tại city này (mặc định: city đầu tiên)
+    cluster_size : int
+        Số cities trung bình mỗi cluster (n_clusters = ceil(n / cluster_size))
+    method : str
+        Phương pháp clustering: 'kmeans' hoặc 'grid'
+    params : Dict, optional
+        Tham số `TSP_AntColony` cho mỗi sub-TSP (mặc định DEFAULT_CLUSTER_PARAMS)
+    max_workers : int, optional
+        Số worker processes (None = số cores, 1 = chạy tuần tự trong process hiện tại)
+    polish : bool
+        Áp dụng 2-opt/Or-opt theo candidate lists lên tour đã nối
+    n_candidates : int
+        Kích thước candidate lists dùng khi polish
+    seed : int, SeedSequence hoặc Generator, optional
+        Seed gốc: clustering, mỗi sub-TSP và TSP trên centroids nhận một stream
+        riêng (spawn), nên kết quả không phụ thuộc số workers
+    verbose : bool
+        Print progress
+
+    Returns:
+    --------
+    Tuple[List, float]
+        (tour bao gồm quay về start, total_distance km)
+    """
+    city_list = list(cities.keys())
+    n = len(city_list)
+    if n == 0:
+        return [], 0.0
+    if start_city is None:
+        start_city = city_list[0]
+    lats = np.array([cities[c]['lat'] for c in city_list], dtype=float)
+    lons = np.array([cities[c]['lon'] for c in city_list], dtype=float)
+    cluster_params = dict(DEFAULT_CLUSTER_PARAMS if params is None else params)
+
+    # Bước 1: Clustering
+    cluster_seed, order_seed, solve_seed = spawn_seeds(seed, 3)
+    labels = cluster_cities(lats, lons, int(math.ceil(n / cluster_size)), method, seed=cluster_seed)
+    n_clusters = int(labels.max()) + 1
+    members = [np.flatnonzero(labels == k) for k in range(n_clusters)]
+    if verbose:
+        sizes = [len(m) for m in members]
+        print(f"{n} cities -> {n_clusters} clusters ({method}), sizes {min(sizes)}-{max(sizes)}")
+
+    # Bước 2: Sub-TSPs song song (cities được đánh index để gửi sang workers)
+    jobs = [({int(i): cities[city_list[i]] for i in m}, {**cluster_params, 'seed': job_seed})
+            for m, job_seed in zip(members, spawn_seeds(solve_seed, n_clusters))]
+    if max_workers == 1 or n_clusters == 1:
+        cycles = [_solve_cluster(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            cycles = list(executor.map(_solve_cluster, jobs))
+    cycles = [np.asarray(cycle, dtype=np.int64) for cycle in cycles]
+
+    # Bước 3: Thứ tự clusters = TSP trên centroids
+    start_index = city_list.index(start_city)
+    first_cluster = int(labels[start_index])
+    if n_clusters > 2:
+        centroids = {k: {'lat': float(lats[m].mean()), 'lon': float(lons[m].mean())}
+                     for k, m in enumerate(members)}
+        with contextlib.redirect_stdout(io.StringIO()):
+            order, _, _ = TSP_AntColony(centroids, **{**cluster_params, 'seed': order_seed}).run(
+                first_cluster, verbose=False)
+        order = order[:-1]
+    else:
+        order = [first_cluster] + [k for k in range(n_clusters) if k != first_cluster]
+
+    # Bước 4: Nối sub-tours. Cluster đầu bắt đầu tại start city; mỗi cluster
+    # tiếp theo được cắt để nối rẻ nhất từ city cuối của đoạn trước
+    first = cycles[order[0]]
+    path = [np.roll(first, -int(np.flatnonzero(first == start_index)[0]))]
+    for k in order[1:]:
+        path.append(_best_entry(path[-1][-1], cycles[k], lats, lons))
+    tour = np.concatenate(path).tolist()
+    tour.append(start_index)
+
+    distances = LazyDistanceMatrix(lats, lons, max_bytes=0)
+    if verbose:
+        stitched = float(np.sum(distances[tour[:-1], tour[1:]]))
+        print(f"Stitched tour: {stitched:.2f} km")
+
+    # Bước 5: Polish
+    if polish and n > 4:
+        candidates, candidate_distances = candidate_lists(lats, lons, n_candidates)
+        tour, _ = two_opt_candidates(tour, distances, candidates, candidate_distances)
+        tour, _ = or_opt_candidates(tour, distances, candidates)
+        tour, _ = two_opt_candidates(tour, distances, candidates, candidate_distances)
+
+    total_distance = float(np.sum(distances[tour[:-1], tour[1:]]))
+    if verbose:
+        print(f"Final tour: {total_distance:.2f} km")
+    return [city_list[i] for i in tour], total_distance
@@ -0,0 +1,360 @@
+"""
+Compact storage cho các ma trận n×n của TSP (distance, pheromone, heuristic)
+
+Với TSP đối xứng, mỗi giá trị M[i, j] = M[j, i] bị lưu hai lần trong ma trận
+đầy đủ. `PackedSymmetricMatrix` chỉ lưu nửa tam giác trên (kể cả đường chéo)
+trong một mảng 1-D và hỗ trợ cùng cú pháp indexing `M[i, j]` (kể cả fancy
+indexing) như numpy, nên construction và local search dùng được cả hai loại.
+
+Với instances rất lớn mà ngay cả ma trận packed cũng không vừa RAM,
+`LazyDistanceMatrix` tính khoảng cách từ coordinates khi cần (có row cache),
+còn pheromone/heuristic chỉ được lưu trên candidate lists (`candidate_lists`).
+"""
+
+from collections import OrderedDict
+from typing import Dict, Tuple, Union
+
+import numpy as np
+
+from .tsp_utils import haversine_distances
+
+
+class PackedSymmetricMatrix:
+    """
+    Ma trận đối xứng n×n lưu dạng upper-triangular packed (n(n+1)/2 giá trị).
+
+    Parameters:
+    -----------
+    n : int
+        Kích thước ma trận
+    dtype : numpy dtype
+        Kiểu dữ liệu (vd. np.float32 để giảm thêm một nửa bộ nhớ)
+    fill : float
+        Giá trị khởi tạo
+    data : np.ndarray, optional
+        Mảng packed có sẵn (độ dài n(n+1)/2)
+    """
+
+    def __init__(self, n: int, dtype=np.float64, fill: float = 0.0, data: np.ndarray = None):
+        self.n = n
+        if data is None:
+            data = np.full(n * (n + 1) // 2, fill, dtype=dtype)
+        self.data = data
+
+    @classmethod
+    def from_dense(cls, matrix: np.ndarray, dtype=None) -> 'PackedSymmetricMatrix':
+        """
+        Tạo từ ma trận đầy đủ (chỉ đọc nửa tam giác trên).
+        """
+        matrix = np.asarray(matrix)
+        n = len(matrix)
+        rows, cols = np.triu_indices(n)
+        return cls(n, data=matrix[rows, cols].astype(dtype or matrix.dtype))
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _index(self, i, j):
+        """
+        Vị trí của (i, j) trong mảng packed (broadcast cho arrays).
+        """
+        i = np.asarray(i, dtype=np.int64)
+        j = np.asarray(j, dtype=np.int64)
+        lo = np.minimum(i, j)
+        hi = np.maximum(i, j)
+        return lo * self.n - (lo * (lo - 1)) // 2 + (hi - lo)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            i, j = key
+            return self.data[self._index(i, j)]
+        return self.row(key)
+
+    def __setitem__(self, key, value):
+        i, j = key
+        self.data[self._index(i, j)] = value
+
+    def row(self, i: int) -> np.ndarray:
+        """
+        Hàng i dưới dạng mảng đầy đủ (n,).
+        """
+        return self.data[self._index(i, np.arange(self.n))]
+
+    def add_at(self, i, j, value):
+        """
+        M[i, j] += value (cộng dồn cả khi có indices trùng lặp).
+        """
+        np.add.at(self.data, self._index(i, j), value)
+
+    def to_dense(self) -> np.ndarray:
+        matrix = np.empty((self.n, self.n), dtype=self.dtype)
+        rows, cols = np.triu_indices(self.n)
+        matrix[rows, cols] = self.data
+        matrix[cols, rows] = self.data
+        return matrix
+
+    def copy(self) -> 'PackedSymmetricMatrix':
+        return PackedSymmetricMatrix(self.n, data=self.data.copy())
+
+    def fill(self, value: float):
+        self.data.fill(value)
+
+    def mean(self) -> float:
+        return float(self.data.mean())
+
+    def clip(self, a_min, a_max, out=None) -> 'PackedSymmetricMatrix':
+        if out is None:
+            out = self.copy()
+        np.clip(self.data, a_min, a_max, out=out.data)
+        return out
+
+    def _operand(self, other):
+        return other.data if isinstance(other, PackedSymmetricMatrix) else other
+
+    def __mul__(self, other) -> 'PackedSymmetricMatrix':
+        return PackedSymmetricMatrix(self.n, data=self.data * self._operand(other))
+
+    __rmul__ = __mul__
+
+    def __imul__(self, other) -> 'PackedSymmetricMatrix':
+        self.data *= self._operand(other)
+        return self
+
+    def __pow__(self, exponent) -> 'PackedSymmetricMatrix':
+        return PackedSymmetricMatrix(self.n, data=self.data ** exponent)
+
+
+class LazyDistanceMatrix:
+    """
+    Ma trận khoảng cách Haversine không bao giờ được tạo đầy đủ.
+
+    Khoảng cách được tính từ coordinate arrays khi cần (vectorized). Các hàng
+    đầy đủ `row(i)` được giữ trong một LRU tile cache có giới hạn; truy cập
+    `M[i, j]` dùng hàng đã cache nếu có, ngược lại tính trực tiếp.
+
+    Parameters:
+    -----------
+    lats, lons : np.ndarray
+        Coordinates (degrees) của n cities
+    max_bytes : int
+        Memory cap của row cache (giữ tối đa max_bytes / (n × itemsize) hàng)
+    dtype : numpy dtype
+        Kiểu dữ liệu của các hàng trong cache
+    """
+
+    def __init__(self, lats: np.ndarray, lons: np.ndarray, max_bytes: int = 256 * 1024 * 1024,
+                 dtype=np.float64):
+        self.lats = np.asarray(lats, dtype=float)
+        self.lons = np.asarray(lons, dtype=float)
+        self.n = len(self.lats)
+        self._dtype = np.dtype(dtype)
+        self.cache_rows = int(max_bytes // max(1, self.n * self._dtype.itemsize))
+        self._rows: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bộ nhớ hiện tại: coordinates + các hàng trong cache.
+        """
+        return (self.lats.nbytes + self.lons.nbytes
+                + sum(row.nbytes for row in self._rows.values()))
+
+    def __len__(self) -> int:
+        return self.n
+
+    def row(self, i: int) -> np.ndarray:
+        """
+        Khoảng cách từ city i tới mọi city (có cache LRU).
+        """
+        i = int(i)
+        row = self._rows.get(i)
+        if row is not None:
+            self._rows.move_to_end(i)
+            self.hits += 1
+            return row
+
+        self.misses += 1
+        row = haversine_distances(self.lats[i], self.lons[i], self.lats, self.lons).astype(self._dtype)
+        row[i] = 0.0
+        if self.cache_rows > 0:
+            self._rows[i] = row
+            if len(self._rows) > self.cache_rows:
+                self._rows.popitem(last=False)
+        return row
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            return self.row(key)
+
+        i, j = key
+        if np.ndim(i) == 0:
+            cached = self._rows.get(int(i))
+            if cached is not None:
+                self.hits += 1
+                return cached[j]
+        elif np.ndim(j) == 0:
+            cached = self._rows.get(int(j))
+            if cached is not None:
+                self.hits += 1
+                return cached[i]
+
+        i = np.asarray(i, dtype=np.int64)
+        j = np.asarray(j, dtype=np.int64)
+        distances = haversine_distances(self.lats[i], self.lons[i], self.lats[j], self.lons[j])
+        return np.where(i == j, 0.0, distances).astype(self._dtype)
+
+    def clear_cache(self):
+        self._rows.clear()
+
+
+def candidate_lists(lats: np.ndarray, lons: np.ndarray, k: int,
+                    block_rows: int = 256) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    k nearest neighbours (Haversine) của mỗi city, không tạo ma trận n×n.
+
+    Dùng scipy cKDTree trên tọa độ 3D của mặt cầu đơn vị nếu có (khoảng cách
+    dây cung đơn điệu với khoảng cách cung tròn nên thứ tự láng giềng là
+    chính xác); nếu không thì tính brute-force theo từng khối hàng.
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray]
+        (candidates (n, k) int indices, distances (n, k) km), sắp xếp tăng dần
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    n = len(lats)
+    k = min(k, n - 1)
+
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        cKDTree = None
+
+    if cKDTree is not None:
+        lat_rad, lon_rad = np.radians(lats), np.radians(lons)
+        points = np.column_stack((np.cos(lat_rad) * np.cos(lon_rad),
+                                  np.cos(lat_rad) * np.sin(lon_rad),
+                                  np.sin(lat_rad)))
+        _, neighbours = cKDTree(points).query(points, k=k + 1)
+        candidates = np.empty((n, k), dtype=np.int64)
+        for i in range(n):
+            row = neighbours[i][neighbours[i] != i][:k]
+            candidates[i] = row
+        distances = haversine_distances(lats[:, None], lons[:, None],
+                                        lats[candidates], lons[candidates])
+        return candidates, distances
+
+    candidates = np.empty((n, k), dtype=np.int64)
+    distances = np.empty((n, k))
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        block = haversine_distances(lats[start:stop, None], lons[start:stop, None],
+                                    lats[None, :], lons[None, :])
+        block[np.arange(stop - start), np.arange(start, stop)] = np.inf
+        nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+        nearest_dist = np.take_along_axis(block, nearest, axis=1)
+        order = np.argsort(nearest_dist, axis=1)
+        candidates[start:stop] = np.take_along_axis(nearest, order, axis=1)
+        distances[start:stop] = np.take_along_axis(nearest_dist, order, axis=1)
+    return candidates, distances
+
+
+Matrix = Union[np.ndarray, PackedSymmetricMatrix]
+
+
+def packed_distance_matrix(cities: Dict, dtype=np.float64, block_rows: int = 256) -> PackedSymmetricMatrix:
+    """
+    Tính ma trận khoảng cách Haversine trực tiếp ở dạng packed, theo từng khối
+    hàng, không bao giờ tạo ma trận n×n đầy đủ.
+
+    Parameters:
+    -----------
+    cities : Dict
+        Cities data với coordinates
+    dtype : numpy dtype
+        Kiểu dữ liệu lưu trữ
+    block_rows : int
+        Số hàng tính mỗi lần (giới hạn bộ nhớ tạm ~ block_rows × n)
+
+    Returns:
+    --------
+    PackedSymmetricMatrix
+    """
+    lats = np.array([data['lat'] for data in cities.values()], dtype=float)
+    lons = np.array([data['lon'] for data in cities.values()], dtype=float)
+    n = len(lats)
+    matrix = PackedSymmetricMatrix(n, dtype=dtype)
+
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        block = haversine_distances(lats[start:stop, None], lons[start:stop, None],
+                                    lats[None, :], lons[None, :])
+        for i in range(start, stop):
+            # Hàng i của tam giác trên: cột i..n-1 (đường chéo = 0)
+            row = block[i - start, i:]
+            row[0] = 0.0
+            offset = matrix._index(i, i)
+            matrix.data[offset:offset + n - i] = row
+    return matrix
+
+
+def take_submatrix(matrix: Matrix, keep: np.ndarray) -> Matrix:
+    """
+    Ma trận con gồm các hàng/cột `keep` (indices).
+    """
+    keep = np.asarray(keep, dtype=np.int64)
+    if isinstance(matrix, PackedSymmetricMatrix):
+        m = len(keep)
+        result = PackedSymmetricMatrix(m, dtype=matrix.dtype)
+        for r in range(m):
+            offset = result._index(r, r)
+            result.data[offset:offset + m - r] = matrix[keep[r], keep[r:]]
+        return result
+    return matrix[np.ix_(keep, keep)]
+
+
+def expand_matrix(matrix: Matrix, n_new: int, fill: float) -> Matrix:
+    """
+    Mở rộng ma trận lên n_new × n_new; các ô mới = fill, các ô cũ giữ nguyên.
+    """
+    n_old = len(matrix)
+    if isinstance(matrix, PackedSymmetricMatrix):
+        result = PackedSymmetricMatrix(n_new, dtype=matrix.dtype, fill=fill)
+        for r in range(n_old):
+            offset_old = matrix._index(r, r)
+            offset_new = result._index(r, r)
+            result.data[offset_new:offset_new + n_old - r] = matrix.data[offset_old:offset_old + n_old - r]
+        return result
+    result = np.full((n_new, n_new), fill, dtype=matrix.dtype)
+    result[:n_old, :n_old] = matrix
+    return result
+
+
+def matrix_nbytes(matrix) -> int:
+    """
+    Bộ nhớ (bytes) của một ma trận (0 nếu None).
+    """
+    return 0 if matrix is None else int(matrix.nbytes)
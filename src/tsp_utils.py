@@ -46,6 +46,34 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return distance
 
 
+def haversine_distances(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Phiên bản vectorized của `haversine_distance` (numpy broadcasting).
+
+    Ví dụ: ma trận khoảng cách n×n = haversine_distances(lat[:, None], lon[:, None],
+    lat[None, :], lon[None, :]).
+
+    Parameters:
+    -----------
+    lat1, lon1, lat2, lon2 : array-like
+        Coordinates (degrees), broadcast với nhau
+
+    Returns:
+    --------
+    np.ndarray
+        Khoảng cách (km)
+    """
+    R = 6371.0
+
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlon = np.radians(lon2) - np.radians(lon1)
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2) ** 2
+    return 2 * R * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
 def load_cities(filepath: str) -> Dict:
     """
     Load cities data từ JSON file.
@@ -65,6 +93,171 @@ def load_cities(filepath: str) -> Dict:
     return data['cities']
 
 
+def _tsplib_geo_radians(x: np.ndarray) -> np.ndarray:
+    """
+    Tọa độ TSPLIB GEO (DDD.MM: độ và phút) sang radians.
+    """
+    degrees = np.trunc(x)
+    minutes = x - degrees
+    return 3.141592 * (degrees + 5.0 * minutes / 3.0) / 180.0
+
+
+def tsplib_distance_matrix(coordinates: np.ndarray, edge_weight_type: str) -> np.ndarray:
+    """
+    Ma trận khoảng cách nguyên theo các hàm khoảng cách của TSPLIB.
+
+    Parameters:
+    -----------
+    coordinates : np.ndarray
+        (n, 2) tọa độ từ NODE_COORD_SECTION
+    edge_weight_type : str
+        'EUC_2D', 'CEIL_2D', 'ATT' hoặc 'GEO'
+
+    Returns:
+    --------
+    np.ndarray
+        Ma trận (n, n) kiểu float (giá trị nguyên như TSPLIB định nghĩa)
+    """
+    x = coordinates[:, 0]
+    y = coordinates[:, 1]
+    dx = x[:, None] - x[None, :]
+    dy = y[:, None] - y[None, :]
+
+    if edge_weight_type == 'EUC_2D':
+        # nint(): làm tròn .5 lên như TSPLIB (không phải banker's rounding)
+        matrix = np.floor(np.sqrt(dx ** 2 + dy ** 2) + 0.5)
+    elif edge_weight_type == 'CEIL_2D':
+        matrix = np.ceil(np.sqrt(dx ** 2 + dy ** 2))
+    elif edge_weight_type == 'ATT':
+        # Pseudo-Euclidean: làm tròn lên nếu nint() nhỏ hơn giá trị thật
+        r = np.sqrt((dx ** 2 + dy ** 2) / 10.0)
+        t = np.floor(r + 0.5)
+        matrix = np.where(t < r, t + 1, t)
+    elif edge_weight_type == 'GEO':
+        lat = _tsplib_geo_radians(x)
+        lon = _tsplib_geo_radians(y)
+        q1 = np.cos(lon[:, None] - lon[None, :])
+        q2 = np.cos(lat[:, None] - lat[None, :])
+        q3 = np.cos(lat[:, None] + lat[None, :])
+        inner = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        matrix = np.floor(6378.388 * np.arccos(inner) + 1.0)
+    else:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE {edge_weight_type!r}")
+
+    np.fill_diagonal(matrix, 0)
+    return matrix
+
+
+def _tsplib_explicit_matrix(values: List[float], n: int, edge_weight_format: str) -> np.ndarray:
+    """
+    Dựng ma trận n×n từ EDGE_WEIGHT_SECTION theo EDGE_WEIGHT_FORMAT.
+    """
+    values = np.asarray(values, dtype=float)
+    if edge_weight_format == 'FULL_MATRIX':
+        if len(values) != n * n:
+            raise ValueError(f"FULL_MATRIX needs {n * n} values, got {len(values)}")
+        return values.reshape(n, n)
+
+    # Dạng *_COL của tam giác trên/dưới có cùng thứ tự giá trị với dạng *_ROW của tam giác kia
+    aliases = {'UPPER_COL': 'LOWER_ROW', 'LOWER_COL': 'UPPER_ROW',
+               'UPPER_DIAG_COL': 'LOWER_DIAG_ROW', 'LOWER_DIAG_COL': 'UPPER_DIAG_ROW'}
+    edge_weight_format = aliases.get(edge_weight_format, edge_weight_format)
+    if edge_weight_format == 'UPPER_ROW':
+        rows, cols = np.triu_indices(n, 1)
+    elif edge_weight_format == 'LOWER_ROW':
+        rows, cols = np.tril_indices(n, -1)
+    elif edge_weight_format == 'UPPER_DIAG_ROW':
+        rows, cols = np.triu_indices(n)
+    elif edge_weight_format == 'LOWER_DIAG_ROW':
+        rows, cols = np.tril_indices(n)
+    else:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_FORMAT {edge_weight_format!r}")
+    if len(values) != len(rows):
+        raise ValueError(f"{edge_weight_format} needs {len(rows)} values, got {len(values)}")
+
+    matrix = np.zeros((n, n))
+    matrix[rows, cols] = values
+    matrix[cols, rows] = values
+    return matrix
+
+
+def load_tsplib(filepath: str) -> Dict:
+    """
+    Đọc instance TSPLIB (.tsp/.atsp) hoặc tour (.tour).
+
+    Hỗ trợ EDGE_WEIGHT_TYPE EUC_2D, CEIL_2D, ATT, GEO và EXPLICIT (FULL_MATRIX,
+    UPPER/LOWER[_DIAG]_ROW/COL).
+
+    Parameters:
+    -----------
+    filepath : str
+        Path to TSPLIB file
+
+    Returns:
+    --------
+    dict
+        Các trường header viết thường ('name', 'type', 'dimension',
+        'edge_weight_type', ...) cùng với:
+        - 'coordinates': (n, 2) array hoặc None
+        - 'distance_matrix': (n, n) array (None với file tour)
+        - 'tour': list node indices (0-based) nếu có TOUR_SECTION
+    """
+    header = {}
+    sections: Dict[str, List[List[str]]] = {}
+    current = None
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line == 'EOF':
+                break
+            key = line.split(':', 1)[0].strip()
+            if key.endswith('_SECTION'):
+                current = sections.setdefault(key, [])
+                continue
+            if ':' in line and key.replace('_', '').isalpha() and key.isupper():
+                header[key.lower()] = line.split(':', 1)[1].strip()
+                current = None
+                continue
+            if current is None:
+                raise ValueError(f"{filepath}: unexpected line {line!r}")
+            current.append(line.split())
+
+    instance = dict(header)
+    n = int(header['dimension'])
+    instance['dimension'] = n
+    instance['coordinates'] = None
+    instance['distance_matrix'] = None
+
+    if 'NODE_COORD_SECTION' in sections:
+        rows = sections['NODE_COORD_SECTION']
+        coordinates = np.array([[float(v) for v in row[1:3]] for row in rows])
+        # Sắp xếp theo node id (1-based) phòng khi file không theo thứ tự
+        order = np.argsort([int(row[0]) for row in rows], kind='stable')
+        instance['coordinates'] = coordinates[order]
+
+    edge_weight_type = header.get('edge_weight_type')
+    if edge_weight_type == 'EXPLICIT':
+        values = [float(v) for row in sections.get('EDGE_WEIGHT_SECTION', []) for v in row]
+        instance['distance_matrix'] = _tsplib_explicit_matrix(
+            values, n, header.get('edge_weight_format', 'FULL_MATRIX'))
+    elif edge_weight_type is not None:
+        if instance['coordinates'] is None:
+            raise ValueError(f"{filepath}: {edge_weight_type} needs NODE_COORD_SECTION")
+        instance['distance_matrix'] = tsplib_distance_matrix(instance['coordinates'], edge_weight_type)
+
+    if 'TOUR_SECTION' in sections:
+        tour = []
+        for value in (int(v) for row in sections['TOUR_SECTION'] for v in row):
+            if value == -1:
+                break
+            tour.append(value - 1)
+        instance['tour'] = tour
+
+    return instance
+
+
 def calculate_tour_distance(tour: List[str], distances: Dict[Tuple[str, str], float]) -> float:
     """
     Tính tổng khoảng cách của một tour.
@@ -80,15 +273,59 @@ def calculate_tour_distance(tour: List[str], distances: Dict[Tuple[str, str], fl
     --------
     float
         Tổng khoảng cách (km)
+
+    Raises:
+    -------
+    KeyError
+        Nếu thiếu khoảng cách của một cạnh (theo cả hai chiều)
     """
     total = 0.0
     for i in range(len(tour) - 1):
-        city_a = tour[i]
-        city_b = tour[i + 1]
-        total += distances.get((city_a, city_b), distances.get((city_b, city_a), 0))
+        total += edge_distance(tour[i], tour[i + 1], distances)
     return total
 
 
+def edge_distance(city_a: str, city_b: str, distances: Dict[Tuple[str, str], float]) -> float:
+    """
+    Khoảng cách của cạnh (city_a, city_b), thử cả chiều ngược lại.
+
+    Raises:
+    -------
+    KeyError
+        Nếu không có khoảng cách cho cạnh theo chiều nào
+    """
+    distance = distances.get((city_a, city_b))
+    if distance is None:
+        distance = distances.get((city_b, city_a))
+        if distance is None:
+            raise KeyError(f"No distance for edge ({city_a!r}, {city_b!r})")
+    return distance
+
+
+def tour_lengths(tours: np.ndarray, dist_matrix) -> np.ndarray:
+    """
+    Độ dài của nhiều tours cùng lúc (một fancy-indexed gather + sum).
+
+    Parameters:
+    -----------
+    tours : np.ndarray
+        (n_tours, n+1) city indices, mỗi hàng là một tour (bao gồm quay về start)
+    dist_matrix : array-like
+        Ma trận khoảng cách (np.ndarray hoặc ma trận compact hỗ trợ M[I, J])
+
+    Returns:
+    --------
+    np.ndarray
+        (n_tours,) độ dài các tours
+    """
+    tours = np.asarray(tours, dtype=np.int64)
+    if tours.ndim != 2:
+        raise ValueError(f"tours must be a 2-D (n_tours, n+1) array, got shape {tours.shape}")
+    if tours.shape[1] < 2:
+        return np.zeros(len(tours))
+    return np.asarray(dist_matrix[tours[:, :-1], tours[:, 1:]], dtype=float).sum(axis=1)
+
+
 def nearest_neighbor_tsp(cities: Dict, start_city: str) -> Tuple[List[str], float]:
     """
     Greedy nearest neighbor heuristic cho TSP.
@@ -189,10 +426,10 @@ def two_opt_improve(tour: List[str], distances: Dict[Tuple[str, str], float], ma
                 new_edge_1 = (best_tour[i-1], best_tour[j])
                 new_edge_2 = (best_tour[i], best_tour[j+1])
 
-                old_dist = (distances.get(old_edge_1, distances.get((old_edge_1[1], old_edge_1[0]), 0)) +
-                           distances.get(old_edge_2, distances.get((old_edge_2[1], old_edge_2[0]), 0)))
-                new_dist = (distances.get(new_edge_1, distances.get((new_edge_1[1], new_edge_1[0]), 0)) +
-                           distances.get(new_edge_2, distances.get((new_edge_2[1], new_edge_2[0]), 0)))
+                old_dist = (edge_distance(*old_edge_1, distances) +
+                            edge_distance(*old_edge_2, distances))
+                new_dist = (edge_distance(*new_edge_1, distances) +
+                            edge_distance(*new_edge_2, distances))
 
                 if new_dist < old_dist:
                     # Perform 2-opt swap: reverse tour[i:j+1]
@@ -264,6 +501,540 @@ def calculate_distance_matrix(cities: Dict) -> Dict[Tuple[str, str], float]:
     return distances
 
 
+def distance_matrix_array(cities: Dict) -> np.ndarray:
+    """
+    Ma trận khoảng cách n×n (numpy) theo thứ tự `list(cities.keys())`.
+
+    Parameters:
+    -----------
+    cities : Dict
+        Cities data với coordinates
+
+    Returns:
+    --------
+    np.ndarray
+        Ma trận đối xứng, đường chéo = 0
+    """
+    lats = np.array([data['lat'] for data in cities.values()], dtype=float)
+    lons = np.array([data['lon'] for data in cities.values()], dtype=float)
+    matrix = haversine_distances(lats[:, None], lons[:, None], lats[None, :], lons[None, :])
+    np.fill_diagonal(matrix, 0.0)
+    return matrix
+
+
+def nearest_neighbor_matrix(dist_matrix, start: int = 0) -> Tuple[List[int], float]:
+    """
+    Nearest neighbor heuristic trên distance matrix (tour dạng index).
+
+    Giống `nearest_neighbor_tsp` nhưng dùng ma trận có sẵn (một hàng mỗi
+    bước, O(n²) tổng cộng) và đúng cả cho ATSP. `dist_matrix[i]` có thể là
+    np.ndarray hoặc ma trận compact (`PackedSymmetricMatrix`, `LazyDistanceMatrix`).
+
+    Returns:
+    --------
+    Tuple[List[int], float]
+        (tour bao gồm quay về start, total_distance)
+    """
+    n = len(dist_matrix)
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
+    tour = [start]
+    current = start
+    total_distance = 0.0
+
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, np.asarray(dist_matrix[current], dtype=float))
+        nearest = int(np.argmin(row))
+        total_distance += row[nearest]
+        visited[nearest] = True
+        tour.append(nearest)
+        current = nearest
+
+    tour.append(start)
+    total_distance += float(dist_matrix[current, start])
+    return tour, float(total_distance)
+
+
+def greedy_edge_tour(dist_matrix, candidates: np.ndarray = None, start: int = 0) -> Tuple[List[int], float]:
+    """
+    Greedy edge heuristic cho TSP đối xứng.
+
+    Duyệt các cạnh theo độ dài tăng dần, thêm cạnh nếu cả hai đầu còn bậc < 2
+    và không tạo chu trình con. Nếu có `candidates` (n, k), chỉ xét các cạnh
+    trong candidate lists (không cần toàn bộ n² cạnh); các đoạn còn rời nhau
+    được nối bằng đầu mút gần nhất.
+
+    Returns:
+    --------
+    Tuple[List[int], float]
+        (tour bao gồm quay về start, total_distance)
+    """
+    n = len(dist_matrix)
+    if n < 3:
+        tour = list(range(n)) + [0]
+        return tour, float(np.sum(dist_matrix[tour[:-1], tour[1:]]))
+
+    if candidates is None:
+        origins, targets = np.triu_indices(n, k=1)
+    else:
+        origins = np.repeat(np.arange(n), candidates.shape[1])
+        targets = candidates.ravel()
+        pairs = np.unique(np.sort(np.column_stack((origins, targets)), axis=1), axis=0)
+        origins, targets = pairs[:, 0], pairs[:, 1]
+    order = np.argsort(dist_matrix[origins, targets], kind='stable')
+
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    degree = np.zeros(n, dtype=np.int64)
+    adjacency = [[] for _ in range(n)]
+    n_edges = 0
+
+    def link(u, v):
+        adjacency[u].append(v)
+        adjacency[v].append(u)
+        degree[u] += 1
+        degree[v] += 1
+        parent[find(u)] = find(v)
+
+    for e in order:
+        u, v = int(origins[e]), int(targets[e])
+        if degree[u] < 2 and degree[v] < 2 and find(u) != find(v):
+            link(u, v)
+            n_edges += 1
+            if n_edges == n - 1:
+                break
+
+    # Nối các đoạn còn rời: từ một đầu mút, đi tới đầu mút gần nhất của đoạn khác
+    while n_edges < n - 1:
+        endpoints = np.flatnonzero(degree < 2)
+        u = int(endpoints[0])
+        others = np.array([v for v in endpoints if find(int(v)) != find(u)])
+        v = int(others[np.argmin(dist_matrix[u, others])])
+        link(u, v)
+        n_edges += 1
+
+    # Duyệt đường Hamilton từ một đầu mút rồi xoay về start
+    path = [int(np.flatnonzero(degree < 2)[0])]
+    previous = -1
+    while len(path) < n:
+        current = path[-1]
+        nxt = adjacency[current][0] if adjacency[current][0] != previous else adjacency[current][-1]
+        previous = current
+        path.append(nxt)
+    i = path.index(start)
+    tour = path[i:] + path[:i] + [start]
+    return tour, float(np.sum(dist_matrix[tour[:-1], tour[1:]]))
+
+
+def space_filling_curve_tour(lats: np.ndarray, lons: np.ndarray, start: int = 0,
+                             order: int = 16) -> List[int]:
+    """
+    Tour theo thứ tự trên Hilbert curve của coordinates (O(n log n)).
+
+    Chất lượng kém hơn nearest neighbor (~25% dài hơn tối ưu) nhưng không cần
+    bất kỳ khoảng cách nào, nên dùng được cho instances rất lớn.
+
+    Parameters:
+    -----------
+    lats, lons : np.ndarray
+        Coordinates của các cities
+    start : int
+        Index của start city
+    order : int
+        Độ phân giải lưới (2^order × 2^order ô)
+
+    Returns:
+    --------
+    List[int]
+        Tour dạng index (bao gồm quay về start)
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    side = (1 << order) - 1
+
+    def scale(values):
+        span = values.max() - values.min()
+        if span == 0:
+            return np.zeros(len(values), dtype=np.int64)
+        return np.round((values - values.min()) / span * side).astype(np.int64)
+
+    x, y = scale(lons), scale(lats)
+    d = np.zeros(len(x), dtype=np.int64)
+    s = 1 << (order - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # Xoay/lật góc phần tư để tiếp tục ở mức chi tiết hơn
+        flip = ~ry & rx
+        x = np.where(flip, side - x, x)
+        y = np.where(flip, side - y, y)
+        swap = ~ry
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s >>= 1
+
+    path = np.argsort(d, kind='stable').tolist()
+    i = path.index(start)
+    return path[i:] + path[:i] + [start]
+
+
+def held_karp(dist_matrix, start: int = 0) -> Tuple[List[int], float]:
+    """
+    Lời giải tối ưu của TSP bằng Held-Karp dynamic programming (vectorized).
+
+    dp[S, j] = chi phí nhỏ nhất đi từ start, thăm đúng tập S (bitmask các
+    cities khác start) và kết thúc ở j. Các subsets được xử lý theo từng lớp
+    cùng số phần tử, mỗi lớp vectorized trên mọi (S, j). Độ phức tạp
+    O(2^n · n²) thời gian và O(2^n · n) bộ nhớ, nên chỉ dùng cho n nhỏ
+    (n ≤ ~16). Đúng cả cho ATSP.
+
+    Parameters:
+    -----------
+    dist_matrix : array-like
+        Ma trận khoảng cách n×n (np.ndarray hoặc ma trận compact hỗ trợ M[i])
+    start : int
+        Index của start city
+
+    Returns:
+    --------
+    Tuple[List[int], float]
+        (optimal_tour bao gồm quay về start, optimal_distance)
+    """
+    n = len(dist_matrix)
+    if n <= 1:
+        return [start] * 2 if n else [], 0.0
+
+    dist = np.array([np.asarray(dist_matrix[i], dtype=float) for i in range(n)])
+    others = np.array([i for i in range(n) if i != start])
+    m = n - 1
+    # Cạnh giữa các cities khác start, và từ/về start
+    inner = dist[np.ix_(others, others)]
+    from_start = dist[start, others]
+    to_start = dist[others, start]
+
+    n_masks = 1 << m
+    masks = np.arange(n_masks)
+    size = np.zeros(n_masks, dtype=np.int64)
+    for bit in range(m):
+        size += (masks >> bit) & 1
+
+    dp = np.full((n_masks, m), np.inf)
+    parent = np.full((n_masks, m), -1, dtype=np.int64)
+    singles = 1 << np.arange(m)
+    dp[singles, np.arange(m)] = from_start
+
+    for k in range(2, m + 1):
+        layer = masks[size == k]
+        for j in range(m):
+            bit = 1 << j
+            subsets = layer[(layer & bit) != 0]
+            previous = subsets ^ bit
+            # dp[previous, i] = inf khi i không thuộc previous
+            costs = dp[previous] + inner[:, j]
+            best = np.argmin(costs, axis=1)
+            dp[subsets, j] = costs[np.arange(len(subsets)), best]
+            parent[subsets, j] = best
+
+    full = n_masks - 1
+    last = int(np.argmin(dp[full] + to_start))
+    distance = float(dp[full, last] + to_start[last])
+
+    # Truy vết ngược
+    path = []
+    mask = full
+    j = last
+    while j >= 0:
+        path.append(int(others[j]))
+        previous = int(parent[mask, j])
+        mask ^= 1 << j
+        j = previous
+    tour = [start] + path[::-1] + [start]
+    return tour, distance
+
+
+def two_opt_matrix(tour: List[int], dist_matrix: np.ndarray, max_iterations: int = 1000) -> Tuple[List[int], float]:
+    """
+    2-opt local search trên tour dạng index với distance matrix (TSP đối xứng).
+
+    Giống `two_opt_improve` nhưng delta của mỗi move được tính trực tiếp
+    (vectorized theo j) thay vì tính lại toàn bộ tour.
+
+    Parameters:
+    -----------
+    tour : List[int]
+        Tour dạng city index (bao gồm quay về start)
+    dist_matrix : np.ndarray
+        Ma trận khoảng cách đối xứng
+    max_iterations : int
+        Giới hạn số lần cải thiện
+
+    Returns:
+    --------
+    Tuple[List[int], float]
+        (improved_tour, improved_distance)
+    """
+    best_tour = np.asarray(tour, dtype=np.int64)
+    n = len(best_tour)
+    iteration = 0
+    improved = True
+
+    while improved and iteration < max_iterations:
+        improved = False
+        iteration += 1
+
+        for i in range(1, n - 2):
+            # Edges hiện tại: (tour[i-1], tour[i]) và (tour[j], tour[j+1]), j > i
+            a, b = best_tour[i - 1], best_tour[i]
+            c = best_tour[i + 1:n - 1]
+            d = best_tour[i + 2:n]
+            delta = (dist_matrix[a, c] + dist_matrix[b, d]
+                     - dist_matrix[a, b] - dist_matrix[c, d])
+            k = int(np.argmin(delta))
+            if delta[k] < -1e-10:
+                j = i + 1 + k
+                best_tour[i:j + 1] = best_tour[i:j + 1][::-1]
+                improved = True
+                break
+
+    best_tour = best_tour.tolist()
+    return best_tour, float(dist_matrix[best_tour[:-1], best_tour[1:]].sum())
+
+
+def two_opt_candidates(tour: List[int], dist_matrix, candidates: np.ndarray,
+                       candidate_distances: np.ndarray = None,
+                       max_iterations: int = 1000) -> Tuple[List[int], float]:
+    """
+    2-opt local search chỉ xét các moves theo candidate lists (neighbour lists).
+
+    Với mỗi cạnh (a, b) của tour, chỉ thử nối a với các láng giềng c gần hơn b
+    (d(a,c) < d(a,b)), nên mỗi pass là O(n·k) thay vì O(n²). Độ dài các cạnh
+    của tour được giữ trong một mảng và cập nhật theo mỗi move, nên mỗi move
+    được thử chỉ cần tra thêm d(b,d) trong `dist_matrix`. Dùng được với mọi
+    distance matrix hỗ trợ `M[i, j]` (kể cả `LazyDistanceMatrix`). Start city
+    được giữ cố định.
+
+    Parameters:
+    -----------
+    tour : List[int]
+        Tour dạng city index (bao gồm quay về start)
+    dist_matrix : array-like
+        Ma trận khoảng cách đối xứng
+    candidates : np.ndarray
+        (n, k) indices của k láng giềng gần nhất mỗi city
+    candidate_distances : np.ndarray, optional
+        (n, k) khoảng cách tương ứng (tính từ dist_matrix nếu None)
+    max_iterations : int
+        Giới hạn số passes qua tour
+
+    Returns:
+    --------
+    Tuple[List[int], float]
+        (improved_tour, improved_distance)
+    """
+    best_tour = np.asarray(tour, dtype=np.int64)
+    n = len(best_tour) - 1
+    if candidate_distances is None:
+        candidate_distances = dist_matrix[np.arange(len(candidates))[:, None], candidates]
+    position = np.empty(len(candidates), dtype=np.int64)
+    position[best_tour[:-1]] = np.arange(n)
+    # edge_length[i] = d(tour[i], tour[i+1])
+    edge_length = np.asarray(dist_matrix[best_tour[:-1], best_tour[1:]], dtype=float)
+    iteration = 0
+    improved = True
+
+    while improved and iteration < max_iterations:
+        improved = False
+        iteration += 1
+
+        for i in range(n):
+            a, b = best_tour[i], best_tour[i + 1]
+            d_ab = edge_length[i]
+            closer = candidate_distances[a] < d_ab
+            if not closer.any():
+                continue
+            c, d_ac = candidates[a][closer], candidate_distances[a][closer]
+            j = position[c]
+            d = best_tour[j + 1]
+            # Thay (a,b),(c,d) bằng (a,c),(b,d)
+            d_bd = dist_matrix[b, d]
+            delta = d_ac + d_bd - d_ab - edge_length[j]
+            k = int(np.argmin(delta))
+            if delta[k] >= -1e-10:
+                continue
+
+            j = int(j[k])
+            lo, hi = (i + 1, j) if j > i else (j + 1, i)
+            best_tour[lo:hi + 1] = best_tour[lo:hi + 1][::-1]
+            position[best_tour[lo:hi + 1]] = np.arange(lo, hi + 1)
+            # Các cạnh bên trong đoạn đảo chiều giữ nguyên độ dài (ngược thứ tự)
+            edge_length[lo:hi] = edge_length[lo:hi][::-1]
+            edge_length[lo - 1] = d_ac[k]
+            edge_length[hi] = d_bd[k]
+            improved = True
+
+    best_tour = best_tour.tolist()
+    return best_tour, float(np.sum(dist_matrix[best_tour[:-1], best_tour[1:]]))
+
+
+def or_opt_candidates(tour: List[int], dist_matrix, candidates: np.ndarray,
+                      max_segment: int = 3, max_iterations: int = 1000) -> Tuple[List[int], float]:
+    """
+    Or-opt local search theo candidate lists cho TSP đối xứng.
+
+    Một đoạn 1..max_segment cities liên tiếp được chuyển tới cạnh kề một
+    láng giềng (trong candidate list) của một trong hai đầu đoạn, giữ nguyên
+    hoặc đảo chiều đoạn. Mỗi pass là O(n·k) truy cập khoảng cách thay vì
+    O(n²) như `or_opt_matrix`. Start city được giữ cố định.
+
+    Parameters:
+    -----------
+    tour : List[int]
+        Tour dạng city index (bao gồm quay về start)
+    dist_matrix : array-like
+        Ma trận khoảng cách đối xứng (hỗ trợ M[i, j], vd. `LazyDistanceMatrix`)
+    candidates : np.ndarray
+        (n, k) indices của k láng giềng gần nhất mỗi city
+    max_segment : int
+        Độ dài đoạn tối đa
+    max_iterations : int
+        Giới hạn số passes qua tour
+
+    Returns:
+    --------
+    Tuple[List[int], float]
+        (improved_tour, improved_distance)
+    """
+    cycle = np.asarray(tour[:-1], dtype=np.int64)
+    n = len(cycle)
+    position = np.empty(len(candidates), dtype=np.int64)
+    position[cycle] = np.arange(n)
+    iteration = 0
+    improved = True
+
+    while improved and iteration < max_iterations and n > 4:
+        improved = False
+        iteration += 1
+
+        for length in range(1, min(max_segment, n - 3) + 1):
+            i = 1
+            while i + length <= n:
+                # Đoạn cycle[i:i+length], không chứa start (vị trí 0)
+                p, q = cycle[i - 1], cycle[(i + length) % n]
+                first, last = cycle[i], cycle[i + length - 1]
+                removal_gain = (dist_matrix[p, first] + dist_matrix[last, q]
+                                - dist_matrix[p, q])
+
+                # Cạnh chèn (a, b) là cạnh của tour sau khi bỏ đoạn; mỗi láng
+                # giềng c cho hai cạnh (c, next(c)) và (prev(c), c)
+                c = np.concatenate((candidates[first], candidates[last]))
+                from_first = np.arange(len(c)) < candidates.shape[1]
+                pos = position[c]
+                outside = (pos < i) | (pos >= i + length)
+                c, pos, from_first = c[outside], pos[outside], from_first[outside]
+                if not len(c):
+                    i += 1
+                    continue
+                nxt = cycle[(pos + 1) % n]
+                nxt[c == p] = q
+                prv = cycle[pos - 1]
+                prv[c == q] = p
+
+                a = np.concatenate((c, prv))
+                b = np.concatenate((nxt, c))
+                # c nối với đầu đoạn mà nó là láng giềng: (c, next) -> c kề a-side,
+                # (prev, c) -> c kề b-side
+                near_a = np.concatenate((from_first, ~from_first))
+                head = np.where(near_a, first, last)
+                tail = np.where(near_a, last, first)
+                cost = dist_matrix[a, head] + dist_matrix[tail, b] - dist_matrix[a, b]
+                k = int(np.argmin(cost))
+                if cost[k] >= removal_gain - 1e-10:
+                    i += 1
+                    continue
+
+                segment = cycle[i:i + length]
+                if head[k] != first:
+                    segment = segment[::-1]
+                rest = np.concatenate((cycle[:i], cycle[i + length:]))
+                after = position[a[k]]
+                after = after if after < i else after - length
+                cycle = np.concatenate((rest[:after + 1], segment, rest[after + 1:]))
+                position[cycle] = np.arange(n)
+                improved = True
+                i += 1
+
+    best_tour = cycle.tolist() + [int(cycle[0])]
+    return best_tour, float(np.sum(dist_matrix[best_tour[:-1], best_tour[1:]]))
+
+
+def or_opt_matrix(tour: List[int], dist_matrix: np.ndarray, max_iterations: int = 1000,
+                  max_segment: int = 3) -> Tuple[List[int], float]:
+    """
+    Or-opt local search: di chuyển một đoạn 1..max_segment cities liên tiếp
+    sang vị trí khác trong tour, KHÔNG đảo chiều đoạn.
+
+    Vì không có move nào đảo chiều cạnh, Or-opt an toàn cho TSP bất đối xứng
+    (ATSP), khác với 2-opt.
+
+    Parameters:
+    -----------
+    tour : List[int]
+        Tour dạng city index (bao gồm quay về start); start city được giữ cố định
+    dist_matrix : np.ndarray
+        Ma trận chi phí (có thể bất đối xứng)
+    max_iterations : int
+        Giới hạn số lần cải thiện
+    max_segment : int
+        Độ dài đoạn tối đa
+
+    Returns:
+    --------
+    Tuple[List[int], float]
+        (improved_tour, improved_distance)
+    """
+    cycle = list(tour[:-1])
+    n = len(cycle)
+    iteration = 0
+    improved = True
+
+    while improved and iteration < max_iterations and n > 3:
+        improved = False
+        iteration += 1
+
+        for length in range(1, min(max_segment, n - 2) + 1):
+            # Đoạn cycle[i:i+length], không chứa start (vị trí 0)
+            for i in range(1, n - length + 1):
+                p = cycle[i - 1]
+                first, last = cycle[i], cycle[i + length - 1]
+                q = cycle[(i + length) % n]
+                removal_gain = (dist_matrix[p, first] + dist_matrix[last, q]
+                                - dist_matrix[p, q])
+
+                rest = cycle[:i] + cycle[i + length:]
+                a = np.asarray(rest)
+                b = np.roll(a, -1)
+                insert_cost = dist_matrix[a, first] + dist_matrix[last, b] - dist_matrix[a, b]
+                # Không chèn lại đúng vị trí cũ (giữa p và q)
+                insert_cost[i - 1] = np.inf
+
+                k = int(np.argmin(insert_cost))
+                if insert_cost[k] < removal_gain - 1e-10:
+                    cycle = rest[:k + 1] + cycle[i:i + length] + rest[k + 1:]
+                    improved = True
+                    break
+            if improved:
+                break
+
+    best_tour = cycle + cycle[:1]
+    return best_tour, float(dist_matrix[best_tour[:-1], best_tour[1:]].sum())
+
+
 def get_city_info_summary(cities: Dict) -> str:
     """
     Tạo summary string cho cities dataset.